@@ -9,9 +9,7 @@ if BACKEND_ROOT not in sys.path:
 
 from logging.config import fileConfig
 
-from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
-from sqlalchemy.engine.url import make_url
 
 from alembic import context
 from app.db.base import Base
@@ -27,25 +25,16 @@ from app.db.social import (  # if Base already includes all models
     SavedRecipe,
 )
 from app.db.feedback import Feedback
+from app.db.media import MediaBlob
+from app.db.migrations import BACKFILL_CHECKPOINTS, database_url
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-load_dotenv()
-
-# Convert async DATABASE_URL to a synchronous URL for Alembic
-async_url = os.getenv("DATABASE_URL")
-if not async_url:
-    raise RuntimeError("DATABASE_URL environment variable is not set!")
-
-# Manual conversion to avoid URL parsing issues
-if "postgresql+asyncpg://" in async_url:
-    sync_url = async_url.replace("postgresql+asyncpg://", "postgresql+psycopg2://")
-else:
-    sync_url = async_url
-
-config.set_main_option("sqlalchemy.url", sync_url)
+# DATABASE_URL (async driver swapped for the sync one); app.cli.migrate may
+# instead hand over its own connection through config.attributes
+config.set_main_option("sqlalchemy.url", database_url())
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -59,6 +48,11 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # Bookkeeping table of app.db.migrations.run_backfill, not a model
+    return not (type_ == "table" and name == BACKFILL_CHECKPOINTS.name)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -75,8 +69,10 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -90,17 +86,32 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
-
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        _run_with(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def _run_with(connection) -> None:
+    # One transaction per revision, so a revision can step out of it
+    # (autocommit_block, e.g. CREATE INDEX CONCURRENTLY) without affecting
+    # the others, and finished revisions stay applied if a later one fails
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
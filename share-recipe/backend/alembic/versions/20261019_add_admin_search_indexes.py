@@ -0,0 +1,37 @@
+"""
+Pattern-ops indexes for the admin's prefix search on string columns
+
+Revision ID: 20261019_add_admin_search_indexes
+Revises: 20261019_slim_social_indexes
+Create Date: 2026-10-19
+"""
+
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_admin_search_indexes"
+down_revision = "20261019_slim_social_indexes"
+branch_labels = None
+depends_on = None
+
+# ScalableModelView.search_query runs column LIKE 'term%'. With a non-C
+# collation the existing btrees (unique keys) cannot serve it; a
+# varchar_pattern_ops one can.
+PATTERN_INDEXES = (
+    ("ix_users_email_pattern", "users", "email"),
+    ("ix_users_username_pattern", "users", "username"),
+    ("ix_ingredients_name_norm_pattern", "ingredients", "name_norm"),
+    ("ix_feedback_email_pattern", "feedback", "email"),
+)
+
+
+def upgrade() -> None:
+    for name, table, column in PATTERN_INDEXES:
+        create_index_concurrently(
+            name, table, [column], postgresql_ops={column: "varchar_pattern_ops"}
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in PATTERN_INDEXES:
+        drop_index_concurrently(name, table)
@@ -0,0 +1,27 @@
+"""
+Add resized image variants to recipes and users
+
+Revision ID: 20261019_add_image_variants
+Revises: ed6f74b61bf6
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_image_variants"
+down_revision = "ed6f74b61bf6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("recipes", sa.Column("image_variants", sa.JSON(), nullable=True))
+    op.add_column("users", sa.Column("photo_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "photo_variants")
+    op.drop_column("recipes", "image_variants")
@@ -0,0 +1,39 @@
+"""
+Add media_blobs registry for content-addressed uploads
+
+Revision ID: 20261019_add_media_blobs
+Revises: 20261019_add_image_variants
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_media_blobs"
+down_revision = "20261019_add_image_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_uploaded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("digest"),
+        sa.UniqueConstraint("url"),
+    )
+    op.create_index(
+        "ix_media_blobs_last_uploaded_at", "media_blobs", ["last_uploaded_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_blobs_last_uploaded_at", table_name="media_blobs")
+    op.drop_table("media_blobs")
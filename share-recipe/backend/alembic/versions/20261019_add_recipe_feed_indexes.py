@@ -0,0 +1,40 @@
+"""
+Index the recipe feed order and title search
+
+Revision ID: 20261019_add_recipe_feed_indexes
+Revises: 20261019_add_user_profile_stats
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_recipe_feed_indexes"
+down_revision = "20261019_add_user_profile_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Feed: newest first
+    create_index_concurrently("ix_recipes_created_at", "recipes", ["created_at"])
+    # Title search is lower(title) LIKE '%term%', which only a trigram index
+    # can serve; elsewhere a plain expression index keeps the schema in step
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        create_index_concurrently(
+            "ix_recipes_title_trgm",
+            "recipes",
+            [sa.text("lower(title) gin_trgm_ops")],
+            postgresql_using="gin",
+        )
+    else:
+        op.create_index("ix_recipes_title_trgm", "recipes", [sa.text("lower(title)")])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_recipes_title_trgm", "recipes")
+    drop_index_concurrently("ix_recipes_created_at", "recipes")
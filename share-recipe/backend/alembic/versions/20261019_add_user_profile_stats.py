@@ -0,0 +1,64 @@
+"""
+Add precomputed profile stats (recipes_count, likes_received) to users
+
+Revision ID: 20261019_add_user_profile_stats
+Revises: 20261019_add_media_blobs
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.db.migrations import batched_backfill, reset_backfill
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_user_profile_stats"
+down_revision = "20261019_add_media_blobs"
+branch_labels = None
+depends_on = None
+
+BACKFILL = "users.profile_stats"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("recipes_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "users",
+        sa.Column("likes_received", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Backfill from the source tables in batches of users; the DAO keeps the
+    # counters current from here on
+    batched_backfill(
+        BACKFILL,
+        "users",
+        """
+        UPDATE users SET
+            recipes_count = (
+                SELECT count(*) FROM recipes
+                WHERE recipes.user_id = users.id AND recipes.is_published
+            ),
+            likes_received = (
+                SELECT count(*) FROM recipe_likes
+                JOIN recipes ON recipes.id = recipe_likes.recipe_id
+                WHERE recipes.user_id = users.id
+            )
+        WHERE users.id >= :lo AND users.id < :hi
+        """,
+    )
+    # Public profile page: the author's published recipes, newest first
+    op.create_index(
+        "ix_recipes_user_published_created",
+        "recipes",
+        ["user_id", "is_published", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_user_published_created", table_name="recipes")
+    op.drop_column("users", "likes_received")
+    op.drop_column("users", "recipes_count")
+    # A later upgrade adds the columns back empty: backfill them again
+    reset_backfill(BACKFILL)
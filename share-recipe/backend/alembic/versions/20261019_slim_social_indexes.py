@@ -0,0 +1,105 @@
+"""
+Composite primary keys and fewer indexes on the social join tables
+
+Revision ID: 20261019_slim_social_indexes
+Revises: 20261019_add_recipe_feed_indexes
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.db.migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = "20261019_slim_social_indexes"
+down_revision = "20261019_add_recipe_feed_indexes"
+branch_labels = None
+depends_on = None
+
+# recipe_likes and saved_recipes: the unique constraint the key replaces, and
+# the one user-side index they keep. Likes are only looked up by user for the
+# liked flags of a page; saved recipes are listed newest first.
+KEYED_BY_PAIR = (
+    ("recipe_likes", "uq_recipe_like", "ix_recipe_likes_user_recipe", "recipe_id"),
+    ("saved_recipes", "uq_saved_recipe", "ix_saved_recipes_user_created", "created_at"),
+)
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    for table, unique, by_user, second in KEYED_BY_PAIR:
+        # id + pkey, the unique pair and two single-column indexes become a
+        # (recipe_id, user_id) key plus one (user_id, ...) index
+        create_index_concurrently(by_user, table, ["user_id", second])
+        if _is_postgresql():
+            # Build the key's index without blocking writes, then adopt it
+            create_index_concurrently(
+                f"pk_{table}", table, ["recipe_id", "user_id"], unique=True
+            )
+            op.drop_constraint(f"{table}_pkey", table, type_="primary")
+            op.drop_column(table, "id")
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} "
+                f"PRIMARY KEY USING INDEX pk_{table}"
+            )
+            op.drop_constraint(unique, table, type_="unique")
+        else:
+            with op.batch_alter_table(table, recreate="always") as batch:
+                batch.drop_constraint(unique, type_="unique")
+                batch.drop_column("id")
+                batch.create_primary_key(f"pk_{table}", ["recipe_id", "user_id"])
+        drop_index_concurrently(f"ix_{table}_recipe_id", table)
+        drop_index_concurrently(f"ix_{table}_user_id", table)
+
+    # recipe_ingredients: the primary key already covers (recipe_id, ...)
+    create_index_concurrently(
+        "ix_recipe_ingredients_ingredient_recipe",
+        "recipe_ingredients",
+        ["ingredient_id", "recipe_id"],
+    )
+    drop_index_concurrently("ix_recipe_ingredients_ingredient", "recipe_ingredients")
+    drop_index_concurrently("ix_recipe_ingredients_recipe", "recipe_ingredients")
+    if _is_postgresql():
+        op.drop_constraint("uq_recipe_ingredient", "recipe_ingredients", type_="unique")
+    else:
+        with op.batch_alter_table("recipe_ingredients", recreate="always") as batch:
+            batch.drop_constraint("uq_recipe_ingredient", type_="unique")
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        op.create_unique_constraint(
+            "uq_recipe_ingredient", "recipe_ingredients", ["recipe_id", "ingredient_id"]
+        )
+    else:
+        with op.batch_alter_table("recipe_ingredients", recreate="always") as batch:
+            batch.create_unique_constraint(
+                "uq_recipe_ingredient", ["recipe_id", "ingredient_id"]
+            )
+    create_index_concurrently(
+        "ix_recipe_ingredients_recipe", "recipe_ingredients", ["recipe_id"]
+    )
+    create_index_concurrently(
+        "ix_recipe_ingredients_ingredient", "recipe_ingredients", ["ingredient_id"]
+    )
+    drop_index_concurrently(
+        "ix_recipe_ingredients_ingredient_recipe", "recipe_ingredients"
+    )
+
+    for table, unique, by_user, _ in KEYED_BY_PAIR:
+        create_index_concurrently(f"ix_{table}_recipe_id", table, ["recipe_id"])
+        create_index_concurrently(f"ix_{table}_user_id", table, ["user_id"])
+        if _is_postgresql():
+            op.drop_constraint(f"pk_{table}", table, type_="primary")
+            op.create_unique_constraint(unique, table, ["recipe_id", "user_id"])
+            op.execute(f"ALTER TABLE {table} ADD COLUMN id SERIAL PRIMARY KEY")
+        else:
+            with op.batch_alter_table(table, recreate="always") as batch:
+                batch.drop_constraint(f"pk_{table}", type_="primary")
+                batch.add_column(sa.Column("id", sa.Integer(), primary_key=True))
+                batch.create_unique_constraint(unique, ["recipe_id", "user_id"])
+        drop_index_concurrently(by_user, table)
@@ -1,12 +1,31 @@
 from __future__ import annotations
 
-import os
+from dataclasses import dataclass
+from typing import Any, Optional
 
 from sqladmin import Admin, ModelView
 from sqladmin.authentication import AuthenticationBackend
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
+from sqladmin.helpers import get_object_identifier, object_identifier_values
+from sqladmin.pagination import PageControl, Pagination
+from sqlalchemy import (
+    Integer,
+    asc,
+    create_engine,
+    desc,
+    false,
+    func,
+    or_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import selectinload
+from starlette.applications import Starlette
+from starlette.datastructures import URL
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
+from starlette.types import ASGIApp
 
 from app.config.config import settings
 from app.db.database import User
@@ -24,9 +43,7 @@ class SimpleAuth(AuthenticationBackend):
         form = await request.form()
         username = form.get("username")
         password = form.get("password")
-        if username == os.getenv("ADMIN_USERNAME", "admin") and password == os.getenv(
-            "ADMIN_PASSWORD", "admin"
-        ):
+        if username == settings.ADMIN_USERNAME and password == settings.ADMIN_PASSWORD:
             request.session.update({"admin": True})
             return True
         return False
@@ -39,7 +56,158 @@ class SimpleAuth(AuthenticationBackend):
         return bool(request.session.get("admin"))
 
 
-class UserAdmin(ModelView, model=User):
+@dataclass
+class KeysetPagination(Pagination):
+    """
+    Prev/next links carry the primary key of the first/last row shown
+    (?before=/?after=) instead of an offset; the page number is only a label.
+    Page 1 is always the newest rows.
+    """
+
+    first_key: Optional[str] = None
+    last_key: Optional[str] = None
+    more: bool = False
+
+    def __post_init__(self) -> None:
+        if self.page_size < 1:
+            raise ValueError("page_size must be greater than 0")
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.more
+
+    def resize(self, page_size: int) -> Pagination:
+        # Changing the page size starts over from the newest rows
+        self.page = 1
+        self.page_size = page_size
+        return self
+
+    def add_pagination_urls(self, base_url: URL) -> None:
+        base_url = base_url.remove_query_params(["before", "after"])
+        if self.page == 2:
+            self._add(base_url.include_query_params(page=1), 1)
+        elif self.page > 2:
+            url = base_url.include_query_params(page=self.page - 1)
+            self._add(url.include_query_params(before=self.first_key), self.page - 1)
+        self._add(base_url.include_query_params(page=self.page), self.page)
+        if self.more:
+            url = base_url.include_query_params(page=self.page + 1)
+            self._add(url.include_query_params(after=self.last_key), self.page + 1)
+
+    def _add(self, url: URL, page: int) -> None:
+        self.page_controls.append(PageControl(number=page, url=str(url)))
+
+
+class ScalableModelView(ModelView):
+    """
+    ModelView for tables that can grow large.
+    - Totals come from the planner's row estimate (pg_class.reltuples) once a
+      table is past ADMIN_EXACT_COUNT_MAX rows; search result counts stop there
+    - Pages are walked by primary key (keyset) instead of OFFSET, newest first
+    - Search is exact on integer columns and prefix on strings, so that it can
+      use the indexes of column_searchable_list (which must all be indexed;
+      strings with varchar_pattern_ops, or PostgreSQL will not use it for LIKE)
+    Views with column_filters or a user-chosen sort fall back to SQLAdmin's
+    offset paging.
+    """
+
+    page_size = 25
+
+    async def list(self, request: Request) -> Pagination:
+        if self.get_filters() or request.query_params.get("sortBy"):
+            return await super().list(request)
+        page = self.validate_page_number(request.query_params.get("page"), 1)
+        page_size = self.validate_page_number(
+            request.query_params.get("pageSize"), self.page_size
+        )
+        page_size = min(page_size, max(self.page_size_options))
+        search = request.query_params.get("search")
+        before = request.query_params.get("before") if page > 1 else None
+        after = request.query_params.get("after") if page > 1 else None
+        if page > 1 and not (before or after):
+            page = 1
+
+        stmt = self.list_query(request)
+        for relation in self._list_relations:
+            stmt = stmt.options(selectinload(relation))
+        if search:
+            stmt = self.search_query(stmt=stmt, term=search)
+        count = await self._count(stmt, estimate=not search)
+
+        key = (
+            self.pk_columns[0]
+            if len(self.pk_columns) == 1
+            else tuple_(*self.pk_columns)
+        )
+        if before:
+            stmt = stmt.where(key > self._cursor(before))
+            order = asc
+        else:
+            if after:
+                stmt = stmt.where(key < self._cursor(after))
+            order = desc
+        stmt = stmt.order_by(*(order(c) for c in self.pk_columns))
+        rows = list(await self._run_query(stmt.limit(page_size + 1)))
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if before:
+            # Walking back: the page before `before` always has a next page
+            rows.reverse()
+            more = True
+        return KeysetPagination(
+            rows=rows,
+            page=page,
+            page_size=page_size,
+            count=count,
+            first_key=str(get_object_identifier(rows[0])) if rows else None,
+            last_key=str(get_object_identifier(rows[-1])) if rows else None,
+            more=more,
+        )
+
+    def _cursor(self, identifier: str) -> Any:
+        try:
+            values = object_identifier_values(identifier, self.model)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid page cursor") from exc
+        return values[0] if len(values) == 1 else tuple_(*values)
+
+    async def _count(self, stmt, estimate: bool) -> int:
+        limit = settings.ADMIN_EXACT_COUNT_MAX
+        if estimate and _backend() == "postgresql":
+            rows = await self._run_arbitrary_query(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = CAST(:t AS regclass)"
+                ).bindparams(t=self.model.__table__.name)
+            )
+            # -1 when the table was never analyzed
+            if rows and rows[0][0] > limit:
+                return rows[0][0]
+        if not estimate:
+            stmt = stmt.limit(limit)
+        rows = await self._run_arbitrary_query(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        )
+        return rows[0][0]
+
+    def search_query(self, stmt, term: str):
+        term = term.strip()
+        expressions = []
+        for field in self._search_fields:
+            column = getattr(self.model, field)
+            if isinstance(column.type, Integer):
+                if term.isdigit():
+                    expressions.append(column == int(term))
+            else:
+                expressions.append(column.startswith(term, autoescape=True))
+        return stmt.filter(or_(false(), *expressions))
+
+
+class UserAdmin(ScalableModelView, model=User):
     name = "User"
     name_plural = "Users"
     icon = "fa-solid fa-user"
@@ -47,53 +215,75 @@ class UserAdmin(ModelView, model=User):
     column_searchable_list = ["email", "username"]
 
 
-class RecipeAdmin(ModelView, model=Recipe):
+class RecipeAdmin(ScalableModelView, model=Recipe):
     name = "Recipe"
     name_plural = "Recipes"
     icon = "fa-solid fa-bowl-food"
     column_list = ["id", "title", "user_id", "created_at", "is_published"]
-    column_searchable_list = ["title"]
+    column_searchable_list = ["id", "user_id"]
 
 
-class IngredientAdmin(ModelView, model=Ingredient):
+class IngredientAdmin(ScalableModelView, model=Ingredient):
     name = "Ingredient"
     name_plural = "Ingredients"
     icon = "fa-solid fa-carrot"
     column_list = ["id", "name"]
-    column_searchable_list = ["name"]
+    column_searchable_list = ["name_norm"]
+
+    def search_query(self, stmt, term: str):
+        # name_norm is stored lowercased and trimmed
+        return super().search_query(stmt, term.strip().lower())
 
 
-class CommentAdmin(ModelView, model=Comment):
+class CommentAdmin(ScalableModelView, model=Comment):
     name = "Comment"
     name_plural = "Comments"
     icon = "fa-solid fa-comments"
     column_list = ["id", "recipe_id", "user_id", "content", "created_at"]
+    column_searchable_list = ["recipe_id", "user_id"]
 
 
-class RecipeLikeAdmin(ModelView, model=RecipeLike):
+class RecipeLikeAdmin(ScalableModelView, model=RecipeLike):
     name = "Like"
     name_plural = "Likes"
     icon = "fa-solid fa-thumbs-up"
-    column_list = ["id", "recipe_id", "user_id"]
+    column_list = ["recipe_id", "user_id", "created_at"]
+    column_searchable_list = ["recipe_id", "user_id"]
 
 
-class SavedRecipeAdmin(ModelView, model=SavedRecipe):
+class SavedRecipeAdmin(ScalableModelView, model=SavedRecipe):
     name = "Saved"
     name_plural = "Saved Recipes"
     icon = "fa-solid fa-bookmark"
-    column_list = ["id", "recipe_id", "user_id"]
+    column_list = ["recipe_id", "user_id", "created_at"]
+    column_searchable_list = ["recipe_id", "user_id"]
 
 
-class FeedbackAdmin(ModelView, model=Feedback):
+class FeedbackAdmin(ScalableModelView, model=Feedback):
     name = "Feedback"
     name_plural = "Feedback"
     icon = "fa-solid fa-comment"
     column_list = ["id", "email", "message", "created_at"]
-    column_searchable_list = ["email", "message"]
+    column_searchable_list = ["email"]
     column_sortable_list = ["id", "email", "created_at"]
 
 
-def _build_sync_engine(async_url: str):
+ADMIN_VIEWS = [
+    UserAdmin,
+    RecipeAdmin,
+    IngredientAdmin,
+    CommentAdmin,
+    RecipeLikeAdmin,
+    SavedRecipeAdmin,
+    FeedbackAdmin,
+]
+
+
+def _backend() -> str:
+    return make_url(settings.DATABASE_URL).get_backend_name()
+
+
+def _build_sync_engine(async_url: str) -> Engine:
     url = make_url(async_url)
     drv = url.drivername
     if "+aiosqlite" in drv:
@@ -107,26 +297,44 @@ def _build_sync_engine(async_url: str):
     else:
         # Fallback: strip async driver part
         url = url.set(drivername=drv.split("+")[0])
-    return create_engine(url)
+    if url.get_backend_name() == "sqlite":
+        return create_engine(url)
+    kwargs: dict[str, Any] = {}
+    if url.get_backend_name() == "postgresql":
+        kwargs["connect_args"] = {
+            "options": f"-c statement_timeout={settings.ADMIN_STATEMENT_TIMEOUT_MS}",
+            "application_name": "share-recipe-admin",
+        }
+    return create_engine(
+        url,
+        pool_size=settings.ADMIN_DB_POOL_SIZE,
+        max_overflow=settings.ADMIN_DB_MAX_OVERFLOW,
+        pool_timeout=settings.ADMIN_DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        **kwargs,
+    )
 
 
-def setup_admin(app):
+def setup_admin(app, engine: Optional[Engine] = None):
     # Build a real sync engine for SQLAdmin to avoid MissingGreenlet with async drivers
-    sync_engine = _build_sync_engine(settings.DATABASE_URL)
+    sync_engine = engine or _build_sync_engine(settings.DATABASE_URL)
     admin = Admin(
         app,
         sync_engine,
         base_url="/admin",
         authentication_backend=SimpleAuth(
-            secret_key=os.getenv("SESSION_SECRET", settings.SECRET_KEY)
+            secret_key=settings.SESSION_SECRET or settings.SECRET_KEY
         ),
     )
     # Register views
-    admin.add_view(UserAdmin)
-    admin.add_view(RecipeAdmin)
-    admin.add_view(IngredientAdmin)
-    admin.add_view(CommentAdmin)
-    admin.add_view(RecipeLikeAdmin)
-    admin.add_view(SavedRecipeAdmin)
-    admin.add_view(FeedbackAdmin)
+    for view in ADMIN_VIEWS:
+        admin.add_view(view)
     return admin
+
+
+def create_admin_app() -> ASGIApp:
+    """
+    SQLAdmin as a standalone ASGI app. app.main mounts it at /admin through
+    LazyApp, so sqladmin and the sync engine are only set up on first use.
+    """
+    return setup_admin(Starlette()).admin
@@ -0,0 +1,40 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.config.config import settings
+from app.core.metrics import metrics
+from app.core.redis import redis_pool_stats
+from app.utils.outbox import get_delivery_status, outbox_stats
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+def _check_token(request: Request) -> None:
+    # Closed unless METRICS_TOKEN is set: without one the routes do not exist
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    token = request.headers.get("x-metrics-token", "")
+    if not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+@router.get("/")
+async def get_metrics(request: Request):
+    """Process-local counters, gauges and timings (per worker)."""
+    _check_token(request)
+    snapshot = metrics.snapshot()
+    snapshot["redis_pool"] = redis_pool_stats()
+    snapshot["email_outbox"] = await outbox_stats()
+    return snapshot
+
+
+@router.get("/email/{message_id}")
+async def get_email_status(message_id: str, request: Request):
+    """Delivery status of a queued email (queued / retrying / sent / failed)."""
+    # Attempts and SMTP errors of someone's mail: same guard as the metrics
+    _check_token(request)
+    data = await get_delivery_status(message_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Unknown message")
+    return data
@@ -1,16 +1,24 @@
 # routers/recipes.py
-import os
 import re
-import uuid
 from datetime import datetime, timezone
 from typing import List
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
 from pydantic import BaseModel
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.config import settings
+from app.core.responses import ORJSONResponse
 from app.db.dao.ingredients import create_ingredient, search_ingredients
 from app.db.dao.recipe import (
     add_comment,
@@ -36,10 +44,14 @@ from app.models.recipe import (
     RecipeCreate,
     RecipeResponse,
     RecipeUpdate,
+    recipe_responses,
 )
 from app.models.feedback import FeedbackCreate, FeedbackResponse
 from app.db.dao.feedback import create_feedback, get_all_feedback
 from app.services.auth import get_current_user, get_optional_user
+from app.services.blobs import absolute_media_url, store_upload
+from app.services.media import process_recipe_image
+from app.utils.uploads import UploadTooLarge
 
 router = APIRouter(prefix="/api/recipes", tags=["Recipes"])
 
@@ -81,6 +93,9 @@ async def list_public_recipes(
     search: str | None = None,
     include_self: bool = False,
     ingredients: str | None = None,
+    # Optional paging; without limit the whole feed is returned, as before
+    limit: int | None = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     session: AsyncSession = Depends(get_async_session),
     user: User | None = Depends(get_optional_user),
 ):
@@ -100,9 +115,17 @@ async def list_public_recipes(
 
     # user is optional; if present (authenticated), liked/saved flags will be included
     # DAO will exclude current user's own posts when user is provided unless include_self=True
-    return await list_recipes(
-        session, search, user, include_self, ingredient_ids=ingredient_ids
+    # Newest first; app/test/test_query_plans.py EXPLAINs these statements
+    rows = await list_recipes(
+        session,
+        search,
+        user,
+        include_self,
+        ingredient_ids=ingredient_ids,
+        limit=limit,
+        offset=offset,
     )
+    return ORJSONResponse(recipe_responses(rows))
 
 
 @router.get("/my-recipes/", response_model=list[RecipeResponse])
@@ -110,7 +133,7 @@ async def list_my_recipes(
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
 ):
-    return await get_recipes_by_user(user, session)
+    return ORJSONResponse(recipe_responses(await get_recipes_by_user(user, session)))
 
 
 @router.get("/saved/", response_model=list[RecipeResponse])
@@ -118,7 +141,7 @@ async def list_saved_recipes(
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
 ):
-    return await list_saved(user, session)
+    return ORJSONResponse(recipe_responses(await list_saved(user, session)))
 
 
 @router.get("/recipe/{recipe_id}/", response_model=RecipeResponse)
@@ -162,35 +185,28 @@ async def remove_recipe(
 async def upload_recipe_image(
     request: Request,
     recipe_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(get_current_user),
 ):
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed.")
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
+    try:
+        stored = await store_upload(
+            file, session, max_bytes=settings.RECIPE_IMAGE_MAX_BYTES
+        )
+    except UploadTooLarge:
         raise HTTPException(status_code=400, detail="File size must be less than 10MB.")
 
-    upload_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-        "..",
-        "media",
-        "recipe_photos",
-    )
-    os.makedirs(upload_dir, exist_ok=True)
-    filename = f"recipe_{recipe_id}_{uuid.uuid4().hex}_{file.filename}"
-    file_path = os.path.join(upload_dir, filename)
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    image_url = f"/media/recipe_photos/{filename}"
+    image_url = stored.url
     recipe = await set_recipe_image(recipe_id, image_url, user, session)
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found or forbidden")
+    # Thumbnails / WebP variants are built in the image process pool
+    background_tasks.add_task(process_recipe_image, recipe_id, stored.path, image_url)
 
-    base_url = str(request.base_url).rstrip("/")
-    return {"image_url": f"{base_url}{image_url}"}
+    return {"image_url": absolute_media_url(str(request.base_url), image_url)}
 
 
 @router.post("/recipe/{recipe_id}/like/")
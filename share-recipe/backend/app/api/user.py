@@ -6,25 +6,35 @@ import asyncio
 import base64
 import hashlib
 import json as jsonlib
-import os
 import random
 import re
 import secrets
 
-# Add SSL and optional httpx/certifi imports
+import importlib
 import ssl
 import urllib.parse
 import urllib.request
-import uuid
 from datetime import datetime, timedelta, timezone
 
 import redis.asyncio as redis
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from fastapi.responses import JSONResponse, RedirectResponse
 from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.config import settings
+from app.core.redis import get_redis
+from app.core.responses import ORJSONResponse
 from app.db.dao.dao import UserDAO
 from app.db.database import User
 from app.db.session import get_async_session
@@ -45,24 +55,21 @@ from app.services.auth import (  # ensure get_optional_user imported
     get_current_user,
     get_optional_user,
 )
-from app.utils.mailer import send_verification_code
+from app.services.blobs import absolute_media_url, store_upload
+from app.services.media import process_profile_photo
+from app.utils.mailer import send_password_reset_code, send_verification_code
+from app.utils.uploads import UploadTooLarge
 from app.utils.security import (
     create_access_token,
     create_email_token,
     create_refresh_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 
-try:
-    import httpx  # type: ignore
-except Exception:  # pragma: no cover - optional
-    httpx = None  # type: ignore
-try:
-    import certifi  # type: ignore
-except Exception:  # pragma: no cover - optional
-    certifi = None  # type: ignore
-from app.db.dao.recipe import get_recipes_by_user, list_saved  # added imports
+from app.db.dao.recipe import list_published_by_author, list_saved
+from app.models.recipe import recipe_responses
+from app.services.profile_cache import cache_profile, get_cached_profile
 
 # Cooldown for username changes (e.g., 14 days)
 USERNAME_CHANGE_COOLDOWN_DAYS = 3
@@ -71,15 +78,10 @@ router = APIRouter(prefix="/api/user", tags=["User"])
 
 
 @router.post("/request-code/")
-async def request_code(payload: RequestCodePayload):
+async def request_code(
+    payload: RequestCodePayload, r: redis.Redis = Depends(get_redis)
+):
     email = payload.email
-    r = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        db=0,
-        decode_responses=True,
-    )
     # Rate limit: max 3 codes per 5 minutes per email
     count_key = f"verify_count:{email}"
     code_key = f"verify:{email}"
@@ -104,14 +106,9 @@ async def request_code(payload: RequestCodePayload):
 
 
 @router.post("/verify-code/")
-async def verify_email_code(data: VerifyEmailRequest):
-    r = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        db=0,
-        decode_responses=True,
-    )
+async def verify_email_code(
+    data: VerifyEmailRequest, r: redis.Redis = Depends(get_redis)
+):
     key = f"verify:{data.email}"
     stored = await r.get(key)
     if not stored or stored != data.code:
@@ -201,8 +198,14 @@ async def signin(
         raise HTTPException(
             status_code=500, detail="User hashed_password is not a string."
         )
-    if not verify_password(user_data.password, hashed_password):
+    ok, upgraded_hash = await verify_password_async(user_data.password, hashed_password)
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if upgraded_hash:
+        # Stored hash used weaker parameters than the current policy
+        setattr(user, "hashed_password", upgraded_hash)
+        session.add(user)
+        await session.commit()
 
     user_id = getattr(user, "id", None)
     if user_id is None or not isinstance(user_id, int):
@@ -291,6 +294,9 @@ async def update_profile(
         setattr(current_user, "username_changed_at", datetime.now(timezone.utc))
         updates.pop("username", None)
 
+    if "photo_url" in updates and updates["photo_url"] != current_user.photo_url:
+        setattr(current_user, "photo_variants", None)
+
     for field, value in updates.items():
         setattr(current_user, field, value)
 
@@ -303,6 +309,7 @@ async def update_profile(
 @router.post("/profile/photo/")
 async def upload_profile_photo(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session),
@@ -310,30 +317,25 @@ async def upload_profile_photo(
     # Валидация типа файла (только изображения)
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed.")
-    # Валидация размера файла (до 5 МБ)
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
+    # Сохраняем файл по хешу содержимого в media/blobs (потоково, до 5 МБ)
+    try:
+        stored = await store_upload(
+            file, session, max_bytes=settings.PROFILE_PHOTO_MAX_BYTES
+        )
+    except UploadTooLarge:
         raise HTTPException(status_code=400, detail="File size must be less than 5MB.")
-    # Сохраняем файл в папку media/profile_photos
-    upload_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-        "..",
-        "media",
-        "profile_photos",
-    )
-    os.makedirs(upload_dir, exist_ok=True)
-    filename = f"user_{current_user.id}_{uuid.uuid4().hex}_{file.filename}"
-    file_path = os.path.join(upload_dir, filename)
-    with open(file_path, "wb") as f:
-        f.write(contents)
     # Сохраняем ссылку в базе
-    setattr(current_user, "photo_url", f"/media/profile_photos/{filename}")
+    setattr(current_user, "photo_url", stored.url)
+    setattr(current_user, "photo_variants", None)
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    # Resized variants are built in the image process pool after responding
+    background_tasks.add_task(
+        process_profile_photo, current_user.id, stored.path, stored.url
+    )
     # Build absolute URL from request
-    base_url = str(request.base_url).rstrip("/")
-    absolute_url = f"{base_url}{current_user.photo_url}"
+    absolute_url = absolute_media_url(str(request.base_url), current_user.photo_url)
     return {"photo_url": absolute_url}
 
 
@@ -342,17 +344,12 @@ async def delete_profile_photo(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session),
 ):
-    # Удаляем файл если есть
+    # Файл не удаляем: он может быть общим (content-addressed),
+    # неиспользуемые файлы удаляет app.cli.media_gc
     if getattr(current_user, "photo_url", None):
-        file_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "..",
-            str(current_user.photo_url).lstrip("/"),
-        )
-        if os.path.exists(file_path):
-            os.remove(file_path)
         # Присваиваем None через setattr для Column[str | None]
         setattr(current_user, "photo_url", None)
+        setattr(current_user, "photo_variants", None)
         session.add(current_user)
         await session.commit()
         await session.refresh(current_user)
@@ -410,6 +407,15 @@ async def google_oauth_login(request: Request, next: str | None = None):
     return RedirectResponse(google_auth_url, status_code=302)
 
 
+def _optional_import(name: str):
+    # OAuth HTTP clients are only needed on the Google login path: import them
+    # on first use instead of at app import (cached in sys.modules afterwards)
+    try:
+        return importlib.import_module(name)
+    except Exception:  # pragma: no cover - optional
+        return None
+
+
 async def _exchange_code_for_tokens(
     code: str, redirect_uri: str, code_verifier: str | None = None
 ) -> dict:
@@ -423,6 +429,8 @@ async def _exchange_code_for_tokens(
     }
     if code_verifier:
         payload["code_verifier"] = code_verifier
+    httpx = _optional_import("httpx")
+    certifi = _optional_import("certifi")
     # Prefer httpx which bundles certifi, fallback to urllib with certifi context
     if httpx is not None:
         try:
@@ -461,6 +469,8 @@ async def _exchange_code_for_tokens(
 
 async def _fetch_google_userinfo(access_token: str) -> dict:
     userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
+    httpx = _optional_import("httpx")
+    certifi = _optional_import("certifi")
     # Prefer httpx which bundles certifi, fallback to urllib with certifi context
     if httpx is not None:
         try:
@@ -599,52 +609,77 @@ async def google_oauth_callback(
     return RedirectResponse(final_url, status_code=302)
 
 
+def _profile_headers(anonymous: bool) -> dict[str, str]:
+    # The anonymous page is identical for everyone: shared caches may keep it
+    if anonymous and settings.PUBLIC_PROFILE_CACHE_SECONDS > 0:
+        cache_control = f"public, max-age={settings.PUBLIC_PROFILE_CACHE_SECONDS}"
+    else:
+        cache_control = "private, no-cache"
+    return {"cache-control": cache_control, "vary": "Authorization"}
+
+
 @router.get("/public/{username}", response_model=UserPublicProfile)
 async def public_profile(
     username: str,
+    limit: int = Query(settings.PUBLIC_PROFILE_PAGE_SIZE, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     session: AsyncSession = Depends(get_async_session),
     current: User | None = Depends(get_optional_user),
+    r: redis.Redis = Depends(get_redis),
 ):
+    anonymous = current is None
+    if anonymous:
+        cached = await get_cached_profile(r, username, limit, offset)
+        if cached is not None:
+            return Response(
+                cached,
+                media_type="application/json",
+                headers=_profile_headers(anonymous),
+            )
     user_obj = await UserDAO.get_user_by_username(session, username)
     if user_obj is None:
         raise HTTPException(status_code=404, detail="User not found")
     # Get plain values (avoid Column objects)
     data = user_obj.__dict__
-    recs = await get_recipes_by_user(user_obj, session)
-    recs = [r for r in recs if getattr(r, "is_published", True)]
+    # Published only, one page; liked/saved flags are the viewer's
+    recs = await list_published_by_author(
+        user_obj.id, session, viewer=current, limit=limit, offset=offset
+    )
     saved = []
     if current is not None and getattr(current, "id", None) == getattr(
         user_obj, "id", None
     ):
         saved = await list_saved(user_obj, session)
-    profile = UserPublicProfile(
+    # Built from plain values and encoded with orjson, like the recipe lists
+    profile = UserPublicProfile.model_construct(
         username=str(data.get("username")),
         first_name=data.get("first_name") or None,
         last_name=data.get("last_name") or None,
         joined=data.get("joined") or None,
         photo_url=data.get("photo_url") or None,
+        photo_variants=data.get("photo_variants") or None,
         bio=data.get("bio") or None,
-        recipes=recs,
-        saved_recipes=saved,
+        recipes_count=int(data.get("recipes_count") or 0),
+        likes_received=int(data.get("likes_received") or 0),
+        recipes=recipe_responses(recs),
+        saved_recipes=recipe_responses(saved),
     )
-    return profile
+    response = ORJSONResponse(profile, headers=_profile_headers(anonymous))
+    if anonymous:
+        await cache_profile(r, username, limit, offset, response.body)
+    return response
 
 
 @router.post("/request-password-reset/")
-async def request_password_reset(payload: PasswordResetRequest):
+async def request_password_reset(
+    payload: PasswordResetRequest, r: redis.Redis = Depends(get_redis)
+):
     email = payload.email.lower().strip()
-    r = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        db=0,
-        decode_responses=True,
-    )
     code = f"{random.randint(100000, 999999)}"
     key = f"reset:{email}"
     await r.setex(key, 300, code)  # 5 minutes
     try:
-        await send_verification_code(email, code)
+        await send_password_reset_code(email, code)
     except Exception:
         # do not leak whether email exists; still report ok
         pass
@@ -653,17 +688,12 @@ async def request_password_reset(payload: PasswordResetRequest):
 
 @router.post("/reset-password/")
 async def reset_password(
-    data: PasswordResetConfirm, session: AsyncSession = Depends(get_async_session)
+    data: PasswordResetConfirm,
+    session: AsyncSession = Depends(get_async_session),
+    r: redis.Redis = Depends(get_redis),
 ):
     email = data.email.lower().strip()
     # Verify code
-    r = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        db=0,
-        decode_responses=True,
-    )
     stored = await r.get(f"reset:{email}")
     if not stored or stored != data.code:
         raise HTTPException(status_code=400, detail="Invalid or expired code")
@@ -687,7 +717,7 @@ async def reset_password(
     # Update user password if user exists
     user = await UserDAO.get_user_by_email(session, email)
     if user:
-        new_hash = hash_password(data.new_password)
+        new_hash = await hash_password_async(data.new_password)
         # Write to correct column name
         setattr(user, "hashed_password", new_hash)
         session.add(user)
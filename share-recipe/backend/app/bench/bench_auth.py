@@ -0,0 +1,81 @@
+"""
+Per-request authentication overhead, before and after the token/user caches.
+
+    python -m app.bench.bench_auth --iterations 2000
+
+"before" replays the original path: jwt.decode on every call plus a user
+lookup on a freshly opened session. "after" calls get_current_user with the
+verified-JWT and user caches warm.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bench.common import print_table, sqlite_engine, time_async, time_sync
+from app.config.config import settings
+from app.db.dao.dao import UserDAO
+from app.db.database import User
+from app.services import auth, user_cache
+from app.utils.security import create_access_token, hash_password
+
+
+async def run(iterations: int) -> dict[str, dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = await sqlite_engine(os.path.join(tmp, "bench.db"))
+        SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+        async with SessionLocal() as s:
+            user = User(
+                email="bench@example.com",
+                username="bench",
+                hashed_password=hash_password("StrongP@ssw0rd"),
+            )
+            s.add(user)
+            await s.commit()
+            user_id = user.id
+        token = create_access_token(user_id)
+        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        def decode_uncached():
+            return jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+
+        async def before():
+            decode_uncached()
+            async with SessionLocal() as s:
+                return await UserDAO.get_by_id(user_id, s)
+
+        async def after():
+            async with SessionLocal() as s:
+                return await auth.get_current_user(creds, s)
+
+        auth._token_cache.clear()
+        user_cache._cache.clear()
+        rows = {
+            "jwt.decode (uncached)": time_sync(decode_uncached, iterations),
+            "decode_token (cached)": time_sync(
+                lambda: auth.decode_token(token), iterations
+            ),
+            "get_current_user before": await time_async(before, iterations),
+            "get_current_user after": await time_async(after, iterations),
+        }
+        await engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    rows = asyncio.run(run(args.iterations))
+    print_table("Auth overhead per request", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Time the DAO and auth hot paths on a seeded database and flag regressions.
+
+    python -m app.bench.bench_dao --save-baseline main
+    python -m app.bench.bench_dao --compare main --tolerance 0.2
+    python -m app.bench.bench_dao --database-url postgresql://localhost/bench --seed 10k
+
+Without --database-url a throwaway SQLite file is seeded with app.cli.seed
+(--scale recipes). With it, the database is used as is, or seeded first with
+--seed; either way it must already have the schema (app.cli.migrate). Each
+case runs in isolation with warm caches, the way it runs inside a request:
+list_recipes (anonymous, signed in, searched), get_recipe_by_id,
+_attach_social_fields, search_ingredients, add_like (new likes, removed again
+afterwards), get_current_user, JWT decode and RecipeResponse serialization.
+
+--save-baseline stores the results under bench-results/; --compare exits 1
+when a case's p50 is more than --tolerance slower than the baseline (and by
+more than --noise-us, so sub-microsecond cases do not flap). Baselines are
+only comparable on the same machine and database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.bench.common import (
+    load_baseline,
+    print_table,
+    save_baseline,
+    time_async,
+    time_sync,
+)
+from app.cli import seed
+from app.config.config import settings
+from app.core.responses import ORJSONResponse
+from app.db.dao import recipe as recipe_dao
+from app.db.dao.dao import UserDAO
+from app.db.dao.ingredients import search_ingredients
+from app.db.database import User
+from app.db.recipes import Recipe
+from app.db.social import RecipeLike
+from app.models.recipe import recipe_responses
+from app.services import auth, user_cache
+from app.utils.security import create_access_token
+
+
+def async_database_url(url: str) -> str:
+    for sync_driver, async_driver in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_driver):
+            return async_driver + url[len(sync_driver) :]
+    return url
+
+
+def _seed(url: str, scale: int) -> dict:
+    target = ["--database-url", url] if url.startswith("postgresql") else ["--sqlite"]
+    if target[0] == "--sqlite":
+        target.append(url.split("///", 1)[1])
+    return seed.run(seed.parse_args(target + ["--scale", str(scale)]))
+
+
+async def _subject(SessionLocal) -> tuple[User, int]:
+    """The most prolific author, and one of their recipes that has likes."""
+    async with SessionLocal() as s:
+        user_id = await s.scalar(
+            select(Recipe.user_id)
+            .group_by(Recipe.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        recipe_id = await s.scalar(
+            select(RecipeLike.recipe_id)
+            .group_by(RecipeLike.recipe_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        if user_id is None or recipe_id is None:
+            raise SystemExit("bench_dao: the database has no recipes; use --seed")
+        return await UserDAO.get_by_id(user_id, s), recipe_id
+
+
+async def _unliked(SessionLocal, user: User, n: int) -> list[int]:
+    async with SessionLocal() as s:
+        liked = select(RecipeLike.recipe_id).where(RecipeLike.user_id == user.id)
+        res = await s.execute(
+            select(Recipe.id)
+            .where(Recipe.id.not_in(liked))
+            .order_by(Recipe.id)
+            .limit(n)
+        )
+        return list(res.scalars())
+
+
+async def run_cases(engine, iterations: int) -> dict[str, dict]:
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    user, recipe_id = await _subject(SessionLocal)
+    token = create_access_token(user.id)
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    term = user.username[:3]
+    # Whole-feed cases are ~100x slower; fewer samples keep runs short
+    slow = max(3, iterations // 4)
+
+    async def in_session(fn):
+        async with SessionLocal() as s:
+            return await fn(s)
+
+    async with SessionLocal() as s:
+        page = await recipe_dao.list_recipes(s)
+        loaded = (
+            await s.execute(
+                select(Recipe)
+                .options(joinedload(Recipe.user))
+                .where(Recipe.id == recipe_id)
+            )
+        ).scalar_one()
+
+        rows = {
+            "list_recipes": await time_async(
+                lambda: in_session(recipe_dao.list_recipes), slow, warmup=2
+            ),
+            "list_recipes (signed in)": await time_async(
+                lambda: in_session(lambda s: recipe_dao.list_recipes(s, user=user)),
+                slow,
+                warmup=2,
+            ),
+            "list_recipes (search)": await time_async(
+                lambda: in_session(lambda s: recipe_dao.list_recipes(s, search="soup")),
+                slow,
+                warmup=2,
+            ),
+            "get_recipe_by_id": await time_async(
+                lambda: in_session(
+                    lambda s: recipe_dao.get_recipe_by_id(recipe_id, s, user)
+                ),
+                iterations,
+            ),
+            "_attach_social_fields": await time_async(
+                lambda: recipe_dao._attach_social_fields(s, loaded, user), iterations
+            ),
+            "search_ingredients": await time_async(
+                lambda: in_session(lambda s: search_ingredients(s, term)), iterations
+            ),
+        }
+
+    # Each timed add_like inserts a new row; they are removed again untimed
+    targets = await _unliked(SessionLocal, user, iterations + 10)
+    pending = iter(targets)
+    try:
+        rows["add_like"] = await time_async(
+            lambda: in_session(
+                lambda s: recipe_dao.add_like(next(pending, recipe_id), user, s)
+            ),
+            min(iterations, max(1, len(targets) - 10)),
+        )
+    finally:
+        async with SessionLocal() as s:
+            for target in targets:
+                await recipe_dao.remove_like(target, user, s)
+
+    auth._token_cache.clear()
+    user_cache._cache.clear()
+    rows["get_current_user"] = await time_async(
+        lambda: in_session(lambda s: auth.get_current_user(creds, s)), iterations
+    )
+    rows["jwt.decode"] = time_sync(
+        lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        iterations,
+    )
+    rows["decode_token (cached)"] = time_sync(
+        lambda: auth.decode_token(token), iterations
+    )
+    rows["RecipeResponse feed (orjson)"] = time_sync(
+        lambda: ORJSONResponse(recipe_responses(page)).body, slow, warmup=2
+    )
+    return rows
+
+
+async def run(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        scale = args.seed or (None if args.database_url else args.scale)
+        if scale:
+            _seed(url, scale)
+        engine = create_async_engine(async_database_url(url))
+        try:
+            started = time.perf_counter()
+            cases = await run_cases(engine, args.iterations)
+            async with engine.connect() as conn:
+                recipes = await conn.scalar(select(func.count()).select_from(Recipe))
+        finally:
+            await engine.dispose()
+    return {
+        "database": engine.dialect.name,
+        "recipes": recipes,
+        "iterations": args.iterations,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seconds": round(time.perf_counter() - started, 1),
+        "cases": cases,
+    }
+
+
+def regressions(
+    baseline: dict, current: dict, tolerance: float, noise_us: float
+) -> list[str]:
+    """Cases whose p50 got slower than the baseline by more than tolerance."""
+    slower = []
+    for name, now in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            continue
+        limit = max(before["p50_us"] * (1 + tolerance), before["p50_us"] + noise_us)
+        if now["p50_us"] > limit:
+            slower.append(name)
+    return slower
+
+
+def compare(baseline: dict, current: dict, slower: list[str]) -> str:
+    lines = [f"{'case':<40} {'base p50':>10} {'p50 us':>10} {'change':>8}"]
+    for name, now in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            lines.append(f"{name:<40} {'-':>10} {now['p50_us']:>10.1f}")
+            continue
+        change = (now["p50_us"] - before["p50_us"]) / before["p50_us"]
+        flag = "  REGRESSED" if name in slower else ""
+        lines.append(
+            f"{name:<40} {before['p50_us']:>10.1f} {now['p50_us']:>10.1f} "
+            f"{change:>+8.0%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="seeded database; default: SQLite")
+    parser.add_argument(
+        "--scale", type=seed._count, default=2000, help="recipes for SQLite"
+    )
+    parser.add_argument(
+        "--seed", type=seed._count, help="seed --database-url with this many recipes"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--report", help="compare a saved run instead of running")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed p50 slowdown, 0.25 = 25%%",
+    )
+    parser.add_argument("--noise-us", type=float, default=5.0)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.report:
+        report = json.loads(Path(args.report).read_text())
+    else:
+        report = asyncio.run(run(args))
+        print_table(
+            f"{report['database']}, {report['recipes']} recipes", report["cases"]
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        save_baseline(args.save_baseline, report)
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        slower = regressions(baseline, report, args.tolerance, args.noise_us)
+        print(f"\nAgainst {args.compare} (tolerance {args.tolerance:.0%})")
+        print(compare(baseline, report, slower))
+        if slower:
+            sys.exit(f"bench_dao: {len(slower)} case(s) regressed: {', '.join(slower)}")
+
+
+if __name__ == "__main__":
+    main()
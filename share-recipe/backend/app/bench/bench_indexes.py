@@ -0,0 +1,204 @@
+"""
+Index footprint and insert throughput of the social join tables.
+
+    python -m app.bench.bench_indexes --save-baseline before   # then migrate
+    python -m app.bench.bench_indexes --compare before
+    python -m app.bench.bench_indexes --sqlite /tmp/load.db --rows 20000
+
+For recipe_likes, saved_recipes and recipe_ingredients: the size of the table
+and of each of its indexes (pg_relation_size on PostgreSQL, the dbstat table
+on SQLite), then the time to insert --rows new pairs in batches, inside a
+transaction that is rolled back (median of --repeat passes). Run it on a
+seeded database (app.cli.seed) before and after a schema change; --compare
+prints the difference.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import column, create_engine, pool, table, text
+from sqlalchemy.engine import Connection
+
+from app.bench.common import load_baseline, save_baseline
+from app.db.migrations import database_url, sync_database_url
+
+# Join table -> (the column paired with recipe_id, the table it points to)
+TABLES = {
+    "recipe_likes": ("user_id", "users"),
+    "saved_recipes": ("user_id", "users"),
+    "recipe_ingredients": ("ingredient_id", "ingredients"),
+}
+BATCH_ROWS = 1000
+
+
+def relation_sizes(conn: Connection, name: str) -> dict[str, int]:
+    """Bytes on disk of a table (under its own name) and of each of its indexes."""
+    if conn.dialect.name == "postgresql":
+        rows = conn.execute(
+            text(
+                "SELECT c.relname, pg_relation_size(c.oid) FROM pg_class c "
+                "WHERE c.oid = CAST(:t AS regclass) OR c.oid IN "
+                "(SELECT indexrelid FROM pg_index "
+                "WHERE indrelid = CAST(:t AS regclass))"
+            ),
+            {"t": name},
+        )
+    else:
+        rows = conn.execute(
+            text(
+                "SELECT name, sum(pgsize) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE tbl_name = :t) GROUP BY name"
+            ),
+            {"t": name},
+        )
+    return {relname: int(size) for relname, size in rows}
+
+
+def _new_pairs(conn: Connection, name: str, n: int) -> list[tuple[int, int]]:
+    # Pairs of existing recipes and users/ingredients that are not in the
+    # table yet, so the inserts hit the same constraints the app's do
+    other, target = TABLES[name]
+    side = int((2 * n) ** 0.5) + 1
+    rows = conn.execute(
+        text(
+            f"SELECT r.id, o.id FROM "
+            f"(SELECT id FROM recipes ORDER BY id DESC LIMIT :side) r CROSS JOIN "
+            f"(SELECT id FROM {target} ORDER BY id DESC LIMIT :side) o "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {name} x "
+            f"WHERE x.recipe_id = r.id AND x.{other} = o.id) LIMIT :n"
+        ),
+        {"side": side, "n": n},
+    )
+    return [tuple(row) for row in rows]
+
+
+def insert_rate(conn: Connection, name: str, n: int, repeat: int = 3) -> dict:
+    other, _ = TABLES[name]
+    columns = ["recipe_id", other]
+    if name != "recipe_ingredients":
+        columns.append("created_at")
+    stmt = table(name, *(column(c) for c in columns)).insert()
+    now = datetime.now(timezone.utc)
+    rows = [
+        dict(zip(columns, (recipe_id, other_id, now)))
+        for recipe_id, other_id in _new_pairs(conn, name, n)
+    ]
+    conn.commit()
+    timings = []
+    for _ in range(repeat):
+        trans = conn.begin()
+        try:
+            started = time.perf_counter()
+            for i in range(0, len(rows), BATCH_ROWS):
+                conn.execute(stmt, rows[i : i + BATCH_ROWS])
+            timings.append(time.perf_counter() - started)
+        finally:
+            trans.rollback()
+    return {
+        "insert_rows": len(rows),
+        "inserts_per_s": (
+            round(len(rows) / statistics.median(timings)) if rows else None
+        ),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    url = args.database_url or (
+        f"sqlite:///{args.sqlite}" if args.sqlite else database_url()
+    )
+    engine = create_engine(sync_database_url(url), poolclass=pool.NullPool)
+    report: dict = {"database": engine.dialect.name, "tables": {}}
+    try:
+        with engine.connect() as conn:
+            for name in TABLES:
+                sizes = relation_sizes(conn, name)
+                table_bytes = sizes.pop(name, None)
+                count = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                report["tables"][name] = {
+                    "rows": count,
+                    "table_bytes": table_bytes,
+                    "index_bytes": sum(sizes.values()),
+                    "indexes": sizes,
+                    **insert_rate(conn, name, args.rows, args.repeat),
+                }
+    finally:
+        engine.dispose()
+    return report
+
+
+def _mb(n) -> str:
+    return "-" if n is None else f"{n / 2**20:.1f}"
+
+
+def to_table(report: dict) -> str:
+    lines = [
+        f"{'table':<20} {'rows':>10} {'table MB':>9} {'index MB':>9} "
+        f"{'indexes':>7} {'inserts/s':>10}"
+    ]
+    for name, t in report["tables"].items():
+        lines.append(
+            f"{name:<20} {t['rows']:>10} {_mb(t['table_bytes']):>9} "
+            f"{_mb(t['index_bytes']):>9} {len(t['indexes']):>7} "
+            f"{t['inserts_per_s'] or '-':>10}"
+        )
+    return "\n".join(lines)
+
+
+def _change(before, after) -> str:
+    if not before or after is None:
+        return "-"
+    return f"{(after - before) / before:+.0%}"
+
+
+def compare(baseline: dict, current: dict) -> str:
+    lines = [f"{'table':<20} {'index bytes':>12} {'inserts/s':>10}  indexes"]
+    for name, now in current["tables"].items():
+        before = baseline["tables"].get(name)
+        if before is None:
+            continue
+        dropped = sorted(set(before["indexes"]) - set(now["indexes"]))
+        added = sorted(set(now["indexes"]) - set(before["indexes"]))
+        lines.append(
+            f"{name:<20} {_change(before['index_bytes'], now['index_bytes']):>12} "
+            f"{_change(before['inserts_per_s'], now['inserts_per_s']):>10}  "
+            + " ".join([f"-{i}" for i in dropped] + [f"+{i}" for i in added])
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--database-url", help="defaults to DATABASE_URL")
+    target.add_argument("--sqlite", help="SQLite file")
+    parser.add_argument(
+        "--rows", type=int, default=10_000, help="rows inserted per table"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="insert passes; the median is kept"
+    )
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    report = run(args)
+    print(to_table(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, report)
+    if args.compare:
+        print(f"\nAgainst {args.compare}")
+        print(compare(load_baseline(args.compare), report))
+
+
+if __name__ == "__main__":
+    main()
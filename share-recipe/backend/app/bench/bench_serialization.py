@@ -0,0 +1,139 @@
+"""
+Recipe feed response cost for a 500-recipe page, before and after the fast path.
+
+    python -m app.bench.bench_serialization --recipes 500 --iterations 30
+
+"before" replays the original path: ORM objects with per-recipe social and
+ingredient queries, validated into RecipeResponse via from_attributes and
+encoded with the stdlib json module (what FastAPI does for response_model).
+"after" is the current path: batched plain-dict rows, model_construct and
+orjson. The serialize-only cases time encoding of already loaded rows.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import joinedload
+from starlette.responses import JSONResponse
+
+from app.bench.common import print_table, sqlite_engine, time_async, time_sync
+from app.core.responses import ORJSONResponse
+from app.db.dao.recipe import _attach_ingredients, _attach_social_fields, list_recipes
+from app.db.database import User
+from app.db.ingredients import Ingredient
+from app.db.recipe_ingredients import RecipeIngredient
+from app.db.recipes import Recipe
+from app.db.social import RecipeLike
+from app.models.recipe import RecipeResponse, recipe_responses
+
+_FEED = TypeAdapter(list[RecipeResponse])
+
+
+async def _seed(SessionLocal, recipes: int) -> None:
+    async with SessionLocal() as s:
+        users = [
+            User(email=f"u{i}@example.com", username=f"cook{i}", hashed_password="x")
+            for i in range(20)
+        ]
+        ingredients = [
+            Ingredient(name=f"ingredient {i}", name_norm=f"ingredient {i}")
+            for i in range(40)
+        ]
+        s.add_all(users + ingredients)
+        await s.flush()
+        for i in range(recipes):
+            recipe = Recipe(
+                title=f"Recipe {i}",
+                description="A weeknight favourite. " * 10,
+                instructions="Chop, stir and simmer gently. " * 40,
+                image_url=f"/media/blobs/ab/cd/{i:064x}.jpg",
+                user_id=users[i % len(users)].id,
+            )
+            s.add(recipe)
+            await s.flush()
+            for j in range(6):
+                ingredient = ingredients[(i + j) % len(ingredients)]
+                s.add(
+                    RecipeIngredient(recipe_id=recipe.id, ingredient_id=ingredient.id)
+                )
+            for u in users[: i % 7]:
+                s.add(RecipeLike(recipe_id=recipe.id, user_id=u.id))
+        await s.commit()
+
+
+async def run(recipes: int, iterations: int) -> dict[str, dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = await sqlite_engine(os.path.join(tmp, "bench.db"))
+        SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+        await _seed(SessionLocal, recipes)
+
+        async def load_before():
+            async with SessionLocal() as s:
+                res = await s.execute(
+                    select(Recipe)
+                    .options(joinedload(Recipe.user))
+                    .order_by(Recipe.created_at.desc())
+                )
+                out = []
+                for r in res.scalars().all():
+                    await _attach_social_fields(s, r)
+                    await _attach_ingredients(s, r)
+                    out.append(r)
+                return out
+
+        async def load_after():
+            async with SessionLocal() as s:
+                return await list_recipes(s)
+
+        def serialize_before(objs):
+            content = _FEED.dump_python(
+                _FEED.validate_python(objs, from_attributes=True), mode="json"
+            )
+            return JSONResponse(content).body
+
+        def serialize_after(rows):
+            return ORJSONResponse(recipe_responses(rows)).body
+
+        async def before():
+            return serialize_before(await load_before())
+
+        async def after():
+            return serialize_after(await load_after())
+
+        objs = await load_before()
+        rows = await load_after()
+        assert len(rows) == recipes
+        results = {
+            "serialize before (from_attributes+json)": time_sync(
+                lambda: serialize_before(objs), iterations, warmup=3
+            ),
+            "serialize after (construct+orjson)": time_sync(
+                lambda: serialize_after(rows), iterations, warmup=3
+            ),
+            "feed before (load+serialize)": await time_async(
+                before, max(1, iterations // 10), warmup=1
+            ),
+            "feed after (load+serialize)": await time_async(
+                after, iterations, warmup=3
+            ),
+        }
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    rows = asyncio.run(run(args.recipes, args.iterations))
+    print_table(f"Recipe feed, {args.recipes} recipes", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Shared helpers for the micro-benchmarks in app/bench
+import json
+import statistics
+import time
+import typing as t
+from pathlib import Path
+
+# Saved runs (--save-baseline NAME / --compare NAME)
+RESULTS_DIR = Path(__file__).resolve().parents[2] / "bench-results"
+
+
+def summarize(samples_ns: list[int]) -> dict:
+    samples = sorted(samples_ns)
+    n = len(samples)
+    return {
+        "iterations": n,
+        "mean_us": statistics.fmean(samples) / 1000,
+        "p50_us": samples[n // 2] / 1000,
+        "p95_us": samples[min(n - 1, int(n * 0.95))] / 1000,
+        "p99_us": samples[min(n - 1, int(n * 0.99))] / 1000,
+    }
+
+
+def time_sync(fn: t.Callable[[], t.Any], iterations: int, warmup: int = 10) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+async def time_async(
+    fn: t.Callable[[], t.Awaitable[t.Any]], iterations: int, warmup: int = 10
+) -> dict:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        await fn()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+def print_table(title: str, rows: dict[str, dict]) -> None:
+    print(f"\n{title}")
+    print(f"{'case':<40} {'mean us':>10} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+    for name, r in rows.items():
+        print(
+            f"{name:<40} {r['mean_us']:>10.1f} {r['p50_us']:>10.1f} "
+            f"{r['p95_us']:>10.1f} {r['p99_us']:>10.1f}"
+        )
+
+
+def save_baseline(name: str, report: dict) -> None:
+    RESULTS_DIR.mkdir(exist_ok=True)
+    (RESULTS_DIR / f"{name}.json").write_text(json.dumps(report, indent=2))
+
+
+def load_baseline(name: str) -> dict:
+    return json.loads((RESULTS_DIR / f"{name}.json").read_text())
+
+
+async def sqlite_engine(path: str):
+    """Create a throwaway SQLite database with the full schema."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.db.base import Base
+
+    # Import all models so metadata knows about tables
+    import app.db.database  # noqa: F401
+    import app.db.feedback  # noqa: F401
+    import app.db.ingredients  # noqa: F401
+    import app.db.recipe_ingredients  # noqa: F401
+    import app.db.recipes  # noqa: F401
+    import app.db.social  # noqa: F401
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
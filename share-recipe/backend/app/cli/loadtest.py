@@ -0,0 +1,400 @@
+"""
+Drive a running API with scripted user mixes and report latency per route.
+
+    python -m app.cli.loadtest --users 50 --duration 60
+    python -m app.cli.loadtest --mix browser=6,liker=2,author=1,typist=1
+    python -m app.cli.loadtest --save-baseline main
+    python -m app.cli.loadtest --compare main              # run, then diff against main
+    python -m app.cli.loadtest --report run.json --compare main   # diff a saved run
+
+Closed loop: --users virtual users, each running one scenario (picked by
+--mix weight) back to back until --duration ends:
+- browser: anonymous feed (sometimes searched or filtered), a few recipes
+  with their comments, now and then an author's public profile
+- liker: signed in; feed, then toggles likes and saves
+- author: signed in; creates a recipe, edits it, lists their own, deletes half
+- typist: ingredient autocomplete, one request per keystroke
+
+Signed-in users log in as --email (with {n} from --accounts) and --password,
+which matches the users made by app.cli.seed. Authors are subject to
+POSTS_DAILY_LIMIT (429s show up in the status counts); raise it on the
+instance under test for author-heavy mixes. Results are printed as
+Markdown; --json/--markdown write them to files, --save-baseline stores them
+under loadtest-results/ and --compare prints p50/p95/p99 and throughput
+deltas against a stored baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+RESULTS_DIR = Path(__file__).resolve().parents[2] / "loadtest-results"
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+SEARCH_TERMS = ["soup", "chicken", "pasta", "curry", "garlic", "salad", "tofu"]
+TYPED_WORDS = ["tomato", "garlic", "paprika", "chickpeas", "rosemary", "salmon"]
+
+
+def _percentile(sorted_ms: list[float], q: float) -> float:
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * q))]
+
+
+class Recorder:
+    """Latencies and outcomes per route label, ignoring the warmup period."""
+
+    def __init__(self, measure_from: float) -> None:
+        self.measure_from = measure_from
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def add(self, label: str, started: float, status: Optional[int]) -> None:
+        if started < self.measure_from:
+            return
+        self.latencies[label].append((time.monotonic() - started) * 1000)
+        self.statuses[label][str(status) if status else "error"] += 1
+        # Transport failures and server errors; 4xx are reported per status
+        if status is None or status >= 500:
+            self.errors[label] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for label in sorted(self.latencies):
+            ms = sorted(self.latencies[label])
+            routes[label] = {
+                "requests": len(ms),
+                "rps": round(len(ms) / elapsed, 2),
+                "mean_ms": round(sum(ms) / len(ms), 2),
+                "p50_ms": round(_percentile(ms, 0.50), 2),
+                "p95_ms": round(_percentile(ms, 0.95), 2),
+                "p99_ms": round(_percentile(ms, 0.99), 2),
+                "max_ms": round(ms[-1], 2),
+                "errors": self.errors[label],
+                "error_rate": round(self.errors[label] / len(ms), 4),
+                "status": dict(self.statuses[label]),
+            }
+        requests = sum(r["requests"] for r in routes.values())
+        errors = sum(self.errors.values())
+        return {
+            "requests": requests,
+            "rps": round(requests / elapsed, 2),
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    def __init__(
+        self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random
+    ) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.headers: dict[str, str] = {}
+
+    async def request(
+        self, method: str, path: str, label: Optional[str] = None, **kw
+    ) -> Optional[httpx.Response]:
+        label = label or f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+        started = time.monotonic()
+        try:
+            resp = await self.client.request(method, path, headers=self.headers, **kw)
+        except httpx.HTTPError:
+            self.recorder.add(label, started, None)
+            return None
+        self.recorder.add(label, started, resp.status_code)
+        return resp
+
+    async def get_json(self, path: str, label: Optional[str] = None, **kw):
+        resp = await self.request("GET", path, label, **kw)
+        if resp is None or resp.status_code != 200:
+            return None
+        return resp.json()
+
+    async def login(self, email: str, password: str) -> bool:
+        resp = await self.request(
+            "POST",
+            "/api/user/signin/",
+            SIGN_IN,
+            json={"email": email, "password": password},
+        )
+        if resp is None or resp.status_code != 200:
+            return False
+        self.headers["Authorization"] = f"Bearer {resp.json()['access']}"
+        return True
+
+    async def feed(self) -> list[dict]:
+        params = {}
+        roll = self.rng.random()
+        if roll < 0.3:
+            params["search"] = self.rng.choice(SEARCH_TERMS)
+        elif roll < 0.4:
+            params["ingredients"] = str(self.rng.randint(1, 200))
+        return await self.get_json("/api/recipes/list/", params=params) or []
+
+
+async def browser(vu: VirtualUser) -> None:
+    recipes = await vu.feed()
+    for recipe in vu.rng.sample(recipes[:50], min(3, len(recipes))):
+        await vu.get_json(f"/api/recipes/recipe/{recipe['id']}/")
+        await vu.get_json(f"/api/recipes/recipe/{recipe['id']}/comments/")
+    authors = [r["author_username"] for r in recipes[:50] if r.get("author_username")]
+    if authors and vu.rng.random() < 0.3:
+        await vu.get_json(
+            f"/api/user/public/{vu.rng.choice(authors)}",
+            label="GET /api/user/public/{username}",
+        )
+
+
+async def liker(vu: VirtualUser) -> None:
+    recipes = await vu.feed()
+    for recipe in vu.rng.sample(recipes[:50], min(3, len(recipes))):
+        path = f"/api/recipes/recipe/{recipe['id']}"
+        await vu.request("DELETE" if recipe.get("liked") else "POST", f"{path}/like/")
+        if vu.rng.random() < 0.3:
+            method = "DELETE" if recipe.get("saved") else "POST"
+            await vu.request(method, f"{path}/save/")
+    if vu.rng.random() < 0.2:
+        await vu.get_json("/api/recipes/saved/")
+
+
+async def author(vu: VirtualUser) -> None:
+    found = await vu.get_json(
+        "/api/recipes/ingredients/", params={"q": vu.rng.choice(TYPED_WORDS)[:3]}
+    )
+    ingredients = [i["id"] for i in (found or [])[:5]]
+    resp = await vu.request(
+        "POST",
+        "/api/recipes/create/",
+        json={
+            "title": f"Load test {vu.rng.choice(SEARCH_TERMS)}",
+            "description": "Made by the load test.",
+            "instructions": "Stir and simmer. " * 20,
+            "ingredients": ingredients,
+        },
+    )
+    if resp is None or resp.status_code != 200:
+        return
+    recipe_id = resp.json()["id"]
+    await vu.request(
+        "PATCH", f"/api/recipes/recipe/{recipe_id}/", json={"title": "Edited"}
+    )
+    await vu.get_json("/api/recipes/my-recipes/")
+    # Delete half, so long runs do not only grow the table
+    if vu.rng.random() < 0.5:
+        await vu.request("DELETE", f"/api/recipes/recipe/{recipe_id}/")
+
+
+async def typist(vu: VirtualUser) -> None:
+    word = vu.rng.choice(TYPED_WORDS)
+    for n in range(1, len(word) + 1):
+        await vu.get_json("/api/recipes/ingredients/", params={"q": word[:n]})
+        await asyncio.sleep(vu.rng.uniform(0.05, 0.2))
+
+
+Scenario = Callable[[VirtualUser], Awaitable[None]]
+SCENARIOS: dict[str, Scenario] = {
+    "browser": browser,
+    "liker": liker,
+    "author": author,
+    "typist": typist,
+}
+SIGNED_IN = {"liker", "author"}
+SIGN_IN = "POST /api/user/signin/"
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def _assign(mix: dict[str, float], users: int) -> list[str]:
+    # Largest remainder, so small runs still get every weighted scenario
+    total = sum(mix.values())
+    shares = {name: users * w / total for name, w in mix.items()}
+    counts = {name: int(share) for name, share in shares.items()}
+    by_remainder = sorted(shares, key=lambda n: shares[n] - counts[n], reverse=True)
+    for name in by_remainder[: users - sum(counts.values())]:
+        counts[name] += 1
+    return [name for name, count in counts.items() for _ in range(count)]
+
+
+def _account(args: argparse.Namespace, i: int) -> str:
+    lo, _, hi = args.accounts.partition("-")
+    n = int(lo) + i % (int(hi or lo) - int(lo) + 1)
+    return args.email.format(n=n)
+
+
+async def run(
+    args: argparse.Namespace, transport: Optional[httpx.AsyncBaseTransport] = None
+) -> dict:
+    # Sign-ins (bcrypt) happen before the clock starts and are reported
+    # separately (sign_in_p50_ms, failed_sign_ins)
+    recorder = Recorder(measure_from=0.0)
+    iterations: Counter = Counter()
+    assigned = _assign(args.mix, args.users)
+
+    async def sign_in(i: int, scenario: str) -> Optional[VirtualUser]:
+        vu = VirtualUser(client, recorder, random.Random(args.seed + i))
+        if scenario in SIGNED_IN:
+            if not await vu.login(_account(args, i), args.password):
+                return None
+        return vu
+
+    async def loop(i: int, scenario: str, vu: Optional[VirtualUser]) -> None:
+        await asyncio.sleep(args.ramp * i / max(len(assigned), 1))
+        while vu is not None and time.monotonic() < deadline:
+            await SCENARIOS[scenario](vu)
+            if time.monotonic() >= recorder.measure_from:
+                iterations[scenario] += 1
+            if args.think_ms:
+                await asyncio.sleep(vu.rng.uniform(0, 2 * args.think_ms) / 1000)
+
+    limits = httpx.Limits(
+        max_connections=args.users, max_keepalive_connections=args.users
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, transport=transport, timeout=args.timeout, limits=limits
+    ) as client:
+        vus = await asyncio.gather(*(sign_in(i, s) for i, s in enumerate(assigned)))
+        signed_in = recorder.latencies.pop(SIGN_IN, [])
+        recorder.statuses.pop(SIGN_IN, None)
+        recorder.errors.pop(SIGN_IN, None)
+        started = time.monotonic()
+        recorder.measure_from = started + args.warmup
+        deadline = recorder.measure_from + args.duration
+        await asyncio.gather(
+            *(loop(i, s, vu) for i, (s, vu) in enumerate(zip(assigned, vus)))
+        )
+    elapsed = max(time.monotonic() - recorder.measure_from, 1e-9)
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "mix": args.mix,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_ms": args.think_ms,
+        },
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "elapsed_s": round(elapsed, 2),
+        "iterations": dict(iterations),
+        "failed_sign_ins": sum(
+            1 for s, vu in zip(assigned, vus) if s in SIGNED_IN and vu is None
+        ),
+        "sign_in_p50_ms": (
+            round(_percentile(sorted(signed_in), 0.5), 2) if signed_in else None
+        ),
+        **recorder.summary(elapsed),
+    }
+
+
+def to_markdown(report: dict) -> str:
+    lines = [
+        f"**{report['requests']} requests, {report['rps']} req/s, "
+        f"error rate {report['error_rate']:.2%}** "
+        f"({report['config']['users']} users, {report['elapsed_s']} s)",
+        "",
+        "| route | req/s | p50 ms | p95 ms | p99 ms | max ms | errors |",
+        "|---|---:|---:|---:|---:|---:|---:|",
+    ]
+    for label, r in report["routes"].items():
+        lines.append(
+            f"| `{label}` | {r['rps']} | {r['p50_ms']} | {r['p95_ms']} | "
+            f"{r['p99_ms']} | {r['max_ms']} | {r['error_rate']:.2%} |"
+        )
+    return "\n".join(lines)
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return f"{after}"
+    return f"{before} → {after} ({(after - before) / before:+.0%})"
+
+
+def compare(baseline: dict, current: dict) -> str:
+    """Markdown table of per-route throughput and percentile changes."""
+    lines = [
+        f"**req/s {_delta(baseline['rps'], current['rps'])}, "
+        f"error rate {baseline['error_rate']:.2%} → {current['error_rate']:.2%}**",
+        "",
+        "| route | req/s | p50 ms | p95 ms | p99 ms |",
+        "|---|---|---|---|---|",
+    ]
+    for label in sorted(set(baseline["routes"]) | set(current["routes"])):
+        old, new = baseline["routes"].get(label), current["routes"].get(label)
+        if old is None or new is None:
+            lines.append(f"| `{label}` | {'new' if old is None else 'gone'} | | | |")
+            continue
+        cells = [_delta(old[k], new[k]) for k in ("rps", "p50_ms", "p95_ms", "p99_ms")]
+        lines.append(f"| `{label}` | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _baseline_path(name: str) -> Path:
+    return RESULTS_DIR / f"{name}.json"
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="virtual users")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("browser=6,liker=2,author=1,typist=1"),
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="not measured")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds to start all")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--email", default="user{n}@example.com")
+    parser.add_argument("--accounts", default="1-1000", help="range for {n}")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", help="use this saved JSON instead of running")
+    parser.add_argument("--json", help="write the results here")
+    parser.add_argument("--markdown", help="write the Markdown table here")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="baseline to diff against")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.report:
+        report = json.loads(Path(args.report).read_text())
+    else:
+        report = asyncio.run(run(args))
+    markdown = to_markdown(report)
+    print(markdown)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.markdown:
+        Path(args.markdown).write_text(markdown + "\n")
+    if args.save_baseline:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        _baseline_path(args.save_baseline).write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(_baseline_path(args.compare).read_text())
+        print(f"\nCompared with baseline {args.compare!r}:\n")
+        print(compare(baseline, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Reclaim media files that nothing references any more.
+
+    python -m app.cli.media_gc --dry-run
+    python -m app.cli.media_gc --grace-hours 24 --batch-size 500 --legacy
+
+Meant to run periodically (cron / scheduled job) next to the API. Blobs
+(media/blobs/) are collected when no recipe image or profile photo points at
+them and they were last uploaded more than --grace-hours ago. --legacy also
+sweeps the old per-upload folders (recipe_photos/, profile_photos/).
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import timedelta
+
+from app.db.session import async_session_maker, engine
+from app.services.blobs import collect_blobs, collect_legacy
+
+
+async def run(args: argparse.Namespace) -> dict:
+    grace = timedelta(hours=args.grace_hours)
+    report = {"dry_run": args.dry_run}
+    try:
+        async with async_session_maker() as session:
+            report["blobs"] = await collect_blobs(
+                session,
+                grace,
+                batch_size=args.batch_size,
+                dry_run=args.dry_run,
+                pause=args.pause,
+            )
+            if args.legacy:
+                report["legacy"] = await collect_legacy(
+                    session, grace, dry_run=args.dry_run
+                )
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="report only")
+    parser.add_argument("--grace-hours", type=float, default=24.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="seconds to sleep between batches"
+    )
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
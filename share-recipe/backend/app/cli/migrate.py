@@ -0,0 +1,144 @@
+"""
+Bring the database to the latest schema, fast when there is nothing to do.
+
+    python -m app.cli.migrate
+    python -m app.cli.migrate --check        # exit 1 if migrations are pending
+    python -m app.cli.migrate --lock-timeout 600
+
+Replaces `alembic upgrade head` in the container entrypoint. Head revisions
+are read statically from alembic/versions and compared with alembic_version;
+when they match it exits without loading Alembic or alembic/env.py. Otherwise,
+on PostgreSQL, it takes an advisory lock so only one node migrates while the
+others wait, re-checks, and runs the upgrade on the same connection.
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, inspect, pool, text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations import (
+    BACKEND_DIR,
+    MIGRATION_LOCK_ID,
+    database_url,
+    script_heads,
+)
+
+
+class MigrationLockTimeout(RuntimeError):
+    pass
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(BACKEND_DIR / "alembic.ini"))
+
+
+def head_revisions() -> set[str]:
+    heads = script_heads()
+    if heads is None:
+        from alembic.script import ScriptDirectory
+
+        heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    return heads
+
+
+def current_revisions(conn: Connection) -> set[str]:
+    if not inspect(conn).has_table("alembic_version"):
+        current = set()
+    else:
+        rows = conn.execute(text("SELECT version_num FROM alembic_version"))
+        current = {row[0] for row in rows}
+    conn.commit()
+    return current
+
+
+@contextmanager
+def migration_lock(conn: Connection, timeout: float, poll: float = 0.5):
+    """Session-level advisory lock on PostgreSQL; a no-op elsewhere."""
+    if conn.dialect.name != "postgresql":
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    lock = text("SELECT pg_try_advisory_lock(:id)").bindparams(id=MIGRATION_LOCK_ID)
+    while not conn.execute(lock).scalar():
+        conn.commit()
+        if time.monotonic() >= deadline:
+            raise MigrationLockTimeout(
+                f"another node held the migration lock for {timeout:.0f}s"
+            )
+        time.sleep(poll)
+    conn.commit()
+    try:
+        yield
+    finally:
+        conn.rollback()
+        conn.execute(
+            text("SELECT pg_advisory_unlock(:id)").bindparams(id=MIGRATION_LOCK_ID)
+        )
+        conn.commit()
+
+
+def upgrade(conn: Connection) -> None:
+    from alembic import command
+
+    config = _alembic_config()
+    config.attributes["connection"] = conn
+    command.upgrade(config, "head")
+    conn.commit()
+
+
+def run(args: argparse.Namespace) -> dict:
+    started = time.perf_counter()
+    heads = head_revisions()
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    try:
+        with engine.connect() as conn:
+            current = current_revisions(conn)
+            report = {"from": sorted(current), "to": sorted(heads)}
+            if current == heads:
+                report["status"] = "current"
+            elif args.check:
+                report["status"] = "pending"
+            else:
+                with migration_lock(conn, args.lock_timeout):
+                    # Another node may have finished while we waited
+                    if current_revisions(conn) == heads:
+                        report["status"] = "current"
+                    else:
+                        upgrade(conn)
+                        report["status"] = "upgraded"
+    finally:
+        engine.dispose()
+    report["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--check", action="store_true", help="report only; exit 1 if behind"
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=300.0,
+        help="seconds to wait for another node's migration",
+    )
+    args = parser.parse_args()
+    try:
+        report = run(args)
+    except MigrationLockTimeout as exc:
+        sys.exit(f"migrate: {exc}")
+    print(json.dumps(report))
+    if report["status"] == "pending":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
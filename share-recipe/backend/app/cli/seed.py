@@ -0,0 +1,410 @@
+"""
+Fill a database with a synthetic, production-shaped dataset.
+
+    python -m app.cli.seed --sqlite /tmp/load.db --scale 10k
+    python -m app.cli.seed --scale 1m          # DATABASE_URL, e.g. a local Postgres
+    python -m app.cli.seed --scale 10m --database-url postgresql://localhost/load
+
+--scale is the number of recipes (10k, 1m, 10m); users, ingredients, likes,
+saves and comments follow from it and can be overridden one by one.
+Popularity is skewed the way real traffic is: a few authors write most
+recipes, a few recipes get most likes, saves and comments, and ingredient use
+has a long tail. Rows are appended after the current max ids, written with
+COPY on PostgreSQL and multi-row INSERTs elsewhere, then the users' profile
+counters are recomputed and the tables ANALYZEd.
+
+Every seeded user can log in as user<id>@example.com with --password.
+Use --create-schema for a throwaway database (tables from the models); a real
+one should be migrated first (python -m app.cli.migrate).
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, create_engine, func, pool, select, text
+from sqlalchemy.engine import Connection
+
+from app.db.base import Base
+from app.db.database import User
+from app.db.ingredients import Ingredient
+from app.db.migrations import database_url, sync_database_url
+from app.db.recipe_ingredients import RecipeIngredient
+from app.db.recipes import Recipe
+from app.db.social import Comment, RecipeLike, SavedRecipe
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+CHUNK_ROWS = 10_000
+POPULARITY_ALPHA = 1.5
+
+MODIFIERS = (
+    "smoked fresh dried roasted ground sweet spicy wild red green black white "
+    "golden baby pickled toasted brown young aged crushed"
+).split()
+FOODS = (
+    "paprika garlic onion tomato basil lentils chickpeas rice noodles butter "
+    "cheese chicken beef pork tofu mushroom pepper spinach kale potato carrot "
+    "lemon lime ginger chili cumin coriander thyme rosemary oregano honey "
+    "yogurt cream beans corn eggplant zucchini salmon shrimp almonds walnuts"
+).split()
+DISHES = (
+    "soup stew salad curry pasta bowl tacos pie bake stir-fry risotto "
+    "sandwich skewers flatbread casserole dumplings"
+).split()
+WORDS = (
+    "chop stir simmer gently season taste roast until golden fold whisk serve "
+    "warm rest drain toss combine garnish slice bake cover reduce heat"
+).split()
+
+
+class Skew:
+    """
+    Power-law picks from range(n): rank r = n * u**skew (u uniform), so low
+    ranks are drawn far more often. A fixed stride permutation then scatters
+    the popular ranks over the id space, so popularity does not follow age.
+    """
+
+    def __init__(self, n: int, skew: float, rng: random.Random) -> None:
+        self.n, self.skew, self.rng = n, skew, rng
+        stride = max(2, int(n * 0.618))
+        while math.gcd(stride, n) != 1:
+            stride += 1
+        self.stride = stride if n > 1 else 1
+
+    def pick(self) -> int:
+        rank = min(self.n - 1, int(self.n * self.rng.random() ** self.skew))
+        return rank * self.stride % self.n
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy(conn: Connection, table: Table, columns: list[str], rows: list) -> None:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(
+            "" if v is None else v.isoformat() if isinstance(v, datetime) else v
+            for v in (row[c] for c in columns)
+        )
+    buf.seek(0)
+    cursor = conn.connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+    )
+
+
+def write(conn: Connection, table: Table, rows: Iterable[dict]) -> int:
+    """Bulk-load `rows` (dicts; keys missing from the table are ignored)."""
+    copy = conn.dialect.name == "postgresql"
+    written = 0
+    started = time.perf_counter()
+    conn.commit()
+    for chunk in _chunks(rows, CHUNK_ROWS):
+        columns = [c for c in chunk[0] if c in table.c]
+        # One transaction per chunk (COPY goes around SQLAlchemy, so begin
+        # explicitly for the commit to reach the driver)
+        with conn.begin():
+            if copy:
+                _copy(conn, table, columns, chunk)
+            else:
+                conn.execute(
+                    table.insert(), [{c: row[c] for c in columns} for row in chunk]
+                )
+        written += len(chunk)
+        rate = written / max(time.perf_counter() - started, 1e-9)
+        print(f"{table.name}: {written} rows ({rate:,.0f}/s)", file=sys.stderr)
+    return written
+
+
+def _next_id(conn: Connection, table: Table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+class Generator:
+    def __init__(self, args: argparse.Namespace, ids: dict[str, int]) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.ids = ids
+        self.now = datetime.now(timezone.utc)
+        self.start = self.now - timedelta(days=args.days)
+        self.authors = Skew(args.users, args.skew, self.rng)
+        self.fans = Skew(args.users, 1.5, self.rng)
+        self.ingredients = Skew(args.ingredients, args.skew, self.rng)
+        # One popularity per recipe, shared by likes, saves and comments:
+        # Pareto distributed (a heavy tail of viral recipes), scaled to mean 1
+        scale = (POPULARITY_ALPHA - 1) / POPULARITY_ALPHA
+        self.popularity = array(
+            "f",
+            (
+                scale * self.rng.paretovariate(POPULARITY_ALPHA)
+                for _ in range(args.recipes)
+            ),
+        )
+
+    def _at(self, i: int, n: int) -> datetime:
+        # Spread over --days, in id order, with some jitter
+        span = (self.now - self.start).total_seconds()
+        offset = span * (i + self.rng.random()) / max(n, 1)
+        return self.start + timedelta(seconds=min(offset, span))
+
+    def users(self, password_hash: str) -> Iterator[dict]:
+        first = self.ids["users"]
+        for i in range(self.args.users):
+            uid = first + i
+            yield {
+                "id": uid,
+                "email": f"user{uid}@example.com",
+                "username": f"user{uid}",
+                "hashed_password": password_hash,
+                "is_active": True,
+                "first_name": self.rng.choice(FOODS).capitalize(),
+                "last_name": self.rng.choice(MODIFIERS).capitalize(),
+                "joined": self._at(i, self.args.users) - timedelta(days=30),
+                "bio": _text(self.rng, 12) if self.rng.random() < 0.3 else None,
+                "recipes_count": 0,
+                "likes_received": 0,
+            }
+
+    def ingredient_rows(self) -> Iterator[dict]:
+        first = self.ids["ingredients"]
+        combos = [f"{m} {f}" for f in FOODS for m in [""] + MODIFIERS]
+        for i in range(self.args.ingredients):
+            name = combos[i].strip() if i < len(combos) else ""
+            # Names past the word list, or on a second run, carry the id
+            if not name or first > 1:
+                name = f"{name or self.rng.choice(FOODS)} {first + i}"
+            yield {
+                "id": first + i,
+                "name": name.capitalize(),
+                "name_norm": name.lower(),
+                "created_at": self.start,
+            }
+
+    def recipes(self) -> Iterator[dict]:
+        first = self.ids["recipes"]
+        for i in range(self.args.recipes):
+            title = (
+                f"{self.rng.choice(MODIFIERS)} {self.rng.choice(FOODS)} "
+                f"{self.rng.choice(DISHES)}"
+            )
+            yield {
+                "id": first + i,
+                "title": title.capitalize(),
+                "description": _text(self.rng, self.rng.randint(8, 30)),
+                "instructions": _text(self.rng, self.rng.randint(40, 250)),
+                "is_published": self.rng.random() < 0.95,
+                "created_at": self._at(i, self.args.recipes),
+                "user_id": self.ids["users"] + self.authors.pick(),
+            }
+
+    def recipe_ingredients(self) -> Iterator[dict]:
+        cap = min(15, self.args.ingredients)
+        for i in range(self.args.recipes):
+            want = min(cap, self.rng.randint(3, 12))
+            picked: set[int] = set()
+            while len(picked) < want:
+                picked.add(self.ids["ingredients"] + self.ingredients.pick())
+            for ingredient_id in picked:
+                yield {
+                    "recipe_id": self.ids["recipes"] + i,
+                    "ingredient_id": ingredient_id,
+                }
+
+    def _fans(self, mean: float) -> Iterator[tuple[int, int, datetime]]:
+        for i in range(self.args.recipes):
+            k = min(self.args.users, int(mean * self.popularity[i]))
+            created = self._at(i, self.args.recipes)
+            for user in self.rng.sample(range(self.args.users), k):
+                at = created + (self.now - created) * self.rng.random()
+                yield self.ids["recipes"] + i, self.ids["users"] + user, at
+
+    def likes(self) -> Iterator[dict]:
+        for recipe_id, user_id, at in self._fans(self.args.likes):
+            yield {
+                "recipe_id": recipe_id,
+                "user_id": user_id,
+                "created_at": at,
+            }
+
+    def saves(self) -> Iterator[dict]:
+        for recipe_id, user_id, at in self._fans(self.args.saves):
+            yield {
+                "recipe_id": recipe_id,
+                "user_id": user_id,
+                "created_at": at,
+            }
+
+    def comments(self) -> Iterator[dict]:
+        next_id = self.ids["comments"]
+        thread: list[int] = []
+        last_recipe = None
+        for recipe_id, _, at in self._fans(self.args.comments):
+            if recipe_id != last_recipe:
+                thread, last_recipe = [], recipe_id
+            reply = thread and self.rng.random() < self.args.reply_ratio
+            yield {
+                "id": next_id,
+                "recipe_id": recipe_id,
+                # Anyone may comment, with the most active users most often
+                "user_id": self.ids["users"] + self.fans.pick(),
+                "parent_id": self.rng.choice(thread) if reply else None,
+                "content": _text(self.rng, self.rng.randint(4, 40)),
+                "created_at": at,
+            }
+            thread.append(next_id)
+            next_id += 1
+
+
+def _update_profile_stats(conn: Connection, first: int, last: int) -> None:
+    stats = text("""
+        UPDATE users SET
+            recipes_count = (
+                SELECT count(*) FROM recipes
+                WHERE recipes.user_id = users.id AND recipes.is_published
+            ),
+            likes_received = (
+                SELECT count(*) FROM recipe_likes
+                JOIN recipes ON recipes.id = recipe_likes.recipe_id
+                WHERE recipes.user_id = users.id
+            )
+        WHERE users.id >= :lo AND users.id < :hi
+        """)
+    for lo in range(first, last, 10_000):
+        conn.execute(stats, {"lo": lo, "hi": min(lo + 10_000, last)})
+        conn.commit()
+
+
+def _reset_sequences(conn: Connection, tables: list[Table]) -> None:
+    # Ids were assigned here, so move the serial sequences past them
+    for table in tables:
+        if "id" in table.c and table.c.id.autoincrement:
+            conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                    f"(SELECT max(id) FROM {table.name}))"
+                )
+            )
+    conn.commit()
+
+
+def _password_hash(password: str) -> str:
+    from passlib.context import CryptContext
+
+    # Low cost on purpose: load tests log in a lot, and these are not real users
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(password)
+
+
+def run(args: argparse.Namespace) -> dict:
+    started = time.perf_counter()
+    url = args.database_url or (
+        f"sqlite:///{args.sqlite}" if args.sqlite else database_url()
+    )
+    engine = create_engine(sync_database_url(url), poolclass=pool.NullPool)
+    tables = [
+        User.__table__,
+        Ingredient.__table__,
+        Recipe.__table__,
+        RecipeIngredient.__table__,
+        RecipeLike.__table__,
+        SavedRecipe.__table__,
+        Comment.__table__,
+    ]
+    report: dict = {"database": engine.url.render_as_string(hide_password=True)}
+    try:
+        with engine.connect() as conn:
+            if args.create_schema or args.sqlite:
+                Base.metadata.create_all(conn, tables=tables)
+                conn.commit()
+            ids = {t.name: _next_id(conn, t) for t in tables if "id" in t.c}
+            gen = Generator(args, ids)
+            rows = report["rows"] = {}
+            rows["users"] = write(
+                conn, User.__table__, gen.users(_password_hash(args.password))
+            )
+            rows["ingredients"] = write(
+                conn, Ingredient.__table__, gen.ingredient_rows()
+            )
+            rows["recipes"] = write(conn, Recipe.__table__, gen.recipes())
+            rows["recipe_ingredients"] = write(
+                conn, RecipeIngredient.__table__, gen.recipe_ingredients()
+            )
+            rows["recipe_likes"] = write(conn, RecipeLike.__table__, gen.likes())
+            rows["saved_recipes"] = write(conn, SavedRecipe.__table__, gen.saves())
+            rows["comments"] = write(conn, Comment.__table__, gen.comments())
+
+            _update_profile_stats(conn, ids["users"], ids["users"] + args.users)
+            if conn.dialect.name == "postgresql":
+                _reset_sequences(conn, tables)
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+    finally:
+        engine.dispose()
+    report["seconds"] = round(time.perf_counter() - started, 1)
+    return report
+
+
+def _count(value: str) -> int:
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    return int(float(value.rstrip("km")) * {"k": 1e3, "m": 1e6}.get(value[-1], 1))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--database-url", help="defaults to DATABASE_URL")
+    target.add_argument("--sqlite", help="SQLite file; the schema is created")
+    parser.add_argument("--create-schema", action="store_true")
+    parser.add_argument(
+        "--scale", type=_count, default=SCALES["10k"], help="recipes: 10k, 1m, 10m"
+    )
+    parser.add_argument("--users", type=_count, help="default: scale / 5")
+    parser.add_argument("--ingredients", type=_count, help="default: up to 50k")
+    parser.add_argument("--likes", type=float, default=10.0, help="per recipe, mean")
+    parser.add_argument("--saves", type=float, default=3.0, help="per recipe, mean")
+    parser.add_argument("--comments", type=float, default=2.0, help="per recipe, mean")
+    parser.add_argument("--reply-ratio", type=float, default=0.3)
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=2.0,
+        help="authors and ingredients; higher = more concentrated",
+    )
+    parser.add_argument("--days", type=int, default=730, help="history to spread over")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    args.recipes = args.scale
+    args.users = args.users or max(10, args.scale // 5)
+    args.ingredients = args.ingredients or min(50_000, max(100, args.scale // 50))
+    return args
+
+
+def main() -> None:
+    print(json.dumps(run(parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Cold-start breakdown of the API process: imports, startup hooks, lazy subsystems.
+
+    python -m app.cli.startup_report
+    python -m app.cli.startup_report --runs 3 --top 25 --json
+
+Imports are measured in fresh interpreters with `python -X importtime -c
+"import app.main"` (the fastest of --runs is reported). Startup and shutdown
+hooks are then run in this process, one at a time, against the configured
+Redis/database, so failures show up per hook. Lazy subsystems (LazyApp mounts
+such as /admin) are built once to show what their first request pays.
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+_LINE_PREFIX = "import time:"
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Rows of `-X importtime` output: module, depth, self_ms, cumulative_ms."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith(_LINE_PREFIX):
+            continue
+        parts = line[len(_LINE_PREFIX) :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        rows.append(
+            {
+                "module": stripped,
+                "depth": (len(name) - len(stripped) - 1) // 2,
+                "self_ms": int(parts[0]) / 1000,
+                "cumulative_ms": int(parts[1]) / 1000,
+            }
+        )
+    return rows
+
+
+def measure_imports(target: str, runs: int) -> tuple[float, list[dict]]:
+    best_total, best_rows = float("inf"), []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise SystemExit(f"import {target} failed:\n{proc.stderr[-2000:]}")
+        rows = parse_importtime(proc.stderr)
+        total = next(
+            (r["cumulative_ms"] for r in rows if r["module"] == target), float("inf")
+        )
+        if total < best_total:
+            best_total, best_rows = total, rows
+    return best_total, best_rows
+
+
+def summarize_imports(rows: list[dict], top: int) -> dict:
+    by_package: dict[str, float] = defaultdict(float)
+    for r in rows:
+        by_package[r["module"].split(".")[0]] += r["self_ms"]
+    # Cumulative time of each module the first time it appears (later
+    # appearances are already cached and cost nothing)
+    slowest = sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)
+    return {
+        "packages": sorted(
+            ({"package": k, "self_ms": round(v, 1)} for k, v in by_package.items()),
+            key=lambda r: r["self_ms"],
+            reverse=True,
+        )[:top],
+        "modules": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1)}
+            for r in slowest[:top]
+        ],
+    }
+
+
+async def _time(fn, timeout: float) -> dict:
+    started = time.perf_counter()
+    try:
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await asyncio.wait_for(result, timeout)
+        status = "ok"
+    except Exception as exc:
+        status = f"error: {type(exc).__name__}: {exc}"[:200]
+    return {"ms": round((time.perf_counter() - started) * 1000, 1), "status": status}
+
+
+async def measure_hooks(timeout: float, lazy: bool) -> dict:
+    from app.core.lazy import LazyApp
+    from app.main import app
+
+    report: dict = {"startup": [], "shutdown": [], "lazy": []}
+    for hook in app.router.on_startup:
+        report["startup"].append({"name": hook.__name__, **await _time(hook, timeout)})
+    if lazy:
+        for route in app.routes:
+            target = getattr(route, "app", None)
+            if isinstance(target, LazyApp):
+                report["lazy"].append(
+                    {"name": route.path, **await _time(target.load, timeout)}
+                )
+    for hook in app.router.on_shutdown:
+        report["shutdown"].append({"name": hook.__name__, **await _time(hook, timeout)})
+    return report
+
+
+def _print_table(title: str, header: tuple[str, str], rows: list[tuple]) -> None:
+    print(f"\n{title}")
+    print(f"  {header[0]:<56} {header[1]:>10}")
+    for name, value, *rest in rows:
+        note = f"  {rest[0]}" if rest and rest[0] != "ok" else ""
+        print(f"  {name:<56} {value:>10.1f}{note}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", default="app.main", help="module to import")
+    parser.add_argument("--runs", type=int, default=1, help="cold imports to try")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10.0, help="per hook (s)")
+    parser.add_argument("--no-hooks", action="store_true", help="imports only")
+    parser.add_argument("--no-lazy", action="store_true", help="skip LazyApp builds")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    total, rows = measure_imports(args.target, args.runs)
+    report = {"import_total_ms": round(total, 1), **summarize_imports(rows, args.top)}
+    if not args.no_hooks:
+        report["hooks"] = asyncio.run(measure_hooks(args.timeout, not args.no_lazy))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"import {args.target}: {report['import_total_ms']:.1f} ms")
+    _print_table(
+        "Import self time by top-level package",
+        ("package", "ms"),
+        [(r["package"], r["self_ms"]) for r in report["packages"]],
+    )
+    _print_table(
+        "Slowest imports (cumulative)",
+        ("module", "ms"),
+        [(r["module"], r["cumulative_ms"]) for r in report["modules"]],
+    )
+    for phase, title in (
+        ("startup", "Startup hooks"),
+        ("lazy", "Lazy subsystems (first use)"),
+        ("shutdown", "Shutdown hooks"),
+    ):
+        hooks = report.get("hooks", {}).get(phase)
+        if hooks:
+            _print_table(
+                title,
+                ("hook", "ms"),
+                [(h["name"], h["ms"], h["status"]) for h in hooks],
+            )
+
+
+if __name__ == "__main__":
+    main()
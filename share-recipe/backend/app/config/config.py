@@ -10,12 +10,99 @@ class Settings(BaseSettings):
     SMTP_USER: str
     SMTP_PASSWORD: str
     EMAIL_FROM: str
+    SMTP_STARTTLS: bool = True
+    # Email outbox: "redis" (shared by all workers) or "memory" (single process)
+    EMAIL_OUTBOX_BACKEND: str = "redis"
+    # Run the background sender in this process
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 20
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 5.0
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str | None = None
+    # Per pool (text and binary clients each get one)
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5.0
     # Google OAuth
     OAUTH_GOOGLE_CLIENT_ID: str
     OAUTH_GOOGLE_CLIENT_SECRET: str
+    # SQLAdmin login and the session cookie secret (defaults to SECRET_KEY)
+    ADMIN_USERNAME: str = "admin"
+    ADMIN_PASSWORD: str = "admin"
+    SESSION_SECRET: str | None = None
+    # Admin's own sync pool, kept small so browsing cannot starve the API's
+    # connections; statements over the timeout are cancelled (PostgreSQL)
+    ADMIN_DB_POOL_SIZE: int = 2
+    ADMIN_DB_MAX_OVERFLOW: int = 1
+    ADMIN_DB_POOL_TIMEOUT_SECONDS: float = 5.0
+    ADMIN_STATEMENT_TIMEOUT_MS: int = 15000
+    # Admin list totals: planner estimates above this many rows, exact below;
+    # counts of search results stop here
+    ADMIN_EXACT_COUNT_MAX: int = 10000
+    # Password hashing: hashes below BCRYPT_ROUNDS are upgraded on next login;
+    # worker threads default to min(4, CPU count)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int | None = None
+    # Logging (LOG_FILE defaults to backend/logs/app.log; LOG_FORMAT text | json)
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str | None = None
+    LOG_FORMAT: str = "text"
+    LOG_QUEUE_SIZE: int = 10000
+    # Logo embedded in emails (defaults to the frontend's public/ or src/assets/)
+    LOGO_FILE: str | None = None
+    # Verified-JWT cache; LEEWAY tolerates clock skew when checking `exp`
+    JWT_CACHE_TTL_SECONDS: int = 300
+    JWT_CACHE_MAX_ENTRIES: int = 10000
+    JWT_LEEWAY_SECONDS: int = 0
+    # Authenticated-user cache (per worker, invalidated across workers via Redis)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Recipes a user may create per UTC day
+    POSTS_DAILY_LIMIT: int = 5
+    # Anonymous public profile pages: Redis cache and Cache-Control max-age (0 = off)
+    PUBLIC_PROFILE_CACHE_SECONDS: int = 60
+    PUBLIC_PROFILE_PAGE_SIZE: int = 20
+    # Shared secret for /api/metrics/ (X-Metrics-Token header); unset = 404
+    METRICS_TOKEN: str | None = None
+    # Access log sampling: errors (status >= ACCESS_LOG_ERROR_STATUS) and requests
+    # slower than ACCESS_LOG_SLOW_MS are always logged; the rest at SAMPLE_RATE (0..1)
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_MS: int = 1000
+    ACCESS_LOG_ERROR_STATUS: int = 400
+    # Identical access lines within this window collapse into one summary (0 = off)
+    ACCESS_LOG_BURST_WINDOW_SECONDS: float = 1.0
+    # Image uploads: size limits and streaming (chunk size, disk-writer threads)
+    RECIPE_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    PROFILE_PHOTO_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    UPLOAD_IO_WORKERS: int = 4
+    # Resized derivatives of uploaded images (process pool; "avif" needs libavif)
+    IMAGE_WORKERS: int = 2
+    IMAGE_VARIANT_WIDTHS: list[int] = [320, 640, 1280]
+    IMAGE_VARIANT_FORMATS: list[str] = ["webp", "jpeg"]
+    IMAGE_VARIANT_QUALITY: int = 80
+    # Response compression (br needs the Brotli package, otherwise gzip only)
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_TYPES: list[str] = [
+        "application/json",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+        "text/",
+    ]
+    # Where media objects live: "local" (share-recipe/media, served at /media)
+    # or "s3" (any S3-compatible store: AWS, MinIO, R2; path-style addressing)
+    MEDIA_STORAGE: str = "local"
+    S3_ENDPOINT_URL: str | None = None
+    S3_BUCKET: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_REGION: str = "us-east-1"
+    # Public base URL of the bucket (CDN); defaults to <endpoint>/<bucket>
+    S3_PUBLIC_URL: str | None = None
 
     class Config:
         env_file = ".env"
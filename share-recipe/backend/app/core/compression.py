@@ -0,0 +1,164 @@
+import time
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+from app.core.static import _accepts
+
+try:  # optional: pip install Brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DEFAULT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _Encoder:
+    """Incremental gzip / brotli compressor with the same two-call interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16+: gzip container
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.cpu = 0.0
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        start = time.thread_time()
+        if self.encoding == "br":
+            out = self._br.process(data)
+            out += self._br.finish() if final else self._br.flush()
+        else:
+            out = self._gz.compress(data)
+            out += self._gz.flush() if final else self._gz.flush(zlib.Z_SYNC_FLUSH)
+        self.cpu += time.thread_time() - start
+        return out
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI response compression:
+    - br (when the Brotli package is installed) or gzip, from Accept-Encoding
+    - Only allowlisted content types at or above `minimum_size` bytes
+    - Skips responses that are already encoded, partial (206), HEAD,
+      `Cache-Control: no-transform` and paths under `exclude_prefixes` (/media
+      serves its own precompressed files)
+    - Streaming bodies are compressed chunk by chunk
+    - Metrics: compression.<enc>.responses, compression.bytes_in / bytes_out
+      and compression.<enc> CPU time
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = DEFAULT_TYPES,
+        exclude_prefixes: Iterable[str] = ("/media",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    def _encoding(self, scope: Scope) -> Optional[str]:
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        if brotli is not None and _accepts(accept, "br"):
+            return "br"
+        if _accepts(accept, "gzip"):
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or scope["path"].startswith(self.exclude_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+        encoding = self._encoding(scope)
+        start_message: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+        bytes_in = bytes_out = 0
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough, bytes_in, bytes_out
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                compressible = content_type.startswith(self.content_types)
+                if compressible:
+                    MutableHeaders(raw=message["headers"]).add_vary_header(
+                        "Accept-Encoding"
+                    )
+                passthrough = (
+                    encoding is None
+                    or not compressible
+                    or message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or "no-transform" in headers.get("cache-control", "")
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Small enough that compression is not worth the CPU
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["content-encoding"] = encoding
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # Different bytes than the identity representation
+                    headers["etag"] = f"W/{etag}"
+                if more_body:
+                    del headers["content-length"]
+                compressed = encoder.compress(body, final=not more_body)
+                if not more_body:
+                    headers["content-length"] = str(len(compressed))
+                await send(start_message)
+            else:
+                compressed = encoder.compress(body, final=not more_body)
+            bytes_in += len(body)
+            bytes_out += len(compressed)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+            if not more_body:
+                metrics.incr(f"compression.{encoding}.responses")
+                metrics.incr("compression.bytes_in", bytes_in)
+                metrics.incr("compression.bytes_out", bytes_out)
+                metrics.observe(f"compression.{encoding}", encoder.cpu * 1000)
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,42 @@
+import importlib
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+
+class LazyApp:
+    """
+    ASGI app built on first use from a "module:factory" path, so rarely used
+    subsystems (e.g. the SQLAdmin UI) cost nothing at import or startup.
+    - Mount it like the real app: app.mount("/admin", LazyApp(...), name="admin")
+    - `routes` is forwarded, so url_for("admin:...") works once it is loaded
+    - Build time is recorded as the lazy.<name> timing metric
+    """
+
+    def __init__(self, factory: str, name: Optional[str] = None) -> None:
+        self.factory = factory
+        self.name = name or factory.rsplit(":", 1)[-1]
+        self._app: Optional[ASGIApp] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._app is not None
+
+    def load(self) -> ASGIApp:
+        # No awaits in between: concurrent first requests cannot build it twice
+        if self._app is None:
+            started = time.perf_counter()
+            module_name, _, attr = self.factory.partition(":")
+            self._app = getattr(importlib.import_module(module_name), attr)()
+            metrics.observe(f"lazy.{self.name}", (time.perf_counter() - started) * 1000)
+        return self._app
+
+    @property
+    def routes(self) -> list:
+        return getattr(self.load(), "routes", [])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.load()(scope, receive, send)
@@ -1,10 +1,16 @@
+import atexit
+import json
 import logging
 import logging.config
-from logging.handlers import RotatingFileHandler
-import os
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import random
+import threading
 import time
 import uuid
 import contextvars
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -12,8 +18,18 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app.config.config import settings
+
 # Context variable for per-request correlation
-_request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+_request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "request_id", default="-"
+)
+
+# Structured fields the middleware passes via `extra=` (rendered by JsonFormatter)
+STRUCTURED_FIELDS = ("route", "method", "status", "latency_ms", "client", "suppressed")
+
+# Background listener that owns the real (blocking) handlers
+_listener: Optional[QueueListener] = None
 
 
 def get_request_id() -> str:
@@ -27,11 +43,95 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; request/route/latency/status become fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller:
+    - Records are enqueued with put_nowait; when the queue is full they are dropped
+    - Dropped records are counted and reported once space frees up
+    - Formatting is left to the listener thread (only %-args are merged here)
+    """
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+        self._pending_drops = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now so mutable arguments cannot change before the listener runs,
+        # but leave the (expensive) formatter work to the background thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._pending_drops += 1
+            return
+        if self._pending_drops:
+            self._report_drops()
+
+    def _report_drops(self) -> None:
+        with self._lock:
+            count, self._pending_drops = self._pending_drops, 0
+        if not count:
+            return
+        notice = logging.LogRecord(
+            name=__name__,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg="Log queue full: dropped %d records",
+            args=(count,),
+            exc_info=None,
+        )
+        notice.request_id = "-"
+        try:
+            self.queue.put_nowait(self.prepare(notice))
+        except queue.Full:
+            with self._lock:
+                self._pending_drops += count
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging(level: Optional[str] = None) -> None:
     """
     Configure logging:
-    - Console + rotating file handler
-    - Request ID filter added to all handlers
+    - Console + rotating file handler, driven by a background QueueListener
+    - Callers only enqueue records (bounded queue, drops instead of blocking)
+    - LOG_FORMAT=json switches to structured JSON lines
+    - Request ID filter runs on the enqueueing side
     - Integrates uvicorn loggers
     """
     # Resolve logs directory: <repo>/share-recipe-frontend/backend/logs
@@ -39,89 +139,246 @@ def setup_logging(level: Optional[str] = None) -> None:
     logs_dir = base_dir / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
 
-    log_level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
-    log_file = os.getenv("LOG_FILE", str(logs_dir / "app.log"))
+    log_level = (level or settings.LOG_LEVEL).upper()
+    log_file = settings.LOG_FILE or str(logs_dir / "app.log")
+    log_format = settings.LOG_FORMAT.lower()
+    queue_size = settings.LOG_QUEUE_SIZE
+
+    if log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s"
+        )
+
+    console = logging.StreamHandler()
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5,
+        encoding="utf-8",
+    )
+    for handler in (console, file_handler):
+        handler.setLevel(log_level)
+        handler.setFormatter(formatter)
+
+    # Replace a previous listener (setup_logging may be called more than once)
+    shutdown_logging()
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    global _listener
+    _listener = QueueListener(
+        log_queue, console, file_handler, respect_handler_level=True
+    )
+    _listener.start()
 
     config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "filters": {
-            "request_id": {"()": RequestIdFilter},
-        },
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s",
-            },
-            "uvicorn_access": {
-                "format": '%(asctime)s %(levelname)s [uvicorn.access] [%(request_id)s] %(message)s',
-            },
-        },
         "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
+            "queue": {"()": lambda: queue_handler, "level": log_level},
+        },
+        "loggers": {
+            "uvicorn": {"handlers": ["queue"], "level": log_level, "propagate": False},
+            "uvicorn.error": {
+                "handlers": ["queue"],
                 "level": log_level,
-                "formatter": "default",
-                "filters": ["request_id"],
+                "propagate": False,
             },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
+            "uvicorn.access": {
+                "handlers": ["queue"],
                 "level": log_level,
-                "formatter": "default",
-                "filters": ["request_id"],
-                "filename": log_file,
-                "maxBytes": 10 * 1024 * 1024,  # 10MB
-                "backupCount": 5,
-                "encoding": "utf-8",
+                "propagate": False,
             },
-        },
-        "loggers": {
-            "uvicorn": {"handlers": ["console", "file"], "level": log_level, "propagate": False},
-            "uvicorn.error": {"handlers": ["console", "file"], "level": log_level, "propagate": False},
-            "uvicorn.access": {"handlers": ["console", "file"], "level": log_level, "propagate": False},
             # App-specific loggers can be added here; root covers most cases
         },
-        "root": {"handlers": ["console", "file"], "level": log_level},
+        "root": {"handlers": ["queue"], "level": log_level},
     }
 
     logging.config.dictConfig(config)
     logging.getLogger(__name__).info("Logging configured", extra={})
 
 
+atexit.register(shutdown_logging)
+
+
+class BurstLimiter:
+    """
+    Collapses bursts of identical lines:
+    - The first line for a key is let through and opens a window
+    - Repeats inside the window are suppressed and counted
+    - The first line after the window closes carries the suppressed count
+    - Counts nobody carried (no line since, or key evicted) come from flush()
+    """
+
+    def __init__(self, window_seconds: float, max_keys: int = 1024) -> None:
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._state: "OrderedDict[tuple, list]" = OrderedDict()
+        self._evicted: list[tuple[tuple, int]] = []
+        self._lock = threading.Lock()
+
+    def allow(self, key: tuple) -> tuple[bool, int]:
+        """Return (emit, suppressed_since_last_emit) for a line with this key."""
+        if self.window <= 0:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            entry = self._state.get(key)
+            if entry is not None and now - entry[0] < self.window:
+                entry[1] += 1
+                return False, 0
+            suppressed = entry[1] if entry is not None else 0
+            self._state[key] = [now, 0]
+            self._state.move_to_end(key)
+            while len(self._state) > self.max_keys:
+                evicted, (_, count) = self._state.popitem(last=False)
+                if count:
+                    self._evicted.append((evicted, count))
+            return True, suppressed
+
+    def flush(self) -> list[tuple[tuple, int]]:
+        """
+        Return (key, suppressed) for counts no line will carry: windows that
+        closed with no repeat since, and keys evicted over max_keys. Each
+        count is returned once.
+        """
+        if self.window <= 0:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            flushed, self._evicted = self._evicted, []
+            # Oldest window first: entries move to the end when they reopen
+            while self._state:
+                key, (opened, count) = next(iter(self._state.items()))
+                if now - opened < self.window:
+                    break
+                del self._state[key]
+                if count:
+                    flushed.append((key, count))
+            return flushed
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     - Assigns request_id for each request
     - Adds X-Request-ID response header
     - Logs request start and completion with latency
+    - Errors and slow requests are always logged; fast successful ones are sampled
+    - Bursts of identical routine lines collapse into one line with a
+      suppressed count; error statuses and slow requests are never collapsed
     """
 
+    def __init__(
+        self,
+        app,
+        sample_rate: float = 1.0,
+        slow_ms: int = 1000,
+        error_status: int = 400,
+        burst_window: float = 0.0,
+    ) -> None:
+        super().__init__(app)
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.error_status = error_status
+        self.burst = BurstLimiter(burst_window)
+
     def _new_request_id(self) -> str:
         return uuid.uuid4().hex
 
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _log(
+        self,
+        logger: logging.Logger,
+        level: int,
+        key: tuple,
+        msg: str,
+        *args,
+        extra: dict,
+        collapse: bool = True,
+    ) -> None:
+        for flushed, count in self.burst.flush():
+            logger.info(
+                "%d similar lines suppressed: %s",
+                count,
+                " ".join(str(part) for part in flushed),
+                extra={"suppressed": count},
+            )
+        # Errors (WARNING and above) are never collapsed
+        if collapse and level < logging.WARNING:
+            emit, suppressed = self.burst.allow(key)
+            if not emit:
+                return
+            if suppressed:
+                msg += f" (+{suppressed} similar suppressed)"
+                extra["suppressed"] = suppressed
+        logger.log(level, msg, *args, extra=extra)
+
     async def dispatch(self, request: Request, call_next) -> Response:
         token = _request_id_var.set(self._new_request_id())
         logger = logging.getLogger("app.request")
         start = time.monotonic()
+        route = request.url.path
+        sampled = self._sampled()
         try:
-            logger.info(
-                "Incoming request %s %s from %s",
-                request.method,
-                request.url.path,
-                request.client.host if request.client else "-",
-            )
+            if sampled and logger.isEnabledFor(logging.INFO):
+                client = request.client.host if request.client else "-"
+                self._log(
+                    logger,
+                    logging.INFO,
+                    ("in", request.method, route, client),
+                    "Incoming request %s %s from %s",
+                    request.method,
+                    route,
+                    client,
+                    extra={
+                        "method": request.method,
+                        "route": route,
+                        "client": request.client.host if request.client else None,
+                    },
+                )
             response = await call_next(request)
             elapsed_ms = int((time.monotonic() - start) * 1000)
             # Attach request id to response
             response.headers["X-Request-ID"] = get_request_id()
-            logger.info(
-                "Completed %s %s -> %s in %dms",
-                request.method,
-                request.url.path,
-                response.status_code,
-                elapsed_ms,
-            )
+            status = response.status_code
+            notable = status >= self.error_status or elapsed_ms >= self.slow_ms
+            if sampled or notable:
+                self._log(
+                    logger,
+                    logging.WARNING if status >= 500 else logging.INFO,
+                    ("done", request.method, route, status),
+                    "Completed %s %s -> %s in %dms",
+                    request.method,
+                    route,
+                    status,
+                    elapsed_ms,
+                    extra={
+                        "method": request.method,
+                        "route": route,
+                        "status": status,
+                        "latency_ms": elapsed_ms,
+                    },
+                    # Error statuses and slow requests are each worth a line
+                    collapse=not notable,
+                )
             return response
         except Exception:
-            logger.exception("Unhandled error in request %s %s", request.method, request.url.path)
+            logger.exception(
+                "Unhandled error in request %s %s",
+                request.method,
+                route,
+                extra={
+                    "method": request.method,
+                    "route": route,
+                    "status": 500,
+                    "latency_ms": int((time.monotonic() - start) * 1000),
+                },
+            )
             raise
         finally:
             _request_id_var.reset(token)
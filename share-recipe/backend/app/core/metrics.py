@@ -0,0 +1,59 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry:
+    - counters: monotonically increasing totals
+    - gauges: last observed value (queue depth, in-flight work)
+    - timings: count / total / max in milliseconds per name
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, list[float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, ms: float) -> None:
+        with self._lock:
+            t = self._timings.get(name)
+            if t is None:
+                self._timings[name] = [1, ms, ms]
+            else:
+                t[0] += 1
+                t[1] += ms
+                t[2] = max(t[2], ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {
+                    name: {
+                        "count": int(count),
+                        "avg_ms": round(total / count, 3) if count else 0.0,
+                        "max_ms": round(max_ms, 3),
+                    }
+                    for name, (count, total, max_ms) in self._timings.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,69 @@
+import time
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.config.config import settings
+from app.core.metrics import metrics
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that records per-command latency in the metrics registry."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            name = str(args[0]).split(" ")[0].upper() if args else "UNKNOWN"
+            metrics.observe(f"redis.{name}", (time.perf_counter() - start) * 1000)
+
+
+# One app-scoped client per response mode. Each owns a bounded pool; callers
+# wait up to REDIS_POOL_TIMEOUT_SECONDS for a free connection instead of
+# opening new ones.
+_clients: dict[bool, InstrumentedRedis] = {}
+
+
+def get_redis_client(decode_responses: bool = True) -> InstrumentedRedis:
+    client = _clients.get(decode_responses)
+    if client is None:
+        pool = redis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=0,
+            decode_responses=decode_responses,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        )
+        client = InstrumentedRedis(connection_pool=pool)
+        _clients[decode_responses] = client
+    return client
+
+
+async def get_redis() -> InstrumentedRedis:
+    """FastAPI dependency: shared client with str responses."""
+    return get_redis_client()
+
+
+def init_redis() -> None:
+    get_redis_client(decode_responses=True)
+    get_redis_client(decode_responses=False)
+
+
+async def close_redis() -> None:
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose(close_connection_pool=True)
+
+
+def redis_pool_stats() -> Optional[dict]:
+    client = _clients.get(True)
+    if client is None:
+        return None
+    pool = client.connection_pool
+    return {
+        "max_connections": pool.max_connections,
+        "in_use": len(getattr(pool, "_in_use_connections", ())),
+    }
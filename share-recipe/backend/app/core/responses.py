@@ -0,0 +1,24 @@
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # model_construct()ed from trusted rows: fields are already plain values
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson. Returned directly from an endpoint it
+    bypasses FastAPI's response_model validation and jsonable_encoder, so the
+    content must already match the declared model (see RecipeResponse rows).
+    Datetimes are written like pydantic does (RFC 3339, "Z" for UTC).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
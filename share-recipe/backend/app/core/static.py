@@ -0,0 +1,146 @@
+import mimetypes
+import os
+import stat
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+ONE_YEAR = 365 * 24 * 3600
+
+# Same image in a smaller format, best first: photo.jpg -> photo.avif / photo.webp
+# (written next to local uploads by app.utils.images.render_variants)
+ALTERNATE_FORMATS = (("image/avif", ".avif"), ("image/webp", ".webp"))
+ALTERNATE_SOURCES = {".jpg", ".jpeg", ".png"}
+# Precompressed siblings (style.svg -> style.svg.br / style.svg.gz), best first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE_TYPES = ("image/svg+xml", "application/json", "text/")
+
+
+class MediaFileResponse(FileResponse):
+    # Fewer, larger reads per image than Starlette's 64KB default. Servers that
+    # support the ASGI pathsend extension skip this loop entirely (zero-copy).
+    chunk_size = 256 * 1024
+
+
+def _accepts(header: str, value: str) -> bool:
+    # Explicit listing only: "*/*" is sent by clients that cannot decode WebP/AVIF
+    for item in header.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if name.lower() != value:
+            continue
+        for param in params:
+            key, _, q = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    return float(q) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles for user media:
+    - Paths under `immutable_prefixes` are content-addressed or uniquely named,
+      so they are cached for a year with `immutable` (no revalidation at all)
+    - Strong ETags from file name + size, identical on every node
+    - If-None-Match / If-Modified-Since answered with 304 (StaticFiles logic)
+    - JPEG/PNG requests get a smaller .avif/.webp sibling when Accept allows
+    - Compressible files get an existing .br/.gz sibling when Accept-Encoding allows
+    - Range requests are handled by FileResponse
+    """
+
+    def __init__(
+        self,
+        *args,
+        immutable_prefixes: tuple[str, ...] = (),
+        max_age: int = 3600,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+        self.max_age = max_age
+
+    def _cache_control(self, path: str) -> str:
+        if path.startswith(self.immutable_prefixes):
+            return f"public, max-age={ONE_YEAR}, immutable"
+        return f"public, max-age={self.max_age}, must-revalidate"
+
+    def _stat_file(self, path: str) -> tuple[str, Optional[os.stat_result]]:
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return "", None
+        return full_path, stat_result
+
+    def _select(self, path: str, request_headers: Headers) -> Optional[tuple]:
+        """Pick the file to send: (full_path, stat, media_type, encoding, vary)."""
+        full_path, stat_result = self._stat_file(path)
+        if stat_result is None:
+            return None
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        root, ext = os.path.splitext(path)
+
+        if ext.lower() in ALTERNATE_SOURCES:
+            accept = request_headers.get("accept", "")
+            vary = False
+            for alt_type, alt_ext in ALTERNATE_FORMATS:
+                alt_path, alt_stat = self._stat_file(root + alt_ext)
+                if alt_stat is None:
+                    continue
+                # An alternate exists, so the response depends on Accept
+                vary = True
+                smaller = alt_stat.st_size < stat_result.st_size
+                if smaller and _accepts(accept, alt_type):
+                    return alt_path, alt_stat, alt_type, None, "Accept"
+            return full_path, stat_result, media_type, None, "Accept" if vary else None
+
+        if media_type.startswith(COMPRESSIBLE_TYPES):
+            accept_encoding = request_headers.get("accept-encoding", "")
+            for encoding, suffix in PRECOMPRESSED:
+                if not _accepts(accept_encoding, encoding):
+                    continue
+                enc_path, enc_stat = self._stat_file(path + suffix)
+                if enc_stat is not None:
+                    return enc_path, enc_stat, media_type, encoding, "Accept-Encoding"
+            return full_path, stat_result, media_type, None, "Accept-Encoding"
+
+        return full_path, stat_result, media_type, None, None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        request_headers = Headers(scope=scope)
+        try:
+            selected = await anyio.to_thread.run_sync(
+                self._select, path, request_headers
+            )
+        except (OSError, ValueError):
+            selected = None
+        if selected is None:
+            # Directories, 404s and odd paths: default StaticFiles behaviour
+            return await super().get_response(path, scope)
+
+        full_path, stat_result, media_type, encoding, vary = selected
+        headers = {
+            "cache-control": self._cache_control(path),
+            # Name + size: stable across nodes and redeploys (mtime is not)
+            "etag": f'"{os.path.basename(full_path)}-{stat_result.st_size:x}"',
+        }
+        if encoding:
+            headers["content-encoding"] = encoding
+        if vary:
+            headers["vary"] = vary
+        response = MediaFileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
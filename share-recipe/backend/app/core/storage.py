@@ -0,0 +1,496 @@
+import abc
+import asyncio
+import hashlib
+import hmac
+import os
+import tempfile
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from app.config.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+CHUNK_SIZE = 256 * 1024
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+# backend/app/core -> share-recipe/media (served at /media by app.main)
+MEDIA_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "media")
+)
+MEDIA_URL = "/media/"
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+class StorageError(Exception):
+    pass
+
+
+class Storage(abc.ABC):
+    """
+    Where media objects live. Keys are relative paths ("blobs/ab/cd/<sha>.jpg").
+    - put() streams a local file in, get() streams an object out
+    - url() is the public URL stored in the database
+    - is_local: objects are plain files under `root` (nothing to publish)
+    """
+
+    is_local = False
+
+    @abc.abstractmethod
+    async def put(
+        self, key: str, path: str, content_type: Optional[str] = None
+    ) -> None: ...
+
+    @abc.abstractmethod
+    def get(self, key: str) -> AsyncIterator[bytes]: ...
+
+    @abc.abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abc.abstractmethod
+    async def list(self, prefix: str) -> list[str]: ...
+
+    @abc.abstractmethod
+    def url(self, key: str) -> str: ...
+
+    @abc.abstractmethod
+    def key_for_url(self, url: str) -> Optional[str]: ...
+
+    def presign(
+        self,
+        key: str,
+        method: str = "GET",
+        expires: int = 900,
+        content_type: Optional[str] = None,
+    ) -> str:
+        # Optional: only backends with signed URLs (S3) override it
+        raise StorageError(f"{type(self).__name__} has no pre-signed URLs")
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalStorage(Storage):
+    """Files under `root`, served by the app at `base_url` (CachedStaticFiles)."""
+
+    is_local = True
+
+    def __init__(self, root: str = MEDIA_DIR, base_url: str = MEDIA_URL) -> None:
+        self.root = os.path.abspath(root)
+        self.base_url = base_url
+
+    def path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f"Key escapes the storage root: {key!r}")
+        return path
+
+    def _put(self, key: str, path: str) -> None:
+        target = self.path(key)
+        if os.path.abspath(path) == target:
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out, open(path, "rb") as src:
+                while chunk := src.read(CHUNK_SIZE):
+                    out.write(chunk)
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def put(
+        self, key: str, path: str, content_type: Optional[str] = None
+    ) -> None:
+        await asyncio.to_thread(self._put, key, path)
+
+    async def get(self, key: str) -> AsyncIterator[bytes]:
+        try:
+            f = await asyncio.to_thread(open, self.path(key), "rb")
+        except FileNotFoundError:
+            raise StorageError(f"No such object: {key}")
+        try:
+            while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            f.close()
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.isfile, self.path(key))
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _list(self, prefix: str) -> list[str]:
+        directory, _, name_prefix = prefix.rpartition("/")
+        try:
+            names = os.listdir(os.path.join(self.root, directory))
+        except FileNotFoundError:
+            return []
+        return sorted(
+            f"{directory}/{name}" if directory else name
+            for name in names
+            if name.startswith(name_prefix) and not name.endswith(".part")
+        )
+
+    async def list(self, prefix: str) -> list[str]:
+        return await asyncio.to_thread(self._list, prefix)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}{key}"
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        if not url.startswith(self.base_url):
+            return None
+        key = url[len(self.base_url) :]
+        try:
+            self.path(key)
+        except StorageError:
+            return None
+        return key
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return urllib.parse.quote(value, safe=safe)
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+def _signing_key(secret_key: str, date: str, region: str, service: str) -> bytes:
+    key = _hmac(f"AWS4{secret_key}".encode(), date)
+    key = _hmac(key, region)
+    key = _hmac(key, service)
+    return _hmac(key, "aws4_request")
+
+
+def _canonical_query(params: dict[str, str]) -> str:
+    return "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(params.items()))
+
+
+def sign_v4(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime,
+    service: str = "s3",
+) -> dict[str, str]:
+    """
+    AWS Signature Version 4 for a request (all given headers are signed).
+    Returns the headers to send, including Authorization.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    signed = {k.lower(): str(v).strip() for k, v in headers.items()}
+    signed["host"] = parsed.netloc
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-content-sha256"] = payload_hash
+    names = sorted(signed)
+    query = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+    canonical_request = "\n".join(
+        [
+            method,
+            _quote(parsed.path or "/", safe="/-_.~"),
+            _canonical_query(query),
+            "".join(f"{name}:{signed[name]}\n" for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ]
+    )
+    signature = hmac.new(
+        _signing_key(secret_key, date, region, service),
+        string_to_sign.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    signed["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    signed.pop("host")
+    return signed
+
+
+def presign_v4(
+    method: str,
+    url: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime,
+    expires: int,
+    service: str = "s3",
+    headers: Optional[dict[str, str]] = None,
+) -> str:
+    """
+    Query-string SigV4 (pre-signed URL). The host header and any given
+    `headers` are signed: the request must then send them with those values.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    scope = f"{date}/{region}/{service}/aws4_request"
+    signed = {k.lower(): str(v).strip() for k, v in (headers or {}).items()}
+    signed["host"] = parsed.netloc
+    names = sorted(signed)
+    query = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+    query.update(
+        {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires),
+            "X-Amz-SignedHeaders": ";".join(names),
+        }
+    )
+    canonical_request = "\n".join(
+        [
+            method,
+            _quote(parsed.path or "/", safe="/-_.~"),
+            _canonical_query(query),
+            "".join(f"{name}:{signed[name]}\n" for name in names),
+            ";".join(names),
+            UNSIGNED_PAYLOAD,
+        ]
+    )
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ]
+    )
+    signature = hmac.new(
+        _signing_key(secret_key, date, region, service),
+        string_to_sign.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    query["X-Amz-Signature"] = signature
+    return urllib.parse.urlunsplit(
+        (parsed.scheme, parsed.netloc, parsed.path, _canonical_query(query), "")
+    )
+
+
+class S3Storage(Storage):
+    """
+    S3-compatible object storage (AWS S3, MinIO, R2, ...) over plain httpx:
+    - Path-style addressing (endpoint/bucket/key), which every implementation takes
+    - Bodies are streamed both ways; uploads use UNSIGNED-PAYLOAD
+    - presign() gives time-limited GET/PUT URLs for direct client access
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        public_url: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+    ) -> None:
+        # Imported here: only deployments with MEDIA_STORAGE=s3 need httpx
+        import httpx
+
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        # Where browsers fetch objects (CDN or public bucket URL)
+        self.public_url = (public_url or f"{self.endpoint_url}/{bucket}").rstrip("/")
+        self.client = client or httpx.AsyncClient(timeout=30.0)
+
+    def _object_url(self, key: str = "") -> str:
+        return f"{self.endpoint_url}/{self.bucket}/{_quote(key, safe='/-_.~')}"
+
+    def _headers(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        payload_hash: str = EMPTY_SHA256,
+    ) -> dict[str, str]:
+        return sign_v4(
+            method,
+            url,
+            headers or {},
+            payload_hash,
+            self.access_key,
+            self.secret_key,
+            self.region,
+            datetime.now(timezone.utc),
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        headers = self._headers(
+            method,
+            url,
+            kwargs.pop("sign_headers", None),
+            kwargs.pop("payload_hash", EMPTY_SHA256),
+        )
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        if response.status_code >= 300 and response.status_code != 404:
+            raise StorageError(
+                f"S3 {method} {url} failed: "
+                f"{response.status_code} {response.text[:200]}"
+            )
+        return response
+
+    async def put(
+        self, key: str, path: str, content_type: Optional[str] = None
+    ) -> None:
+        size = await asyncio.to_thread(os.path.getsize, path)
+        sign_headers = {"content-length": str(size)}
+        if content_type:
+            sign_headers["content-type"] = content_type
+
+        async def body() -> AsyncIterator[bytes]:
+            f = await asyncio.to_thread(open, path, "rb")
+            try:
+                while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                    yield chunk
+            finally:
+                f.close()
+
+        await self._request(
+            "PUT",
+            self._object_url(key),
+            sign_headers=sign_headers,
+            payload_hash=UNSIGNED_PAYLOAD,
+            content=body(),
+        )
+
+    async def get(self, key: str) -> AsyncIterator[bytes]:
+        url = self._object_url(key)
+        request = self.client.build_request(
+            "GET", url, headers=self._headers("GET", url)
+        )
+        response = await self.client.send(request, stream=True)
+        try:
+            if response.status_code == 404:
+                raise StorageError(f"No such object: {key}")
+            if response.status_code >= 300:
+                raise StorageError(f"S3 GET {url} failed: {response.status_code}")
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def exists(self, key: str) -> bool:
+        response = await self._request("HEAD", self._object_url(key))
+        return response.status_code == 200
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", self._object_url(key))
+
+    async def list(self, prefix: str) -> list[str]:
+        keys: list[str] = []
+        token: Optional[str] = None
+        while True:
+            params = {"list-type": "2", "prefix": prefix}
+            if token:
+                params["continuation-token"] = token
+            url = f"{self._object_url()}?{_canonical_query(params)}"
+            response = await self._request("GET", url)
+            root = ET.fromstring(response.content)
+            ns = root.tag.partition("}")[0] + "}" if root.tag.startswith("{") else ""
+            keys.extend(el.text or "" for el in root.iter(f"{ns}Key"))
+            truncated = root.findtext(f"{ns}IsTruncated") == "true"
+            token = root.findtext(f"{ns}NextContinuationToken")
+            if not truncated or not token:
+                return keys
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{_quote(key, safe='/-_.~')}"
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        prefix = f"{self.public_url}/"
+        if not url.startswith(prefix):
+            return None
+        return urllib.parse.unquote(url[len(prefix) :])
+
+    def presign(
+        self,
+        key: str,
+        method: str = "GET",
+        expires: int = 900,
+        content_type: Optional[str] = None,
+    ) -> str:
+        url = self._object_url(key)
+        headers = None
+        if content_type and method == "PUT":
+            # Signed: an upload with any other Content-Type is refused
+            headers = {"content-type": content_type}
+        elif content_type:
+            # Part of the signed query: the response carries this Content-Type
+            query = urllib.parse.urlencode({"response-content-type": content_type})
+            url = f"{url}?{query}"
+        return presign_v4(
+            method,
+            url,
+            self.access_key,
+            self.secret_key,
+            self.region,
+            datetime.now(timezone.utc),
+            expires,
+            headers=headers,
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_storage: Optional[Storage] = None
+
+
+def get_storage() -> Storage:
+    """Process-wide storage backend selected by MEDIA_STORAGE (local | s3)."""
+    global _storage
+    if _storage is None:
+        if settings.MEDIA_STORAGE == "s3":
+            _storage = S3Storage(
+                settings.S3_ENDPOINT_URL or "",
+                settings.S3_BUCKET or "",
+                settings.S3_ACCESS_KEY_ID or "",
+                settings.S3_SECRET_ACCESS_KEY or "",
+                region=settings.S3_REGION,
+                public_url=settings.S3_PUBLIC_URL,
+            )
+        else:
+            _storage = LocalStorage()
+    return _storage
+
+
+async def close_storage() -> None:
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import User
 from app.db.session import async_session_maker
-from app.utils.security import hash_password
+from app.utils.security import hash_password_async
 
 
 class UserDAO:
@@ -17,7 +17,7 @@ class UserDAO:
     async def create_user(
         session: AsyncSession, username: str, email: str, password: str
     ):
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password_async(password)
         user = User(
             username=username,
             email=email,
@@ -36,8 +36,13 @@ class UserDAO:
         return result.scalar_one_or_none()
 
     @classmethod
-    async def get_by_id(cls, user_id: int) -> User | None:
+    async def get_by_id(
+        cls, user_id: int, session: AsyncSession | None = None
+    ) -> User | None:
+        query = select(User).where(User.id == user_id)
+        if session is not None:
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
         async with async_session_maker() as session:
-            query = select(User).where(User.id == user_id)
             result = await session.execute(query)
             return result.scalar_one_or_none()
@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, exists, select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import User
+from app.db.media import MediaBlob
+from app.db.recipes import Recipe
+
+
+async def register_blob(
+    session: AsyncSession,
+    digest: str,
+    url: str,
+    size: int,
+    content_type: Optional[str] = None,
+) -> str:
+    """
+    Record an uploaded blob (or refresh last_uploaded_at if the content is known).
+    Returns the blob's url: an earlier upload of the same bytes keeps its own.
+    """
+    for _ in range(2):
+        blob = await session.get(MediaBlob, digest)
+        if blob is not None:
+            blob.last_uploaded_at = datetime.now(timezone.utc)
+            await session.commit()
+            return str(blob.url)
+        session.add(
+            MediaBlob(digest=digest, url=url, size=size, content_type=content_type)
+        )
+        try:
+            await session.commit()
+            return url
+        except IntegrityError:
+            # Same content registered concurrently: use that row
+            await session.rollback()
+    raise RuntimeError(f"Could not register media blob {digest}")
+
+
+def _unreferenced(cutoff: datetime):
+    return and_(
+        MediaBlob.last_uploaded_at < cutoff,
+        ~exists().where(Recipe.image_url == MediaBlob.url),
+        ~exists().where(User.photo_url == MediaBlob.url),
+    )
+
+
+async def find_unreferenced_blobs(
+    session: AsyncSession,
+    cutoff: datetime,
+    limit: int,
+    after: Optional[str] = None,
+) -> list[MediaBlob]:
+    stmt = (
+        select(MediaBlob)
+        .where(_unreferenced(cutoff))
+        .order_by(MediaBlob.digest)
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(MediaBlob.digest > after)
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def delete_unreferenced_blobs(
+    session: AsyncSession, digests: list[str], cutoff: datetime
+) -> list[tuple[str, str]]:
+    """
+    Delete registry rows that are still unreferenced (re-checked in the same
+    statement); returns (digest, url) of the rows actually deleted.
+    """
+    result = await session.execute(
+        delete(MediaBlob)
+        .where(MediaBlob.digest.in_(digests), _unreferenced(cutoff))
+        .returning(MediaBlob.digest, MediaBlob.url)
+    )
+    rows = [(row[0], row[1]) for row in result.all()]
+    await session.commit()
+    return rows
+
+
+async def referenced_media_urls(session: AsyncSession, prefix: str) -> set[str]:
+    """All recipe image / profile photo urls that start with `prefix`."""
+    stmt = union(
+        select(Recipe.image_url).where(Recipe.image_url.startswith(prefix)),
+        select(User.photo_url).where(User.photo_url.startswith(prefix)),
+    )
+    result = await session.execute(stmt)
+    return {row[0] for row in result.all()}
@@ -1,7 +1,7 @@
 # services/recipe.py
 from typing import Optional, Sequence
 
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -13,6 +13,7 @@ from app.db.recipe_ingredients import RecipeIngredient
 from app.db.recipes import Recipe
 from app.db.social import Comment, RecipeLike, SavedRecipe
 from app.models.recipe import IngredientOut, RecipeCreate, RecipeUpdate
+from app.services.user_cache import invalidate_on_commit
 
 
 # Helper to attach social fields
@@ -83,6 +84,179 @@ async def _attach_ingredients(db: AsyncSession, recipe: Recipe):
     return recipe
 
 
+# Columns of RecipeResponse that come straight from the recipes table
+_RECIPE_COLUMNS = (
+    Recipe.id,
+    Recipe.title,
+    Recipe.description,
+    Recipe.instructions,
+    Recipe.image_url,
+    Recipe.image_variants,
+    Recipe.is_published,
+    Recipe.created_at,
+    Recipe.user_id,
+)
+
+
+# Statement builders for the hot queries. The routes run them through the
+# functions below; app/test/test_query_plans.py EXPLAINs the same statements
+# to check that they stay on their indexes.
+def feed_query(
+    search: Optional[str] = None,
+    user: Optional[User] = None,
+    include_self: bool = False,
+    ingredient_ids: Optional[list[int]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
+    stmt = select(*_RECIPE_COLUMNS).order_by(Recipe.created_at.desc())
+    if search:
+        # basic title search (trigram index on lower(title) in PostgreSQL)
+        stmt = stmt.where(func.lower(Recipe.title).like(f"%{search.lower()}%"))
+    # Exclude the current user's own posts in public listing when authenticated unless include_self is True
+    if user is not None and getattr(user, "id", None) is not None and not include_self:
+        stmt = stmt.where(Recipe.user_id != getattr(user, "id"))
+    # Filter by ingredients if provided (ANY of the selected ingredients)
+    if ingredient_ids:
+        stmt = stmt.where(
+            Recipe.id.in_(
+                select(RecipeIngredient.recipe_id).where(
+                    RecipeIngredient.ingredient_id.in_(ingredient_ids)
+                )
+            )
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if offset:
+        stmt = stmt.offset(offset)
+    return stmt
+
+
+def like_counts_query(recipe_ids: Sequence[int]):
+    return (
+        select(RecipeLike.recipe_id, func.count())
+        .where(RecipeLike.recipe_id.in_(recipe_ids))
+        .group_by(RecipeLike.recipe_id)
+    )
+
+
+def author_page_query(author_id: int, limit: int = 20, offset: int = 0):
+    return (
+        select(*_RECIPE_COLUMNS)
+        .where(Recipe.user_id == author_id, Recipe.is_published.is_(True))
+        .order_by(Recipe.created_at.desc(), Recipe.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def saved_query(user_id: int):
+    # Most recently saved first, straight off ix_saved_recipes_user_created
+    return (
+        select(*_RECIPE_COLUMNS)
+        .join(SavedRecipe, SavedRecipe.recipe_id == Recipe.id)
+        .where(SavedRecipe.user_id == user_id)
+        .order_by(SavedRecipe.created_at.desc())
+    )
+
+
+def comments_query(recipe_id: int):
+    return (
+        select(Comment, User.username)
+        .join(User, User.id == Comment.user_id)
+        .where(Comment.recipe_id == recipe_id)
+        .order_by(Comment.created_at.asc())
+    )
+
+
+async def _recipe_rows(
+    db: AsyncSession, stmt, user: Optional[User] = None
+) -> list[dict]:
+    """
+    Run a select over _RECIPE_COLUMNS and return plain dicts in RecipeResponse
+    shape. Social fields and ingredients are loaded with one query each for
+    the whole page instead of per recipe, and no ORM objects are built.
+    """
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    if not rows:
+        return []
+    ids = [row["id"] for row in rows]
+    likes = dict((await db.execute(like_counts_query(ids))).all())
+    authors = dict(
+        (
+            await db.execute(
+                select(User.id, User.username).where(
+                    User.id.in_({row["user_id"] for row in rows})
+                )
+            )
+        ).all()
+    )
+    liked: set[int] = set()
+    saved: set[int] = set()
+    if user is not None:
+        liked = set(
+            (
+                await db.execute(
+                    select(RecipeLike.recipe_id).where(
+                        RecipeLike.user_id == user.id, RecipeLike.recipe_id.in_(ids)
+                    )
+                )
+            ).scalars()
+        )
+        saved = set(
+            (
+                await db.execute(
+                    select(SavedRecipe.recipe_id).where(
+                        SavedRecipe.user_id == user.id, SavedRecipe.recipe_id.in_(ids)
+                    )
+                )
+            ).scalars()
+        )
+    ingredients: dict[int, list[dict]] = {}
+    res = await db.execute(
+        select(RecipeIngredient.recipe_id, Ingredient.id, Ingredient.name)
+        .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+        .where(RecipeIngredient.recipe_id.in_(ids))
+        .order_by(Ingredient.name.asc())
+    )
+    for recipe_id, ingredient_id, name in res.all():
+        ingredients.setdefault(recipe_id, []).append(
+            {"id": ingredient_id, "name": name}
+        )
+    for row in rows:
+        author_id = row.pop("user_id")
+        row["likes"] = int(likes.get(row["id"], 0))
+        row["author_username"] = authors.get(author_id)
+        row["ingredients"] = ingredients.get(row["id"], [])
+        if user is None:
+            row["liked"] = row["saved"] = row["can_delete"] = None
+        else:
+            row["liked"] = row["id"] in liked
+            row["saved"] = row["id"] in saved
+            row["can_delete"] = author_id == user.id
+    return rows
+
+
+async def _bump_author_stats(
+    db: AsyncSession, author_id: Optional[int], recipes: int = 0, likes: int = 0
+) -> None:
+    # Relative UPDATE in the caller's transaction: concurrent writers never
+    # overwrite each other's increments
+    if author_id is None or not (recipes or likes):
+        return
+    await db.execute(
+        update(User)
+        .where(User.id == author_id)
+        .values(
+            recipes_count=User.recipes_count + recipes,
+            likes_received=User.likes_received + likes,
+        )
+    )
+    # The cached principal carries the counters; Core UPDATEs skip the ORM
+    # events that would otherwise drop it
+    invalidate_on_commit(db, author_id)
+
+
 # Create
 async def create_recipe(recipe_data: RecipeCreate, user: User, db: AsyncSession):
     # Exclude non-column fields like 'ingredients' from model init
@@ -90,6 +264,9 @@ async def create_recipe(recipe_data: RecipeCreate, user: User, db: AsyncSession)
     payload.pop("ingredients", None)
     new_recipe = Recipe(**payload, user_id=user.id)
     db.add(new_recipe)
+    await db.flush()
+    if new_recipe.is_published:
+        await _bump_author_stats(db, user.id, recipes=1)
     await db.commit()
     await db.refresh(new_recipe)
     # Attach any provided ingredient_ids if present in payload (future-proof)
@@ -132,52 +309,21 @@ async def list_recipes(
     user: Optional[User] = None,
     include_self: bool = False,
     ingredient_ids: Optional[list[int]] = None,
-) -> Sequence[Recipe]:
-    stmt = (
-        select(Recipe)
-        .options(joinedload(Recipe.user))
-        .order_by(Recipe.created_at.desc())
-    )
-    if search:
-        # basic title search
-        from sqlalchemy import func as _func
-
-        stmt = stmt.where(_func.lower(Recipe.title).like(f"%{search.lower()}%"))
-    # Exclude the current user's own posts in public listing when authenticated unless include_self is True
-    if user is not None and getattr(user, "id", None) is not None and not include_self:
-        stmt = stmt.where(Recipe.user_id != getattr(user, "id"))
-    # Filter by ingredients if provided (ANY of the selected ingredients)
-    if ingredient_ids:
-        stmt = (
-            stmt.join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
-            .where(RecipeIngredient.ingredient_id.in_(ingredient_ids))
-            .distinct()
-        )
-    res = await db.execute(stmt)
-    recipes = res.scalars().all()
-    # attach social counts and ingredients for listing
-    out = []
-    for r in recipes:
-        await _attach_social_fields(db, r, user)
-        await _attach_ingredients(db, r)
-        out.append(r)
-    return out
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[dict]:
+    stmt = feed_query(search, user, include_self, ingredient_ids, limit, offset)
+    return await _recipe_rows(db, stmt, user)
 
 
 # List by user
-async def get_recipes_by_user(user: User, db: AsyncSession):
-    result = await db.execute(
-        select(Recipe)
+async def get_recipes_by_user(user: User, db: AsyncSession) -> list[dict]:
+    stmt = (
+        select(*_RECIPE_COLUMNS)
         .where(Recipe.user_id == user.id)
         .order_by(Recipe.created_at.desc())
     )
-    recipes = result.scalars().all()
-    out = []
-    for r in recipes:
-        await _attach_social_fields(db, r, user)
-        await _attach_ingredients(db, r)
-        out.append(r)
-    return out
+    return await _recipe_rows(db, stmt, user)
 
 
 # Update
@@ -190,10 +336,15 @@ async def update_recipe(
     payload = data.model_dump(exclude_unset=True)
     # Extract ingredients if present
     new_ingredient_ids = payload.pop("ingredients", None)
+    was_published = bool(recipe.is_published)
     # Update scalar fields
     for k, v in payload.items():
         setattr(recipe, k, v)
     db.add(recipe)
+    if bool(recipe.is_published) != was_published:
+        await _bump_author_stats(
+            db, recipe.user_id, recipes=1 if recipe.is_published else -1
+        )
     await db.commit()
     await db.refresh(recipe)
 
@@ -226,6 +377,18 @@ async def delete_recipe(recipe_id: int, user: User, db: AsyncSession) -> bool:
     recipe = await get_recipe_by_id(recipe_id, db, user)
     if recipe is None or getattr(recipe, "user_id") != user.id:
         return False
+    # Its likes go with it (ON DELETE CASCADE)
+    likes = await db.execute(
+        select(func.count())
+        .select_from(RecipeLike)
+        .where(RecipeLike.recipe_id == recipe.id)
+    )
+    await _bump_author_stats(
+        db,
+        recipe.user_id,
+        recipes=-1 if recipe.is_published else 0,
+        likes=-int(likes.scalar_one()),
+    )
     await db.delete(recipe)
     await db.commit()
     return True
@@ -239,6 +402,8 @@ async def set_recipe_image(
     if recipe is None or getattr(recipe, "user_id") != user.id:
         return None
     setattr(recipe, "image_url", image_url)
+    # Variants of the previous image no longer apply; rebuilt in the background
+    setattr(recipe, "image_variants", None)
     db.add(recipe)
     await db.commit()
     await db.refresh(recipe)
@@ -255,6 +420,10 @@ async def add_like(recipe_id: int, user: User, db: AsyncSession) -> int:
     )
     if exists.scalar_one_or_none() is None:
         db.add(RecipeLike(recipe_id=recipe_id, user_id=user.id))
+        author_id = await db.scalar(
+            select(Recipe.user_id).where(Recipe.id == recipe_id)
+        )
+        await _bump_author_stats(db, author_id, likes=1)
         await db.commit()
     cnt = await db.execute(
         select(func.count())
@@ -265,11 +434,16 @@ async def add_like(recipe_id: int, user: User, db: AsyncSession) -> int:
 
 
 async def remove_like(recipe_id: int, user: User, db: AsyncSession) -> int:
-    await db.execute(
+    res = await db.execute(
         delete(RecipeLike).where(
             and_(RecipeLike.recipe_id == recipe_id, RecipeLike.user_id == user.id)
         )
     )
+    if res.rowcount:
+        author_id = await db.scalar(
+            select(Recipe.user_id).where(Recipe.id == recipe_id)
+        )
+        await _bump_author_stats(db, author_id, likes=-res.rowcount)
     await db.commit()
     cnt = await db.execute(
         select(func.count())
@@ -300,29 +474,24 @@ async def remove_save(recipe_id: int, user: User, db: AsyncSession) -> None:
     await db.commit()
 
 
-async def list_saved(user: User, db: AsyncSession):
-    res = await db.execute(
-        select(Recipe)
-        .join(SavedRecipe, SavedRecipe.recipe_id == Recipe.id)
-        .where(SavedRecipe.user_id == user.id)
-    )
-    recipes = res.scalars().all()
-    out = []
-    for r in recipes:
-        await _attach_social_fields(db, r, user)
-        await _attach_ingredients(db, r)
-        out.append(r)
-    return out
+async def list_published_by_author(
+    author_id: int,
+    db: AsyncSession,
+    viewer: Optional[User] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[dict]:
+    """One page of an author's published recipes (public profile), newest first."""
+    return await _recipe_rows(db, author_page_query(author_id, limit, offset), viewer)
+
+
+async def list_saved(user: User, db: AsyncSession) -> list[dict]:
+    return await _recipe_rows(db, saved_query(user.id), user)
 
 
 # Comments
 async def list_comments(recipe_id: int, db: AsyncSession):
-    res = await db.execute(
-        select(Comment, User.username)
-        .join(User, User.id == Comment.user_id)
-        .where(Comment.recipe_id == recipe_id)
-        .order_by(Comment.created_at.asc())
-    )
+    res = await db.execute(comments_query(recipe_id))
     items = []
     for c, username in res.all():
         obj = c
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -23,6 +23,27 @@ class User(Base):
         nullable=False,
     )
     photo_url = Column(String, nullable=True)
+    # Resized derivatives of photo_url (see app.utils.images.build_variants)
+    photo_variants = Column(JSON, nullable=True)
     username_changed_at = Column(DateTime(timezone=True), nullable=True)
     bio = Column(String(300), nullable=True)
+    # Profile header stats, maintained by app.db.dao.recipe on every write:
+    # published recipes, and likes on any of the user's recipes
+    recipes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    likes_received = Column(Integer, nullable=False, default=0, server_default="0")
     recipes = relationship("Recipe", back_populates="user")
+
+    __table_args__ = (
+        # Admin prefix search (LIKE 'term%'): under a non-C collation only a
+        # pattern_ops btree can serve it on PostgreSQL
+        Index(
+            "ix_users_email_pattern",
+            "email",
+            postgresql_ops={"email": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_users_username_pattern",
+            "username",
+            postgresql_ops={"username": "varchar_pattern_ops"},
+        ),
+    )
@@ -1,6 +1,6 @@
 # filepath: backend/app/db/feedback.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from app.db.base import Base
 
 
@@ -11,3 +11,12 @@ class Feedback(Base):
     email = Column(String(255), nullable=False, index=True)
     message = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Admin prefix search on email (see app.db.database.User)
+        Index(
+            "ix_feedback_email_pattern",
+            "email",
+            postgresql_ops={"email": "varchar_pattern_ops"},
+        ),
+    )
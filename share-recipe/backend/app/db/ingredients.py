@@ -1,7 +1,7 @@
 # filepath: backend/app/db/ingredients.py
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, Index, Integer, String, UniqueConstraint
 
 from app.db.base import Base
 
@@ -20,4 +20,12 @@ class Ingredient(Base):
         nullable=False,
     )
 
-    __table_args__ = (UniqueConstraint("name_norm", name="uq_ingredient_name_norm"),)
+    __table_args__ = (
+        UniqueConstraint("name_norm", name="uq_ingredient_name_norm"),
+        # Admin prefix search on name_norm (see app.db.database.User)
+        Index(
+            "ix_ingredients_name_norm_pattern",
+            "name_norm",
+            postgresql_ops={"name_norm": "varchar_pattern_ops"},
+        ),
+    )
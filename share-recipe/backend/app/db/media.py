@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from app.db.base import Base
+
+
+# Registry of content-addressed uploads under media/blobs/. Blobs are not
+# reference-counted: a blob is in use while recipes.image_url or
+# users.photo_url points at its url (see app.cli.media_gc).
+class MediaBlob(Base):
+    __tablename__ = "media_blobs"
+
+    digest = Column(String(64), primary_key=True)  # sha256 of the uploaded bytes
+    url = Column(String, nullable=False, unique=True)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    # Bumped on every re-upload of the same content; GC grace period starts here
+    last_uploaded_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
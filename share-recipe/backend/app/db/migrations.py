@@ -0,0 +1,274 @@
+"""
+Helpers shared by the migration runner (app.cli.migrate), alembic/env.py and
+revision scripts.
+
+Revision scripts that add indexes to big tables should use
+create_index_concurrently / drop_index_concurrently instead of op.create_index:
+on PostgreSQL they run outside the migration transaction (CONCURRENTLY cannot
+run inside one) and do not block writes; elsewhere they fall back to the plain
+statement.
+
+Data migrations should use batched_backfill instead of one big UPDATE: it
+walks the table in primary-key ranges, commits each batch, checkpoints its
+progress in backfill_checkpoints and resumes from there when rerun. The
+downgrade that undoes one should call reset_backfill, so the next upgrade
+runs it again instead of finding it done.
+"""
+
+import ast
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+
+# Arbitrary, but fixed: every node must contend for the same advisory lock
+MIGRATION_LOCK_ID = 0x5EC1BE  # "share recipe"
+
+logger = logging.getLogger("alembic.backfill")
+
+# Progress of batched backfills, keyed by backfill name. Created on first use
+# and left out of autogenerate (see alembic/env.py), it is not an app model
+BACKFILL_CHECKPOINTS = sa.Table(
+    "backfill_checkpoints",
+    sa.MetaData(),
+    sa.Column("name", sa.String(200), primary_key=True),
+    # Exclusive upper bound of the last committed batch
+    sa.Column("last_key", sa.BigInteger(), nullable=False),
+    sa.Column("rows", sa.BigInteger(), nullable=False),
+    sa.Column("done", sa.Boolean(), nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+
+def sync_database_url(url: str) -> str:
+    """The app's async DATABASE_URL with the matching sync driver for Alembic."""
+    for async_driver, sync_driver in (
+        ("postgresql+asyncpg://", "postgresql+psycopg2://"),
+        ("sqlite+aiosqlite://", "sqlite://"),
+    ):
+        if url.startswith(async_driver):
+            return sync_driver + url[len(async_driver) :]
+    return url
+
+
+def database_url() -> str:
+    """Sync DATABASE_URL from the environment or .env, like the app reads it."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        raise RuntimeError("DATABASE_URL environment variable is not set!")
+    return sync_database_url(url)
+
+
+def _literal_assignments(path: Path, names: set[str]) -> dict:
+    found = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        # `revision = "..."` and `revision: str = "..."` both occur
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target = node.target
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id in names:
+            found[target.id] = ast.literal_eval(node.value)
+    return found
+
+
+def script_heads(versions_dir: Path = VERSIONS_DIR) -> Optional[set[str]]:
+    """
+    Head revisions, read statically from the revision files (no imports, so
+    it costs a few milliseconds). None if any file is not plain enough to
+    read this way; callers then ask Alembic instead.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        try:
+            values = _literal_assignments(path, {"revision", "down_revision"})
+        except (SyntaxError, ValueError):
+            return None
+        if "revision" not in values:
+            return None
+        revisions.add(values["revision"])
+        down = values.get("down_revision")
+        if isinstance(down, str):
+            parents.add(down)
+        elif down:
+            parents.update(down)
+    return revisions - parents
+
+
+def _is_postgresql() -> bool:
+    from alembic import op
+
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Iterable, **kw
+) -> None:
+    """
+    op.create_index, built with CREATE INDEX CONCURRENTLY on PostgreSQL.
+
+    A failed concurrent build leaves an INVALID index behind, so any leftover
+    with the same name is dropped first and the migration can simply be rerun.
+    """
+    from alembic import op
+
+    if not _is_postgresql():
+        op.create_index(index_name, table_name, list(columns), **kw)
+        return
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+        op.create_index(
+            index_name, table_name, list(columns), postgresql_concurrently=True, **kw
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str, **kw) -> None:
+    from alembic import op
+
+    if not _is_postgresql():
+        op.drop_index(index_name, table_name=table_name, **kw)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+            **kw,
+        )
+
+
+def _commit(conn: Connection) -> None:
+    # In an autocommit block each statement is already committed, and the
+    # block owns the (no-op) SQLAlchemy transaction
+    if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        conn.commit()
+
+
+def _save_checkpoint(
+    conn: Connection, name: str, last_key: int, rows: int, done: bool
+) -> None:
+    t = BACKFILL_CHECKPOINTS
+    values = {
+        "last_key": last_key,
+        "rows": rows,
+        "done": done,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    updated = conn.execute(t.update().where(t.c.name == name).values(**values))
+    if updated.rowcount == 0:
+        conn.execute(t.insert().values(name=name, **values))
+
+
+def run_backfill(
+    conn: Connection,
+    name: str,
+    table: str,
+    statement: str,
+    *,
+    key: str = "id",
+    batch_size: int = 5000,
+    max_batch_size: int = 100_000,
+    target_seconds: float = 0.5,
+    pause: float = 0.0,
+) -> dict:
+    """
+    Run `statement` over `table` one primary-key range at a time.
+
+    `statement` is SQL with :lo and :hi bound to the half-open range of `key`
+    values for the batch (`... WHERE id >= :lo AND id < :hi`) and must be
+    idempotent: a batch interrupted before its checkpoint is simply redone.
+    Each batch is committed on its own, so locks are held for one batch and
+    WAL is written in small steps. The batch size adapts to keep each one near
+    `target_seconds`; `pause` sleeps between batches to leave room for other
+    traffic. Rows inserted after the backfill starts (keys above the max it
+    saw) are expected to be handled by application code.
+
+    `conn` must not be inside a transaction the caller still needs: it is
+    committed after every batch (unless it is already in autocommit mode).
+    """
+    BACKFILL_CHECKPOINTS.create(conn, checkfirst=True)
+    t = BACKFILL_CHECKPOINTS
+    checkpoint = conn.execute(
+        sa.select(t.c.last_key, t.c.rows, t.c.done).where(t.c.name == name)
+    ).first()
+    _commit(conn)
+    if checkpoint is not None and checkpoint.done:
+        return {"name": name, "rows": checkpoint.rows, "batches": 0, "done": True}
+
+    quote = conn.dialect.identifier_preparer.quote
+    low, high = conn.execute(
+        sa.text(f"SELECT min({quote(key)}), max({quote(key)}) FROM {quote(table)}")
+    ).first()
+    _commit(conn)
+    rows, batches = (checkpoint.rows, 0) if checkpoint is not None else (0, 0)
+    if low is None:
+        _save_checkpoint(conn, name, 0, rows, done=True)
+        _commit(conn)
+        return {"name": name, "rows": rows, "batches": 0, "done": True}
+
+    lo = max(low, checkpoint.last_key) if checkpoint is not None else low
+    end = high + 1
+    size = batch_size
+    update = sa.text(statement)
+    while lo < end:
+        hi = min(lo + size, end)
+        started = time.perf_counter()
+        result = conn.execute(update, {"lo": lo, "hi": hi})
+        rows += max(result.rowcount, 0)
+        batches += 1
+        _save_checkpoint(conn, name, hi, rows, done=hi >= end)
+        _commit(conn)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "%s: %s..%s of %s (%d rows, %.0f ms)",
+            name,
+            lo,
+            hi,
+            end,
+            rows,
+            elapsed * 1000,
+        )
+        if elapsed > target_seconds * 2:
+            size = max(size // 2, 1)
+        elif elapsed < target_seconds / 2:
+            size = min(size * 2, max_batch_size)
+        lo = hi
+        if pause and lo < end:
+            time.sleep(pause)
+    return {"name": name, "rows": rows, "batches": batches, "done": True}
+
+
+def batched_backfill(name: str, table: str, statement: str, **kw) -> dict:
+    """run_backfill from a revision script, outside the migration transaction."""
+    from alembic import op
+
+    with op.get_context().autocommit_block():
+        return run_backfill(op.get_bind(), name, table, statement, **kw)
+
+
+def reset_backfill(name: str, conn: Optional[Connection] = None) -> None:
+    """
+    Forget the checkpoint of backfill `name` (from the downgrade that drops
+    what it filled in). `conn` defaults to the migration's connection.
+    """
+    if conn is None:
+        from alembic import op
+
+        conn = op.get_bind()
+    t = BACKFILL_CHECKPOINTS
+    if sa.inspect(conn).has_table(t.name):
+        conn.execute(t.delete().where(t.c.name == name))
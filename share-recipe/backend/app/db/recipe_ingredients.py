@@ -1,5 +1,5 @@
 # filepath: backend/app/db/recipe_ingredients.py
-from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer
 
 from app.db.base import Base
 
@@ -15,7 +15,7 @@ class RecipeIngredient(Base):
     )
 
     __table_args__ = (
-        UniqueConstraint("recipe_id", "ingredient_id", name="uq_recipe_ingredient"),
-        Index("ix_recipe_ingredients_recipe", "recipe_id"),
-        Index("ix_recipe_ingredients_ingredient", "ingredient_id"),
+        # The primary key serves lookups by recipe; this one the ingredient
+        # filter on the feed, without visiting the table
+        Index("ix_recipe_ingredients_ingredient_recipe", "ingredient_id", "recipe_id"),
     )
@@ -1,7 +1,18 @@
 # db/recipe.py
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -15,6 +26,8 @@ class Recipe(Base):
     description = Column(Text)
     instructions = Column(Text)
     image_url = Column(String, nullable=True)
+    # Resized derivatives of image_url (see app.utils.images.build_variants)
+    image_variants = Column(JSON, nullable=True)
     is_published = Column(Boolean, default=True)
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -24,3 +37,19 @@ class Recipe(Base):
     user = relationship("User", back_populates="recipes")
     # Optional category link (table can be added later). Keep as plain Integer to avoid FK errors until categories exist.
     category_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        # Public profile page: an author's published recipes, newest first
+        Index(
+            "ix_recipes_user_published_created", "user_id", "is_published", "created_at"
+        ),
+        # Feed: newest first
+        Index("ix_recipes_created_at", "created_at"),
+        # Title search, lower(title) LIKE '%term%': trigram GIN on PostgreSQL
+        Index(
+            "ix_recipes_title_trgm",
+            func.lower(title).label("title_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"title_lower": "gin_trgm_ops"},
+        ),
+    )
@@ -1,44 +1,47 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    Text,
+)
 
 from app.db.base import Base
 
 
 class RecipeLike(Base):
     __tablename__ = "recipe_likes"
-    id = Column(Integer, primary_key=True)
-    recipe_id = Column(
-        Integer,
-        ForeignKey("recipes.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True,
-    )
-    user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
-    __table_args__ = (UniqueConstraint("recipe_id", "user_id", name="uq_recipe_like"),)
+    __table_args__ = (
+        # The key also serves per-recipe counts; named as the migration built it
+        PrimaryKeyConstraint("recipe_id", "user_id", name="pk_recipe_likes"),
+        # liked flags for a page (user_id = ? AND recipe_id IN ...) and
+        # ON DELETE CASCADE from users
+        Index("ix_recipe_likes_user_recipe", "user_id", "recipe_id"),
+    )
 
 
 class SavedRecipe(Base):
     __tablename__ = "saved_recipes"
-    id = Column(Integer, primary_key=True)
-    recipe_id = Column(
-        Integer,
-        ForeignKey("recipes.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True,
-    )
-    user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
-    __table_args__ = (UniqueConstraint("recipe_id", "user_id", name="uq_saved_recipe"),)
+    __table_args__ = (
+        # Keyed by (recipe_id, user_id), like RecipeLike
+        PrimaryKeyConstraint("recipe_id", "user_id", name="pk_saved_recipes"),
+        # A user's saved list, newest first; also covers ON DELETE CASCADE from users
+        Index("ix_saved_recipes_user_created", "user_id", "created_at"),
+    )
 
 
 class Comment(Base):
@@ -1,18 +1,29 @@
 import os
 
-import redis.asyncio as redis
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.admin import setup_admin
 from app.api import recipe as recipe_router
+from app.api import metrics as metrics_router
 from app.api import token, user
 from app.config.config import settings
-from app.core.logging import setup_logging, RequestLoggingMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.lazy import LazyApp
+from app.core.static import CachedStaticFiles
+from app.core.redis import close_redis, get_redis_client, init_redis
+from app.core.storage import MEDIA_DIR, close_storage
+from app.services.user_cache import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from app.utils.email_templates import load_email_assets
+from app.utils.images import shutdown_image_pool
+from app.utils.outbox import start_outbox_worker, stop_outbox_worker
+from app.utils.uploads import UploadLimitMiddleware
+from app.core.logging import setup_logging, shutdown_logging, RequestLoggingMiddleware
 import logging
 
 # Configure logging as early as possible
@@ -20,21 +31,50 @@ setup_logging()
 
 app = FastAPI()
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Create media directory relative to the backend directory
-MEDIA_DIR = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "media")
+# Media directory (share-recipe/media): the objects themselves with
+# MEDIA_STORAGE=local, otherwise only legacy files and upload working copies
 os.makedirs(MEDIA_DIR, exist_ok=True)
-app.mount("/media", StaticFiles(directory=MEDIA_DIR), name="media")
+# Blobs are content-addressed and legacy uploads carry a uuid: both never change
+app.mount(
+    "/media",
+    CachedStaticFiles(
+        directory=MEDIA_DIR,
+        immutable_prefixes=("blobs/", "recipe_photos/", "profile_photos/"),
+    ),
+    name="media",
+)
+# SQLAdmin (and its sync engine) is built on the first /admin request
+app.mount("/admin", LazyApp("app.admin:create_admin_app", name="admin"), name="admin")
 
 # Enable server-side sessions for admin auth
 app.add_middleware(
-    SessionMiddleware, secret_key=os.getenv("SESSION_SECRET", settings.SECRET_KEY)
+    SessionMiddleware, secret_key=settings.SESSION_SECRET or settings.SECRET_KEY
 )
 
 app.include_router(user.router)
 app.include_router(token.router)
 app.include_router(recipe_router.router)
+app.include_router(metrics_router.router)
 
+# Refuses oversized uploads before the multipart body is parsed. Innermost,
+# so 413s still carry CORS headers and show up in the access log.
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits=[
+        (r"^/api/recipes/recipe/\d+/image/$", settings.RECIPE_IMAGE_MAX_BYTES),
+        (r"^/api/user/profile/photo/$", settings.PROFILE_PHOTO_MAX_BYTES),
+    ],
+)
+
+# Compresses API responses; /media serves its own precompressed siblings
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    content_types=settings.COMPRESSION_TYPES,
+    exclude_prefixes=("/media",),
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -46,21 +86,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_ms=settings.ACCESS_LOG_SLOW_MS,
+    error_status=settings.ACCESS_LOG_ERROR_STATUS,
+    burst_window=settings.ACCESS_LOG_BURST_WINDOW_SECONDS,
+)
 
 
+# One hook per subsystem, so app.cli.startup_report can time each of them
 @app.on_event("startup")
-async def startup():
-    redis_client = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        db=0,
-        decode_responses=False,
+async def start_redis():
+    init_redis()
+    # fastapi-cache stores raw bytes, so it gets the binary client
+    FastAPICache.init(
+        RedisBackend(get_redis_client(decode_responses=False)), prefix="cache"
     )
-    FastAPICache.init(RedisBackend(redis_client), prefix="cache")
-    # Mount SQLAdmin
-    setup_admin(app)
+
+
+@app.on_event("startup")
+async def start_user_cache_invalidation():
+    await start_invalidation_listener()
+
+
+@app.on_event("startup")
+async def load_email_templates():
+    # Compile email templates and read the logo once, not per message
+    load_email_assets()
+
+
+@app.on_event("startup")
+async def start_email_outbox():
+    await start_outbox_worker()
 
 
 @app.on_event("startup")
@@ -71,3 +129,10 @@ async def _on_startup():
 @app.on_event("shutdown")
 async def _on_shutdown():
     logging.getLogger(__name__).info("Application shutdown")
+    await stop_invalidation_listener()
+    await stop_outbox_worker()
+    shutdown_image_pool()
+    await close_storage()
+    await close_redis()
+    # Drain queued log records before the worker exits
+    shutdown_logging()
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+
+class ImageVariants(BaseModel):
+    # Dimensions of the original upload
+    width: int
+    height: int
+    # Format -> "url 320w, url 640w, ..." ready for <source srcset>
+    srcset: dict[str, str] = {}
+    variants: list[ImageVariant] = []
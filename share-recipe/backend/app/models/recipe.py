@@ -3,6 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from app.models.media import ImageVariants
+
 
 class RecipeCreate(BaseModel):
     title: str
@@ -35,6 +37,8 @@ class RecipeResponse(BaseModel):
     description: Optional[str]
     instructions: Optional[str]
     image_url: Optional[str] = None
+    # Resized copies for srcset; None until processed (or for non-images)
+    image_variants: Optional[ImageVariants] = None
     is_published: bool = True
     created_at: datetime
     # Social fields
@@ -52,6 +56,11 @@ class RecipeResponse(BaseModel):
         from_attributes = True
 
 
+def recipe_responses(rows: list[dict]) -> list[RecipeResponse]:
+    # Rows from app.db.dao.recipe are already in this shape: skip validation
+    return [RecipeResponse.model_construct(**row) for row in rows]
+
+
 class CommentCreate(BaseModel):
     content: str
 
@@ -4,6 +4,7 @@ from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
+from app.models.media import ImageVariants
 from app.models.recipe import RecipeResponse  # added import
 
 
@@ -76,6 +77,7 @@ class UserProfile(BaseModel):
     joined: datetime | None = None
     is_active: bool | None = None
     photo_url: str | None = None
+    photo_variants: ImageVariants | None = None
     bio: str | None = None
 
     class Config:
@@ -88,7 +90,12 @@ class UserPublicProfile(BaseModel):
     last_name: str | None = None
     joined: datetime | None = None
     photo_url: str | None = None
+    photo_variants: ImageVariants | None = None
     bio: str | None = None
+    # Header stats (precomputed on users): published recipes, likes received
+    recipes_count: int = 0
+    likes_received: int = 0
+    # One page of published recipes (limit/offset); recipes_count is the total
     recipes: list[RecipeResponse] = []
     saved_recipes: list[RecipeResponse] = []
 
@@ -1,20 +1,53 @@
+import hashlib
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.config import settings
-from app.db.dao.dao import UserDAO
+from app.core.cache import TTLCache
+from app.db.session import get_async_session
+from app.services.user_cache import load_user
 
 oauth2_scheme = HTTPBearer()
 # Optional bearer that does not raise when header is missing
 oauth2_scheme_optional = HTTPBearer(auto_error=False)
 
+# Verified claims keyed by token digest; entries never outlive the token's `exp`
+_token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_MAX_ENTRIES, ttl=settings.JWT_CACHE_TTL_SECONDS
+)
+
+
+def decode_token(token: str) -> dict:
+    """Verify a JWT and return its claims, reusing recent verifications."""
+    leeway = settings.JWT_LEEWAY_SECONDS
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _token_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"leeway": leeway},
+        )
+        exp = claims.get("exp")
+        ttl = None if exp is None else int(exp) + leeway - time.time()
+        _token_cache.set(key, claims, ttl=ttl)
+    elif claims.get("exp") is not None and int(claims["exp"]) + leeway < time.time():
+        # Wall clock moved past exp while the entry was cached
+        _token_cache.pop(key)
+        raise JWTError("Signature has expired.")
+    return dict(claims)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session),
 ):
     if credentials is None:
         raise HTTPException(
@@ -22,9 +55,7 @@ async def get_current_user(
         )
     token = credentials.credentials
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token format"
@@ -32,7 +63,7 @@ async def get_current_user(
 
     expire = payload.get("exp")
     now_ts = int(datetime.now(tz=timezone.utc).timestamp())
-    if (not expire) or (int(expire) < now_ts):
+    if (not expire) or (int(expire) + settings.JWT_LEEWAY_SECONDS < now_ts):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
         )
@@ -55,7 +86,7 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    user = await UserDAO.get_by_id(user_id)
+    user = await load_user(user_id, session)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
@@ -68,14 +99,13 @@ async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         oauth2_scheme_optional
     ),
+    session: AsyncSession = Depends(get_async_session),
 ):
     if not credentials:
         return None
     token = credentials.credentials
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         sub = payload.get("sub")
         if sub is None:
             return None
@@ -83,7 +113,7 @@ async def get_optional_user(
             user_id = int(sub)
         except (TypeError, ValueError):
             return None
-        user = await UserDAO.get_by_id(user_id)
+        user = await load_user(user_id, session)
         return user
     except JWTError:
         return None
@@ -91,9 +121,7 @@ async def get_optional_user(
 
 def verify_refresh_token(refresh_token: str) -> int | None:
     try:
-        payload = jwt.decode(
-            refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(refresh_token)
         user_id = payload.get("sub")
         if user_id is not None:
             try:
@@ -114,9 +142,7 @@ async def get_email_verified(
         return None
     token = credentials.credentials
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         if payload.get("type") != "email":
             return None
         return payload.get("sub")  # email
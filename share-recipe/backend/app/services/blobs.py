@@ -0,0 +1,264 @@
+import asyncio
+import mimetypes
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.storage import MEDIA_DIR, MEDIA_URL, get_storage
+from app.db.dao.media import (
+    delete_unreferenced_blobs,
+    find_unreferenced_blobs,
+    referenced_media_urls,
+    register_blob,
+)
+from app.utils.images import normalise_upload
+from app.utils.uploads import (
+    discard_upload,
+    promote_upload,
+    rehash_upload,
+    spool_upload,
+)
+
+# Local working area; with MEDIA_STORAGE=local it is also where blobs live.
+# Uploads are spooled (and hashed) under BLOBS_DIR before the storage sees them.
+BLOBS_DIR = os.path.join(MEDIA_DIR, "blobs")
+# Per-upload file names used before content addressing; only ever cleaned up
+LEGACY_DIRS = ("recipe_photos", "profile_photos")
+
+_IMAGE_EXTENSIONS = {".jpg", ".png", ".webp", ".gif", ".avif", ".heic"}
+
+
+@dataclass
+class StoredUpload:
+    digest: str
+    url: str
+    path: str
+    size: int
+    created: bool
+
+
+def blob_key(digest: str, ext: str) -> str:
+    # Two levels of sharding keep directories small: blobs/ab/cd/abcd...<ext>
+    return f"blobs/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def blob_url(digest: str, ext: str) -> str:
+    return get_storage().url(blob_key(digest, ext))
+
+
+def media_path(url: str) -> Optional[str]:
+    """
+    Local file of a media url: the object itself with local storage, the
+    working copy (used to build variants before publishing) otherwise.
+    None for urls the storage does not own.
+    """
+    storage = get_storage()
+    key = storage.key_for_url(url)
+    if key is None:
+        return None
+    if storage.is_local:
+        return storage.path(key)
+    path = os.path.abspath(os.path.join(MEDIA_DIR, key))
+    if not path.startswith(MEDIA_DIR + os.sep):
+        return None
+    return path
+
+
+def absolute_media_url(base_url: str, url: str) -> str:
+    """Local media urls are relative (/media/...); remote ones already absolute."""
+    if url.startswith(("http://", "https://")):
+        return url
+    return f"{base_url.rstrip('/')}{url}"
+
+
+def _extension(file: UploadFile) -> str:
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext == ".jpeg":
+        ext = ".jpg"
+    if ext in _IMAGE_EXTENSIONS:
+        return ext
+    guessed = mimetypes.guess_extension(file.content_type or "") or ""
+    return ".jpg" if guessed in (".jpe", ".jpeg") else guessed
+
+
+async def store_upload(
+    file: UploadFile, session: AsyncSession, max_bytes: int
+) -> StoredUpload:
+    """
+    Store an upload by content (sha256 of its bytes) under blobs/:
+    - JPEG/PNG are stripped of EXIF and turned upright first, so the digest
+      is that of the bytes served; a published blob is never rewritten
+    - Identical uploads share one object and one media_blobs row
+    - Raises UploadTooLarge (nothing is kept) when over `max_bytes`
+    - Remote storage gets the bytes now; `path` is a local working copy for
+      the variant builder, removed by publish_processed()
+    Old objects are never deleted here; app.cli.media_gc reclaims unreferenced
+    blobs.
+    """
+    tmp_path, digest, size = await spool_upload(file, BLOBS_DIR, max_bytes)
+    storage = get_storage()
+    try:
+        if await normalise_upload(tmp_path):
+            digest, size = await rehash_upload(tmp_path)
+        # Registered first, so GC's grace period covers the file from now on
+        url = await register_blob(
+            session, digest, blob_url(digest, _extension(file)), size, file.content_type
+        )
+        path = media_path(url)
+        created = True
+        if not storage.is_local:
+            key = storage.key_for_url(url)
+            created = not await storage.exists(key)
+            if created:
+                await storage.put(key, tmp_path, file.content_type)
+    except BaseException:
+        discard_upload(tmp_path)
+        raise
+    promoted = await promote_upload(tmp_path, path)
+    if storage.is_local:
+        created = promoted
+    return StoredUpload(digest=digest, url=url, path=path, size=size, created=created)
+
+
+async def publish_processed(path: str, url: str, variants: Optional[dict]) -> None:
+    """
+    Copy the variants of an upload from the local working area to remote
+    storage, then drop the local files (the working copy of the original too,
+    which store_upload() already published as is).
+    Nothing to do with local storage: the files already are the objects.
+    """
+    storage = get_storage()
+    if storage.is_local:
+        return
+    files = []
+    for variant in (variants or {}).get("variants", []):
+        name = variant["url"].rsplit("/", 1)[-1]
+        files.append((os.path.join(os.path.dirname(path), name), variant["url"]))
+    try:
+        if variants is not None:
+            await asyncio.gather(
+                *(
+                    storage.put(
+                        storage.key_for_url(file_url),
+                        file_path,
+                        mimetypes.guess_type(file_path)[0],
+                    )
+                    for file_path, file_url in files
+                )
+            )
+    finally:
+        discard_upload(path)
+        for file_path, _ in files:
+            discard_upload(file_path)
+
+
+async def _remove_blob_objects(url: str, digest: str) -> int:
+    """Delete a blob and its derivatives (<digest>-<w>w.<ext>, <digest>.webp); count."""
+    storage = get_storage()
+    key = storage.key_for_url(url)
+    if key is None:
+        return 0
+    keys = await storage.list(key.rsplit("/", 1)[0] + f"/{digest}")
+    for name in keys:
+        await storage.delete(name)
+    return len(keys)
+
+
+async def collect_blobs(
+    session: AsyncSession,
+    grace: timedelta,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    pause: float = 0.0,
+) -> dict:
+    """
+    Delete media_blobs rows (and objects) no recipe or user points at, in batches.
+    Blobs uploaded within `grace` are kept, so an upload whose row is not yet
+    updated is never collected. With dry_run only the report is produced.
+    "bytes" counts the original uploads (derivatives are not sized).
+    """
+    cutoff = datetime.now(timezone.utc) - grace
+    report = {"candidates": 0, "deleted": 0, "files": 0, "bytes": 0}
+    after = None
+    while True:
+        batch = await find_unreferenced_blobs(session, cutoff, batch_size, after)
+        if not batch:
+            break
+        after = str(batch[-1].digest)
+        report["candidates"] += len(batch)
+        if dry_run:
+            report["bytes"] += sum(int(b.size) for b in batch)
+            continue
+        deleted = await delete_unreferenced_blobs(
+            session, [str(b.digest) for b in batch], cutoff
+        )
+        report["deleted"] += len(deleted)
+        sizes = {str(b.digest): int(b.size) for b in batch}
+        for digest, url in deleted:
+            report["files"] += await _remove_blob_objects(url, digest)
+            report["bytes"] += sizes.get(digest, 0)
+        if pause:
+            await asyncio.sleep(pause)
+    report["stale_uploads"] = await asyncio.to_thread(
+        _remove_stale_spools, cutoff.timestamp(), dry_run
+    )
+    return report
+
+
+def _remove_stale_spools(cutoff: float, dry_run: bool) -> int:
+    # Temp files left behind by uploads interrupted mid-stream
+    count = 0
+    if not os.path.isdir(BLOBS_DIR):
+        return 0
+    for entry in os.scandir(BLOBS_DIR):
+        if entry.name.startswith(".upload-") and entry.stat().st_mtime < cutoff:
+            count += 1
+            if not dry_run:
+                discard_upload(entry.path)
+    return count
+
+
+_VARIANT_SUFFIX = re.compile(r"-\d+w$")
+
+
+async def collect_legacy(
+    session: AsyncSession, grace: timedelta, dry_run: bool = False
+) -> dict:
+    """
+    Delete files in the pre-blob upload folders (recipe_photos/, profile_photos/)
+    that no row references any more, together with their derivatives.
+    """
+    cutoff = time.time() - grace.total_seconds()
+    report = {"candidates": 0, "deleted": 0, "files": 0, "bytes": 0}
+    for folder in LEGACY_DIRS:
+        directory = os.path.join(MEDIA_DIR, folder)
+        if not os.path.isdir(directory):
+            continue
+        prefix = f"{MEDIA_URL}{folder}/"
+        referenced = {
+            os.path.splitext(url[len(prefix) :])[0]
+            for url in await referenced_media_urls(session, prefix)
+        }
+        for entry in os.scandir(directory):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            stem = _VARIANT_SUFFIX.sub("", os.path.splitext(entry.name)[0])
+            if stem in referenced or entry.stat().st_mtime > cutoff:
+                continue
+            report["candidates"] += 1
+            report["bytes"] += entry.stat().st_size
+            if dry_run:
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            report["deleted"] += 1
+            report["files"] += 1
+    return report
@@ -0,0 +1,42 @@
+from sqlalchemy import update
+
+import app.db.session as db_session
+from app.db.database import User
+from app.db.recipes import Recipe
+from app.services.blobs import publish_processed
+from app.services.user_cache import invalidate_user
+from app.utils.images import build_variants
+
+
+# Both run as background tasks after the upload response was sent. The row is
+# only updated if it still points at the processed image (a newer upload wins).
+# With remote storage the variants are published before the row mentions them.
+async def process_recipe_image(recipe_id: int, path: str, url: str) -> None:
+    variants = await build_variants(path, url)
+    await publish_processed(path, url, variants)
+    if variants is None:
+        return
+    async with db_session.async_session_maker() as session:
+        await session.execute(
+            update(Recipe)
+            .where(Recipe.id == recipe_id, Recipe.image_url == url)
+            .values(image_variants=variants)
+        )
+        await session.commit()
+
+
+async def process_profile_photo(user_id: int, path: str, url: str) -> None:
+    variants = await build_variants(path, url)
+    await publish_processed(path, url, variants)
+    if variants is None:
+        return
+    async with db_session.async_session_maker() as session:
+        result = await session.execute(
+            update(User)
+            .where(User.id == user_id, User.photo_url == url)
+            .values(photo_variants=variants)
+        )
+        await session.commit()
+    # Core UPDATE skips the ORM events that normally invalidate the principal
+    if result.rowcount:
+        invalidate_user(user_id)
@@ -0,0 +1,47 @@
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.config.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rendered anonymous public-profile pages, shared by all workers. Entries are
+# not invalidated on writes: PUBLIC_PROFILE_CACHE_SECONDS bounds staleness.
+KEY_PREFIX = "public-profile:"
+
+
+def _key(username: str, limit: int, offset: int) -> str:
+    return f"{KEY_PREFIX}{username}:{limit}:{offset}"
+
+
+async def get_cached_profile(
+    r: redis.Redis, username: str, limit: int, offset: int
+) -> Optional[str]:
+    if settings.PUBLIC_PROFILE_CACHE_SECONDS <= 0:
+        return None
+    try:
+        body = await r.get(_key(username, limit, offset))
+    except Exception:
+        # Redis down: serve from the database instead of failing the page
+        logger.warning("Public profile cache read failed", exc_info=True)
+        return None
+    metrics.incr("public_profile.cache_hit" if body else "public_profile.cache_miss")
+    return body
+
+
+async def cache_profile(
+    r: redis.Redis, username: str, limit: int, offset: int, body: bytes
+) -> None:
+    if settings.PUBLIC_PROFILE_CACHE_SECONDS <= 0:
+        return
+    try:
+        await r.set(
+            _key(username, limit, offset),
+            body,
+            ex=settings.PUBLIC_PROFILE_CACHE_SECONDS,
+        )
+    except Exception:
+        logger.warning("Public profile cache write failed", exc_info=True)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from typing import Optional
+
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.config.config import settings
+from app.core.cache import TTLCache
+from app.core.redis import get_redis_client
+from app.db.dao.dao import UserDAO
+from app.db.database import User
+
+logger = logging.getLogger(__name__)
+
+# Authenticated-user principals keyed by user id. Values are plain column
+# snapshots, so each request gets its own (detached) User instance.
+_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Cross-worker invalidation over Redis pub/sub
+INVALIDATION_CHANNEL = "user-cache:invalidate"
+_origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_redis: Optional[redis.Redis] = None
+_listener_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[int] = None
+
+# Read from the table so importing this module does not configure mappers early
+_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+def _snapshot(user: User) -> dict:
+    return {key: getattr(user, key) for key in _COLUMNS}
+
+
+def _principal(snapshot: dict) -> User:
+    # Rebuild a detached instance: can be session.add()-ed by routes that update it
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+async def load_user(user_id: int, session: AsyncSession) -> Optional[User]:
+    """
+    Return the user for an authenticated request, using the route's session
+    on a miss.
+    """
+    snapshot = _cache.get(user_id)
+    if snapshot is not None:
+        return _principal(snapshot)
+    user = await UserDAO.get_by_id(user_id, session)
+    if user is not None:
+        _cache.set(user_id, _snapshot(user))
+    return user
+
+
+def invalidate_user(user_id: int, broadcast: bool = True) -> None:
+    """Drop a cached principal locally and (optionally) in every other worker."""
+    _cache.pop(user_id)
+    if broadcast and _redis is not None and _loop is not None:
+        coro = _publish(user_id)
+        if threading.get_ident() == _loop_thread:
+            _loop.create_task(coro)
+        else:
+            # e.g. SQLAdmin edits run in a worker thread
+            asyncio.run_coroutine_threadsafe(coro, _loop)
+
+
+async def _publish(user_id: int) -> None:
+    try:
+        await _redis.publish(INVALIDATION_CHANNEL, f"{_origin}:{user_id}")
+    except Exception:
+        # TTL still bounds staleness in other workers
+        logger.warning("User cache invalidation publish failed for %s", user_id)
+
+
+async def _listen() -> None:
+    delay = 1.0
+    while True:
+        try:
+            # Closing the PubSub returns its connection to the bounded pool
+            async with _redis.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    origin, _, raw_id = str(message["data"]).rpartition(":")
+                    if origin == _origin:
+                        continue
+                    try:
+                        _cache.pop(int(raw_id))
+                    except ValueError:
+                        continue
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Redis unavailable: entries we might miss still expire by TTL
+            logger.warning("User cache invalidation listener disconnected")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+async def start_invalidation_listener() -> None:
+    global _redis, _listener_task, _loop, _loop_thread
+    if _listener_task is not None or not _cache.enabled:
+        return
+    # The subscription holds one connection from the shared pool
+    _redis = get_redis_client()
+    _loop = asyncio.get_running_loop()
+    _loop_thread = threading.get_ident()
+    _listener_task = _loop.create_task(_listen())
+
+
+async def stop_invalidation_listener() -> None:
+    global _redis, _listener_task, _loop, _loop_thread
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except (asyncio.CancelledError, Exception):
+            pass
+    # The shared client itself is closed by app.core.redis.close_redis
+    _redis = _listener_task = _loop = _loop_thread = None
+
+
+def invalidate_on_commit(session: Session | AsyncSession, user_id: int) -> None:
+    """
+    Invalidate a cached principal once `session` commits (nothing on
+    rollback). For Core UPDATEs of users, which skip the ORM events below.
+    """
+    session.info.setdefault("_invalidate_users", set()).add(user_id)
+
+
+# Any ORM write to a user (profile edits, photo changes, admin deactivation)
+# invalidates the cached principal once the transaction commits.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_dirty(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        invalidate_on_commit(session, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session) -> None:
+    for user_id in session.info.pop("_invalidate_users", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop("_invalidate_users", None)
@@ -20,6 +20,7 @@ from app.db.base import Base
 # Import all models so metadata knows about tables
 from app.db.database import User  # noqa: F401
 from app.db.ingredients import Ingredient  # noqa: F401
+from app.db.media import MediaBlob  # noqa: F401
 from app.db.recipe_ingredients import RecipeIngredient  # noqa: F401
 from app.db.recipes import Recipe  # noqa: F401
 from app.db.session import get_async_session
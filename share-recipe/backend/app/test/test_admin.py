@@ -0,0 +1,99 @@
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+import pytest
+from sqlalchemy import UniqueConstraint, create_engine
+from sqlalchemy.orm import Session
+from starlette.applications import Starlette
+from starlette.datastructures import URL
+from starlette.requests import Request
+
+from app.admin import ADMIN_VIEWS, RecipeLikeAdmin, setup_admin
+from app.config.config import settings
+from app.db.base import Base
+from app.db.social import RecipeLike
+
+
+@pytest.fixture()
+def admin(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'admin.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add_all(RecipeLike(recipe_id=i % 4 + 1, user_id=i) for i in range(1, 31))
+        s.commit()
+    app = Starlette()
+    yield app, setup_admin(app, engine)
+    engine.dispose()
+
+
+def _request(url: str) -> Request:
+    parts = urlsplit(url)
+    scope = {"type": "http", "method": "GET", "path": parts.path, "headers": []}
+    return Request({**scope, "query_string": parts.query.encode()})
+
+
+async def _page(view, url: str):
+    pagination = await view.list(_request(url))
+    pagination.add_pagination_urls(URL(url))
+    return pagination
+
+
+async def test_likes_are_paged_by_key(admin):
+    _, sqladmin = admin
+    view = next(v for v in sqladmin.views if isinstance(v, RecipeLikeAdmin))
+    base = "/admin/recipe-like/list?" + urlencode({"pageSize": 10})
+    # Composite key (recipe_id, user_id), newest (highest) first
+    keys = sorted(((i % 4 + 1, i) for i in range(1, 31)), reverse=True)
+
+    def page_keys(pagination):
+        return [(r.recipe_id, r.user_id) for r in pagination.rows]
+
+    first = await _page(view, base)
+    assert page_keys(first) == keys[:10]
+    assert first.count == 30 and first.has_next and not first.has_previous
+
+    second = await _page(view, first.next_page.url)
+    assert page_keys(second) == keys[10:20]
+    third = await _page(view, second.next_page.url)
+    assert page_keys(third) == keys[20:]
+    assert not third.has_next
+
+    back = await _page(view, third.previous_page.url)
+    assert page_keys(back) == keys[10:20]
+    assert back.page == 2 and back.has_next
+
+    found = await _page(view, base + "&search=3")
+    assert sorted(r.user_id for r in found.rows) == [2, 3, 6, 10, 14, 18, 22, 26, 30]
+
+
+async def test_list_page_renders(admin):
+    app, _ = admin
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        await c.post(
+            "/admin/login",
+            data={
+                "username": settings.ADMIN_USERNAME,
+                "password": settings.ADMIN_PASSWORD,
+            },
+        )
+        first = await c.get("/admin/recipe-like/list")
+        assert first.status_code == 200
+        # Cursor of the 25th like, (recipe_id, user_id) = (1, 24)
+        assert "after=1%3B24" in first.text
+        second = await c.get("/admin/recipe-like/list?page=2&after=1%3B24")
+        assert second.status_code == 200
+        assert "of 30 items" in second.text
+
+
+def test_search_columns_are_indexed():
+    for view in ADMIN_VIEWS:
+        table = view.model.__table__
+        leading = {c.name for c in table.primary_key.columns[:1]}
+        for index in table.indexes:
+            leading.add(index.columns[0].name)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                leading.add(list(constraint.columns)[0].name)
+        for column in view.column_searchable_list:
+            assert column in leading, f"{view.__name__}.{column} is not indexed"
@@ -151,3 +151,113 @@ async def test_token_refresh_success(client, test_user):
     assert resp.status_code == 200
     data = resp.json()
     assert "access" in data and isinstance(data["access"], str)
+
+
+async def test_decode_token_caches_verified_claims(test_user):
+    from jose import JWTError
+
+    from app.services import auth
+    from app.utils.security import create_access_token
+
+    auth._token_cache.clear()
+    token = create_access_token(test_user.id)
+    claims = auth.decode_token(token)
+    assert claims["sub"] == str(test_user.id)
+    assert len(auth._token_cache) == 1
+    # Mutating the returned claims must not leak into the cache
+    claims["sub"] = "0"
+    assert auth.decode_token(token)["sub"] == str(test_user.id)
+
+    # Tampered tokens are never served from cache
+    with pytest.raises(JWTError):
+        auth.decode_token(token[:-2] + "xx")
+
+
+async def test_decode_token_rejects_expired_cached_entry(test_user):
+    from jose import JWTError
+
+    from app.services import auth
+
+    auth._token_cache.clear()
+    payload = {
+        "sub": str(test_user.id),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    auth.decode_token(token)
+    # Simulate the wall clock passing exp while the entry is still cached
+    key = next(iter(auth._token_cache._data))
+    expires_at, claims = auth._token_cache._data[key]
+    claims["exp"] = int((datetime.now(timezone.utc) - timedelta(seconds=1)).timestamp())
+    with pytest.raises(JWTError):
+        auth.decode_token(token)
+    assert len(auth._token_cache) == 0
+
+
+async def test_signin_upgrades_weak_password_hash(client, session, test_user):
+    from passlib.hash import bcrypt
+
+    from app.utils.security import BCRYPT_ROUNDS, verify_password
+
+    # Simulate a hash created under an older, cheaper cost policy
+    test_user.hashed_password = bcrypt.using(rounds=4).hash("StrongP@ssw0rd")
+    session.add(test_user)
+    await session.commit()
+
+    resp = await client.post(
+        "/api/user/signin/",
+        json={"email": test_user.email, "password": "StrongP@ssw0rd"},
+    )
+    assert resp.status_code == 200
+
+    await session.refresh(test_user)
+    upgraded = test_user.hashed_password
+    assert f"${BCRYPT_ROUNDS:02d}$" in upgraded
+    assert verify_password("StrongP@ssw0rd", upgraded)
+
+
+async def test_password_hashing_runs_off_loop_with_metrics():
+    from app.core.metrics import metrics
+    from app.utils.security import hash_password_async, verify_password_async
+
+    hashed = await hash_password_async("StrongP@ssw0rd")
+    ok, upgraded = await verify_password_async("StrongP@ssw0rd", hashed)
+    assert ok is True and upgraded is None
+    ok, _ = await verify_password_async("wrong", hashed)
+    assert ok is False
+
+    timings = metrics.snapshot()["timings"]
+    assert timings["password_hash.run"]["count"] >= 3
+    assert metrics.snapshot()["gauges"]["password_hash.queued"] == 0
+
+
+async def test_verify_code_uses_shared_redis_dependency(client, app_with_overrides):
+    from app.core.redis import get_redis
+
+    class FakeRedis:
+        def __init__(self):
+            self.data = {"verify:new@example.com": "123456"}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def delete(self, key):
+            self.data.pop(key, None)
+
+    fake = FakeRedis()
+    app_with_overrides.dependency_overrides[get_redis] = lambda: fake
+    try:
+        bad = await client.post(
+            "/api/user/verify-code/",
+            json={"email": "new@example.com", "code": "000000"},
+        )
+        assert bad.status_code == 400
+        ok = await client.post(
+            "/api/user/verify-code/",
+            json={"email": "new@example.com", "code": "123456"},
+        )
+        assert ok.status_code == 200
+        assert "token" in ok.json()
+        assert "verify:new@example.com" not in fake.data
+    finally:
+        app_with_overrides.dependency_overrides.pop(get_redis, None)
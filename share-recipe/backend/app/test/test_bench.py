@@ -0,0 +1,33 @@
+import pytest
+
+from app.bench import bench_dao
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_bench_runs_every_case_on_seeded_sqlite():
+    args = bench_dao.parse_args(["--scale", "60", "--iterations", "5"])
+    report = await bench_dao.run(args)
+    assert report["database"] == "sqlite" and report["recipes"] == 60
+    cases = report["cases"]
+    for name in (
+        "list_recipes",
+        "get_recipe_by_id",
+        "_attach_social_fields",
+        "search_ingredients",
+        "add_like",
+        "get_current_user",
+        "jwt.decode",
+    ):
+        assert cases[name]["iterations"] >= 1, name
+    assert any(name.startswith("RecipeResponse") for name in cases)
+
+    # Against itself nothing regresses; a 2x slower case does
+    assert bench_dao.regressions(report, report, 0.25, 5.0) == []
+    slower = {
+        "cases": {
+            name: {**r, "p50_us": r["p50_us"] * 2 + 10} for name, r in cases.items()
+        }
+    }
+    assert bench_dao.regressions(report, slower, 0.25, 5.0) == list(cases)
+    assert "REGRESSED" in bench_dao.compare(report, slower, list(cases))
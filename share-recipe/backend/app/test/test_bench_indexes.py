@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine, text
+
+from app.bench import bench_indexes
+from app.cli import seed
+
+
+def test_reports_sizes_and_leaves_tables_unchanged(tmp_path):
+    path = tmp_path / "seed.db"
+    seed.run(seed.parse_args(["--sqlite", str(path), "--scale", "200"]))
+    args = bench_indexes.parse_args(["--sqlite", str(path), "--rows", "300"])
+    report = bench_indexes.run(args)
+
+    likes = report["tables"]["recipe_likes"]
+    assert likes["insert_rows"] == 300 and likes["inserts_per_s"] > 0
+    # The composite key and the one user-side index
+    assert "ix_recipe_likes_user_recipe" in likes["indexes"]
+    assert len(likes["indexes"]) == 2 and likes["index_bytes"] > 0
+    # Inserts are rolled back
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT count(*) FROM recipe_likes")).scalar()
+    engine.dispose()
+    assert count == likes["rows"]
+
+    assert "-ix_" not in bench_indexes.compare(report, report)
@@ -0,0 +1,97 @@
+import hashlib
+import io
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import UploadFile
+from PIL import ExifTags, Image
+from sqlalchemy import select, update
+from starlette.datastructures import Headers
+
+from app.core import storage
+from app.db.media import MediaBlob
+from app.db.recipes import Recipe
+from app.services import blobs
+from app.utils.images import shutdown_image_pool
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture()
+def media_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(blobs, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(blobs, "BLOBS_DIR", str(tmp_path / "blobs"))
+    monkeypatch.setattr(storage, "_storage", storage.LocalStorage(str(tmp_path)))
+    return tmp_path
+
+
+def _upload(data: bytes, filename: str = "photo.jpeg") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(data),
+        filename=filename,
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+async def _age_blobs(session, hours: int = 48) -> None:
+    old = datetime.now(timezone.utc) - timedelta(hours=hours)
+    await session.execute(update(MediaBlob).values(last_uploaded_at=old))
+    await session.commit()
+
+
+async def test_identical_uploads_share_one_blob(session, media_dir):
+    first = await blobs.store_upload(_upload(b"same bytes"), session, 1024)
+    second = await blobs.store_upload(_upload(b"same bytes", "x.png"), session, 1024)
+
+    assert first.url == second.url
+    assert first.url.startswith(f"/media/blobs/{first.digest[:2]}/")
+    assert first.url.endswith(".jpg")
+    assert (first.created, second.created) == (True, False)
+    assert open(first.path, "rb").read() == b"same bytes"
+    rows = (await session.execute(select(MediaBlob))).scalars().all()
+    assert len(rows) == 1
+
+
+async def test_upload_is_stripped_before_it_is_addressed(session, media_dir):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "TestCam"
+    exif[ExifTags.Base.Orientation] = 6
+    raw = io.BytesIO()
+    Image.new("RGB", (80, 40), (200, 80, 40)).save(raw, "JPEG", exif=exif)
+
+    try:
+        stored = await blobs.store_upload(_upload(raw.getvalue()), session, 2**20)
+    finally:
+        shutdown_image_pool()
+
+    data = open(stored.path, "rb").read()
+    # Named after the bytes it serves, which are upright and carry no EXIF
+    assert stored.digest == hashlib.sha256(data).hexdigest()
+    assert stored.size == len(data)
+    with Image.open(stored.path) as img:
+        assert img.size == (40, 80) and not img.getexif()
+
+
+async def test_gc_removes_only_unreferenced_blobs(session, media_dir, test_user):
+    kept = await blobs.store_upload(_upload(b"kept"), session, 1024)
+    orphan = await blobs.store_upload(_upload(b"orphan"), session, 1024)
+    fresh = await blobs.store_upload(_upload(b"fresh"), session, 1024)
+    session.add(Recipe(title="Soup", user_id=test_user.id, image_url=kept.url))
+    await session.commit()
+    # A derivative of the orphan goes with it
+    variant = orphan.path.replace(".jpg", "-320w.webp")
+    open(variant, "wb").write(b"v")
+    await _age_blobs(session)
+    await blobs.store_upload(_upload(b"fresh"), session, 1024)  # re-upload
+
+    report = await blobs.collect_blobs(session, timedelta(hours=24), dry_run=True)
+    assert (report["candidates"], report["deleted"]) == (1, 0)
+
+    report = await blobs.collect_blobs(session, timedelta(hours=24), batch_size=1)
+    assert (report["deleted"], report["files"]) == (1, 2)
+    digests = set((await session.execute(select(MediaBlob.digest))).scalars())
+    assert digests == {kept.digest, fresh.digest}
+    assert not os.path.exists(orphan.path)
+    assert not os.path.exists(variant)
+    assert os.path.exists(kept.path)
@@ -0,0 +1,90 @@
+import gzip
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import metrics
+
+pytestmark = pytest.mark.asyncio
+
+FEED = [{"title": f"Recipe {i}", "instructions": "Stir well. " * 40} for i in range(20)]
+
+
+async def feed(request):
+    return JSONResponse(FEED, headers={"etag": '"feed-1"'})
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def photo(request):
+    return Response(b"\xff\xd8" + b"x" * 5000, media_type="image/jpeg")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(5):
+            yield b"line of text\n" * 100
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+@pytest.fixture()
+async def gz_client(monkeypatch):
+    # Exercise the gzip path even where Brotli is installed
+    monkeypatch.setattr(compression, "brotli", None)
+    app = Starlette(
+        routes=[
+            Route("/feed", feed),
+            Route("/small", small),
+            Route("/photo", photo),
+            Route("/stream", stream),
+            Route("/media/feed", feed),
+        ]
+    )
+    transport = httpx.ASGITransport(app=CompressionMiddleware(app, minimum_size=500))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def _raw_get(client, url, **headers):
+    # Read the bytes as sent, without httpx decoding them
+    async with client.stream("GET", url, headers=headers) as resp:
+        return resp, b"".join([c async for c in resp.aiter_raw()])
+
+
+async def test_json_is_gzipped_with_metrics(gz_client):
+    metrics.reset()
+    resp, raw = await _raw_get(gz_client, "/feed", **{"accept-encoding": "gzip, br"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.headers["etag"] == 'W/"feed-1"'
+    assert int(resp.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw) == JSONResponse(FEED).body
+    counters = metrics.snapshot()["counters"]
+    assert counters["compression.gzip.responses"] == 1
+    assert counters["compression.bytes_out"] == len(raw)
+    assert counters["compression.bytes_in"] > 5 * len(raw)
+
+
+async def test_skipped_responses(gz_client):
+    for url in ("/small", "/photo", "/media/feed"):
+        resp, _ = await _raw_get(gz_client, url, **{"accept-encoding": "gzip"})
+        assert "content-encoding" not in resp.headers, url
+    resp, _ = await _raw_get(gz_client, "/feed", **{"accept-encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["vary"] == "Accept-Encoding"
+
+
+async def test_streaming_response_is_compressed(gz_client):
+    resp, raw = await _raw_get(gz_client, "/stream", **{"accept-encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert gzip.decompress(raw) == b"line of text\n" * 500
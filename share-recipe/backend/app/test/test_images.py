@@ -0,0 +1,87 @@
+import pytest
+from PIL import ExifTags, Image
+
+from app.utils.images import render_variants, shutdown_image_pool
+
+pytestmark = pytest.mark.asyncio
+
+
+def _camera_jpeg(path, size=(2000, 1000), orientation=1):
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "TestCam"
+    exif[ExifTags.Base.Orientation] = orientation
+    Image.new("RGB", size, (200, 80, 40)).save(path, "JPEG", exif=exif)
+
+
+async def test_variants_are_resized_and_stripped(tmp_path):
+    src = tmp_path / "photo.jpg"
+    _camera_jpeg(src)
+
+    result = render_variants(str(src), (320, 640, 1280, 4000), ("webp", "jpeg"), 80)
+
+    assert (result["width"], result["height"]) == (2000, 1000)
+    widths = sorted({v["width"] for v in result["variants"]})
+    # Wider-than-source widths collapse to the source width
+    assert widths == [320, 640, 1280, 2000]
+    for v in result["variants"]:
+        with Image.open(v["path"]) as img:
+            assert img.size == (v["width"], v["height"])
+            assert not img.getexif()
+    # The source may already be published: it is never rewritten
+    with Image.open(src) as img:
+        assert img.getexif()[ExifTags.Base.Make] == "TestCam"
+
+
+async def test_full_size_alternates_next_to_the_source(tmp_path):
+    src = tmp_path / "photo.jpg"
+    _camera_jpeg(src)
+
+    result = render_variants(str(src), (320,), ("webp", "jpeg"), 80, True)
+
+    assert result["alternates"] == [str(tmp_path / "photo.webp")]
+    with Image.open(tmp_path / "photo.webp") as img:
+        assert img.size == (2000, 1000)
+        assert not img.getexif()
+    assert (tmp_path / "photo.webp").stat().st_size < src.stat().st_size
+    # Off by default (remote storage): only the sized variants
+    other = tmp_path / "other.jpg"
+    _camera_jpeg(other)
+    assert render_variants(str(other), (320,), ("webp",), 80)["alternates"] == []
+    assert not (tmp_path / "other.webp").exists()
+
+
+async def test_exif_orientation_applied(tmp_path):
+    src = tmp_path / "rotated.jpg"
+    # Orientation 6: stored landscape, displayed rotated 90 degrees (portrait)
+    _camera_jpeg(src, size=(800, 400), orientation=6)
+
+    result = render_variants(str(src), (320,), ("jpeg",), 80)
+
+    assert (result["width"], result["height"]) == (400, 800)
+    assert result["variants"][0]["height"] == 640
+
+
+async def test_recipe_exposes_variants_after_processing(auth_client, client, tmp_path):
+    from app.services.media import process_recipe_image
+
+    created = await auth_client.post(
+        "/api/recipes/create/",
+        json={"title": "Pie", "image_url": "/media/recipe_photos/pie.jpg"},
+    )
+    rid = created.json()["id"]
+    src = tmp_path / "pie.jpg"
+    _camera_jpeg(src, size=(1000, 500))
+
+    try:
+        await process_recipe_image(rid, str(src), "/media/recipe_photos/pie.jpg")
+    finally:
+        shutdown_image_pool()
+
+    data = (await client.get(f"/api/recipes/recipe/{rid}/")).json()
+    variants = data["image_variants"]
+    assert (variants["width"], variants["height"]) == (1000, 500)
+    assert variants["srcset"]["webp"] == (
+        "/media/recipe_photos/pie-320w.webp 320w, "
+        "/media/recipe_photos/pie-640w.webp 640w, "
+        "/media/recipe_photos/pie-1000w.webp 1000w"
+    )
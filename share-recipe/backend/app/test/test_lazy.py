@@ -0,0 +1,34 @@
+import sys
+import types
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.lazy import LazyApp
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_lazy_app_is_built_on_first_request(monkeypatch):
+    built = []
+
+    def create():
+        built.append(True)
+        return Starlette(routes=[Route("/", lambda r: PlainTextResponse("admin"))])
+
+    monkeypatch.setitem(
+        sys.modules, "lazy_fixture", types.SimpleNamespace(create=create)
+    )
+    lazy = LazyApp("lazy_fixture:create")
+    app = Starlette()
+    app.mount("/admin", lazy, name="admin")
+    assert not lazy.loaded and built == []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        assert (await c.get("/admin/")).text == "admin"
+        assert (await c.get("/admin/")).text == "admin"
+    assert lazy.loaded and built == [True]
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+from app.cli import loadtest, seed
+from app.config.config import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_mixed_scenarios_report_per_route(
+    app_with_overrides, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "POSTS_DAILY_LIMIT", 1000)
+    # Seeded into the test database; users sign in with the default
+    # --email template and --password
+    seed_args = ["--sqlite", str(tmp_path / "test.db"), "--scale", "40", "--users", "8"]
+    seed.run(seed.parse_args(seed_args))
+    args = loadtest.parse_args(
+        [
+            "--base-url=http://test",
+            "--users=4",
+            "--duration=1",
+            "--warmup=0",
+            "--ramp=0",
+            "--accounts=1-8",
+        ]
+    )
+    args.mix = loadtest.parse_mix("browser,liker,author,typist")
+
+    transport = httpx.ASGITransport(app=app_with_overrides)
+    report = await loadtest.run(args, transport=transport)
+
+    assert report["errors"] == 0 and report["failed_sign_ins"] == 0
+    assert set(report["iterations"]) == {"browser", "liker", "author", "typist"}
+    routes = report["routes"]
+    assert routes["GET /api/recipes/recipe/{id}/"]["requests"] > 0
+    assert routes["POST /api/recipes/create/"]["status"] == {
+        "200": routes["POST /api/recipes/create/"]["requests"]
+    }
+    feed = routes["GET /api/recipes/list/"]
+    assert feed["p50_ms"] <= feed["p95_ms"] <= feed["p99_ms"] <= feed["max_ms"]
+
+    slower = {**report, "routes": {k: dict(v) for k, v in routes.items()}}
+    slower["routes"]["GET /api/recipes/list/"]["p95_ms"] = feed["p95_ms"] * 2
+    table = loadtest.compare(report, slower)
+    assert f"{feed['p95_ms']} → {feed['p95_ms'] * 2} (+100%)" in table
+
+
+def test_mix_assignment_keeps_every_scenario():
+    mix = loadtest.parse_mix("browser=6,liker=2,author=1,typist=1")
+    assigned = loadtest._assign(mix, 5)
+    assert len(assigned) == 5 and assigned.count("browser") == 3
+    with pytest.raises(Exception):
+        loadtest.parse_mix("crawler=1")
@@ -0,0 +1,113 @@
+import json
+import logging
+import queue
+
+from app.core.logging import DroppingQueueHandler, JsonFormatter
+
+
+def _record(msg: str, *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    for k, v in extra.items():
+        setattr(record, k, v)
+    return record
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    q: queue.Queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(q)
+    for i in range(5):
+        handler.handle(_record("line %d", i))
+    assert q.qsize() == 2
+    assert handler.dropped == 3
+
+    # Once space frees up, the drop count is reported with the next record
+    q.get_nowait()
+    q.get_nowait()
+    handler.handle(_record("after"))
+    messages = [q.get_nowait().getMessage() for _ in range(q.qsize())]
+    assert messages == ["after", "Log queue full: dropped 3 records"]
+
+
+def test_json_formatter_emits_structured_fields():
+    record = _record(
+        "Completed %s", "/x", request_id="abc", route="/x", status=200, latency_ms=12
+    )
+    data = json.loads(JsonFormatter().format(record))
+    assert data["message"] == "Completed /x"
+    assert data["request_id"] == "abc"
+    assert data["route"] == "/x"
+    assert data["status"] == 200
+    assert data["latency_ms"] == 12
+    assert "method" not in data
+
+
+def test_burst_limiter_collapses_identical_lines():
+    from app.core.logging import BurstLimiter
+
+    limiter = BurstLimiter(window_seconds=60)
+    key = ("done", "GET", "/api/recipes/list/", 200)
+    assert limiter.allow(key) == (True, 0)
+    assert limiter.allow(key) == (False, 0)
+    assert limiter.allow(key) == (False, 0)
+    # Different key is independent
+    assert limiter.allow(("done", "GET", "/other", 200)) == (True, 0)
+
+    # Close the window: next line carries the suppressed count
+    limiter._state[key][0] -= 61
+    assert limiter.allow(key) == (True, 2)
+
+
+def test_burst_limiter_disabled_with_zero_window():
+    from app.core.logging import BurstLimiter
+
+    limiter = BurstLimiter(window_seconds=0)
+    assert all(limiter.allow(("k",)) == (True, 0) for _ in range(3))
+
+
+def test_burst_limiter_flushes_counts_no_line_carries():
+    from app.core.logging import BurstLimiter
+
+    limiter = BurstLimiter(window_seconds=60, max_keys=2)
+    quiet, busy = ("done", "GET", "/quiet", 200), ("done", "GET", "/busy", 200)
+    for key in (quiet, quiet, quiet, busy, busy):
+        limiter.allow(key)
+    assert limiter.flush() == []
+
+    # The quiet key's window closes with no repeat since
+    limiter._state[quiet][0] -= 61
+    assert limiter.flush() == [(quiet, 2)]
+    assert limiter.flush() == []
+
+    # Evicted over max_keys with a pending count
+    limiter.allow(("a",))
+    limiter.allow(("b",))
+    assert limiter.flush() == [(busy, 1)]
+
+
+async def test_error_and_slow_requests_are_never_collapsed(caplog):
+    import httpx
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    from app.core.logging import RequestLoggingMiddleware
+
+    app = FastAPI()
+
+    @app.get("/missing")
+    async def missing():
+        return PlainTextResponse("no", status_code=404)
+
+    @app.get("/ok")
+    async def ok():
+        return PlainTextResponse("ok")
+
+    app.add_middleware(RequestLoggingMiddleware, burst_window=60, slow_ms=10_000)
+    transport = httpx.ASGITransport(app=app)
+    caplog.set_level(logging.INFO, logger="app.request")
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        for path in ("/missing", "/missing", "/missing", "/ok", "/ok", "/ok"):
+            await c.get(path)
+
+    done = [r.getMessage() for r in caplog.records if r.msg.startswith("Completed")]
+    assert sum("/missing" in m for m in done) == 3
+    assert sum("/ok" in m for m in done) == 1
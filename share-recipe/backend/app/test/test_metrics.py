@@ -0,0 +1,38 @@
+import pytest
+
+from app.config.config import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_metrics_are_closed_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    resp = await client.get("/api/metrics/", headers={"X-Metrics-Token": ""})
+    assert resp.status_code == 404
+
+
+async def test_metrics_need_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert (await client.get("/api/metrics/")).status_code == 403
+    wrong = await client.get("/api/metrics/", headers={"X-Metrics-Token": "nope"})
+    assert wrong.status_code == 403
+    ok = await client.get("/api/metrics/", headers={"X-Metrics-Token": "s3cret"})
+    assert ok.status_code == 200
+    assert "counters" in ok.json()
+
+
+async def test_email_status_uses_the_same_guard(client, monkeypatch):
+    from app.utils import outbox
+
+    store = outbox.MemoryOutboxStore()
+    await store.set_status("m1", {"status": "failed", "error": "550 no such user"})
+    monkeypatch.setattr(outbox, "_store", store)
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert (await client.get("/api/metrics/email/m1")).status_code == 404
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert (await client.get("/api/metrics/email/m1")).status_code == 403
+    ok = await client.get(
+        "/api/metrics/email/m1", headers={"X-Metrics-Token": "s3cret"}
+    )
+    assert ok.json()["status"] == "failed"
@@ -0,0 +1,169 @@
+import asyncio
+import socketserver
+import threading
+
+import pytest
+
+from app.utils.outbox import MemoryOutboxStore, OutboxWorker
+from app.utils.smtp import SMTPSender
+
+pytestmark = pytest.mark.asyncio
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    # Just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server = self.server
+        server.connections += 1
+        self._reply("220 localhost stand-in")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            cmd = line.split(" ")[0].upper()
+            if cmd in ("EHLO", "HELO"):
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif cmd == "RCPT" and server.reject_next > 0:
+                server.reject_next -= 1
+                self._reply("451 try again later")
+            elif cmd == "DATA":
+                self._reply("354 go ahead")
+                body = []
+                while True:
+                    data = self.rfile.readline().decode()
+                    if data in (".\r\n", ""):
+                        break
+                    body.append(data)
+                server.messages.append("".join(body))
+                self._reply("250 queued")
+            elif cmd == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+@pytest.fixture()
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.messages = []
+    server.connections = 0
+    server.reject_next = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _worker(store, server, **kwargs) -> OutboxWorker:
+    sender = SMTPSender("127.0.0.1", server.server_address[1], starttls=False)
+    return OutboxWorker(store, sender, **kwargs)
+
+
+def _message(i: int) -> dict:
+    return {
+        "id": f"m{i}",
+        "to": f"user{i}@example.com",
+        "subject": "Your verification code",
+        "text": f"code {i}",
+        "html": None,
+        "attempts": 0,
+    }
+
+
+async def test_batch_is_sent_over_one_connection(smtp_server):
+    store = MemoryOutboxStore()
+    for i in range(5):
+        await store.push(_message(i))
+    worker = _worker(store, smtp_server, batch_size=10)
+
+    assert await worker.run_once() == 5
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert (await store.get_status("m0"))["status"] == "sent"
+    assert await store.depth() == {"pending": 0, "retry": 0, "dead": 0}
+    worker.sender.close()
+
+
+async def test_failed_delivery_is_retried_then_dead_lettered(smtp_server):
+    store = MemoryOutboxStore()
+    await store.push(_message(1))
+    worker = _worker(store, smtp_server, max_attempts=2, backoff_base=0)
+
+    smtp_server.reject_next = 1
+    await worker.run_once()
+    assert (await store.get_status("m1"))["status"] == "retrying"
+    # Backoff of 0s makes it due immediately; second attempt succeeds
+    await worker.run_once()
+    assert (await store.get_status("m1"))["status"] == "sent"
+
+    await store.push(_message(2))
+    smtp_server.reject_next = 2
+    await worker.run_once()
+    await worker.run_once()
+    status = await store.get_status("m2")
+    assert status["status"] == "failed" and status["attempts"] == "2"
+    assert (await store.depth())["dead"] == 1
+    worker.sender.close()
+
+
+async def test_unsettled_batch_is_requeued_on_cancel():
+    store = MemoryOutboxStore()
+    for i in range(3):
+        await store.push(_message(i))
+    started, release = threading.Event(), threading.Event()
+
+    class StuckSender:
+        def send(self, msg):
+            started.set()
+            release.wait(5)
+
+    worker = OutboxWorker(store, StuckSender(), batch_size=10)
+    task = asyncio.create_task(worker.run_once())
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    release.set()
+
+    # Back at the head of the queue, in order, with no attempt counted
+    batch = await store.pop_batch(10)
+    assert [m["id"] for m in batch] == ["m0", "m1", "m2"]
+    assert all(m["attempts"] == 0 for m in batch)
+
+
+async def test_templated_email_carries_inline_logo():
+    from app.utils.email_templates import LOGO_CID, get_logo, render_email
+    from app.utils.smtp import build_message
+
+    text, html = render_email("password_reset", code="<123456>", expires_minutes=5)
+    assert "<123456>" in text
+    # HTML templates are autoescaped
+    assert "&lt;123456&gt;" in html
+    assert "data:image" not in html
+
+    msg = build_message(
+        {
+            "to": "a@example.com",
+            "subject": "s",
+            "text": text,
+            "html": html,
+            "inline_logo": True,
+        }
+    )
+    if get_logo() is None:
+        pytest.skip("logo asset not available")
+    assert f"cid:{LOGO_CID}" in html
+    logo_parts = [p for p in msg.walk() if p["Content-ID"] == f"<{LOGO_CID}>"]
+    assert len(logo_parts) == 1
+    assert logo_parts[0].get_content_maintype() == "image"
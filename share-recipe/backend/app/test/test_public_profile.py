@@ -0,0 +1,70 @@
+import pytest
+
+from app.core.redis import get_redis
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+@pytest.fixture()
+def fake_redis(app_with_overrides):
+    fake = FakeRedis()
+    app_with_overrides.dependency_overrides[get_redis] = lambda: fake
+    yield fake
+    app_with_overrides.dependency_overrides.pop(get_redis, None)
+
+
+async def _create(auth_client, title, published=True):
+    resp = await auth_client.post(
+        "/api/recipes/create/", json={"title": title, "is_published": published}
+    )
+    return resp.json()["id"]
+
+
+async def test_profile_pages_published_recipes_with_stats(
+    auth_client, client, fake_redis
+):
+    first = await _create(auth_client, "First")
+    await _create(auth_client, "Draft", published=False)
+    last = await _create(auth_client, "Last")
+    await auth_client.post(f"/api/recipes/recipe/{first}/like/")
+    await auth_client.patch(
+        f"/api/recipes/recipe/{last}/", json={"is_published": False}
+    )
+
+    page = await client.get("/api/user/public/testuser", params={"limit": 1})
+    assert page.status_code == 200
+    data = page.json()
+    assert (data["recipes_count"], data["likes_received"]) == (1, 1)
+    assert [r["title"] for r in data["recipes"]] == ["First"]
+    # Anonymous view: no viewer flags, cacheable by shared caches
+    assert data["recipes"][0]["liked"] is None
+    assert page.headers["cache-control"] == "public, max-age=60"
+
+    await auth_client.delete(f"/api/recipes/recipe/{first}/")
+    owner = (await auth_client.get("/api/user/public/testuser")).json()
+    assert (owner["recipes_count"], owner["likes_received"]) == (0, 0)
+
+
+async def test_anonymous_profile_is_served_from_cache(auth_client, client, fake_redis):
+    await _create(auth_client, "Soup")
+    fresh = await client.get("/api/user/public/testuser")
+    assert fake_redis.data == {"public-profile:testuser:20:0": fresh.content}
+
+    fake_redis.data["public-profile:testuser:20:0"] = b'{"username":"cached"}'
+    cached = await client.get("/api/user/public/testuser")
+    assert cached.json() == {"username": "cached"}
+    # Signed-in viewers always get a fresh, private page
+    own = await auth_client.get("/api/user/public/testuser")
+    assert own.json()["username"] == "testuser"
+    assert own.headers["cache-control"] == "private, no-cache"
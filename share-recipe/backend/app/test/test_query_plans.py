@@ -0,0 +1,145 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, pool, select, text
+
+from app.cli import seed
+from app.db.dao import recipe as recipe_dao
+from app.db.database import User
+from app.db.migrations import sync_database_url
+from app.db.recipes import Recipe
+from app.db.social import Comment, SavedRecipe
+
+# EXPLAIN the hot queries of app/db/dao/recipe.py on a migrated PostgreSQL
+# database, e.g. PLAN_TEST_DATABASE_URL=postgresql://localhost/plans. It is
+# seeded with app.cli.seed up to PLAN_TEST_RECIPES recipes on first use, since
+# on small tables the planner rightly prefers sequential scans.
+PLAN_URL = os.getenv("PLAN_TEST_DATABASE_URL")
+PLAN_RECIPES = int(os.getenv("PLAN_TEST_RECIPES", "50000"))
+# Tables that grow with traffic; a sequential scan on them is a regression
+LARGE_TABLES = {
+    "recipes",
+    "recipe_ingredients",
+    "recipe_likes",
+    "saved_recipes",
+    "comments",
+}
+
+pytestmark = pytest.mark.skipif(
+    not PLAN_URL, reason="PLAN_TEST_DATABASE_URL is not set"
+)
+
+
+@pytest.fixture(scope="module")
+def conn():
+    url = sync_database_url(PLAN_URL)
+    engine = create_engine(url, poolclass=pool.NullPool)
+    with engine.connect() as c:
+        recipes = c.scalar(select(func.count()).select_from(Recipe))
+    if recipes < PLAN_RECIPES:
+        args = ["--database-url", url, "--scale", str(PLAN_RECIPES - recipes)]
+        seed.run(seed.parse_args(args))
+    with engine.connect() as c:
+        c.execute(text("ANALYZE"))
+        yield c
+    engine.dispose()
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def assert_plan(conn, stmt, uses: set[str]) -> None:
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    (explained,) = conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+    ).scalar()
+    nodes = list(_nodes(explained["Plan"]))
+    scanned = {
+        n["Relation Name"]
+        for n in nodes
+        if n["Node Type"] == "Seq Scan" and n["Relation Name"] in LARGE_TABLES
+    }
+    assert not scanned, f"sequential scan on {sorted(scanned)}"
+    used = {n["Index Name"] for n in nodes if "Index Name" in n}
+    assert used & uses, f"expected one of {sorted(uses)}, plan used {sorted(used)}"
+
+
+def _recent_ids(conn, n: int = 20) -> list[int]:
+    stmt = select(Recipe.id).order_by(Recipe.created_at.desc()).limit(n)
+    return list(conn.execute(stmt).scalars())
+
+
+# /api/recipes/list/?limit=PAGE&offset=...; without limit the route returns
+# the whole feed, which is read in full (a sequential scan is right there)
+PAGE = 20
+
+
+def _feed_page(**kwargs):
+    return recipe_dao.feed_query(limit=PAGE, **kwargs)
+
+
+def test_feed_page_walks_created_at_index(conn):
+    assert_plan(conn, _feed_page(), {"ix_recipes_created_at"})
+
+
+def test_signed_in_feed_page_walks_created_at_index(conn):
+    assert_plan(conn, _feed_page(user=User(id=1)), {"ix_recipes_created_at"})
+
+
+def test_later_feed_page_walks_created_at_index(conn):
+    stmt = _feed_page(offset=5 * PAGE)
+    assert_plan(conn, stmt, {"ix_recipes_created_at"})
+
+
+def test_title_search_uses_trigram_index(conn):
+    # As the frontend searches: no limit, every match
+    stmt = recipe_dao.feed_query(search="eggplant risotto")
+    assert_plan(conn, stmt, {"ix_recipes_title_trgm"})
+
+
+def test_title_search_page_uses_trigram_index(conn):
+    assert_plan(conn, _feed_page(search="eggplant risotto"), {"ix_recipes_title_trgm"})
+
+
+def test_like_counts_use_recipe_index(conn):
+    stmt = recipe_dao.like_counts_query(_recent_ids(conn))
+    assert_plan(conn, stmt, {"pk_recipe_likes"})
+
+
+def test_saved_list_uses_user_created_index(conn):
+    saver = conn.scalar(
+        select(SavedRecipe.user_id)
+        .group_by(SavedRecipe.user_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    stmt = recipe_dao.saved_query(saver)
+    assert_plan(conn, stmt, {"ix_saved_recipes_user_created"})
+
+
+def test_comments_use_recipe_index(conn):
+    busiest = conn.scalar(
+        select(Comment.recipe_id)
+        .group_by(Comment.recipe_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    stmt = recipe_dao.comments_query(busiest)
+    assert_plan(conn, stmt, {"ix_comments_recipe_id"})
+
+
+def test_author_page_uses_profile_index(conn):
+    author = conn.scalar(select(Recipe.user_id).limit(1))
+    stmt = recipe_dao.author_page_query(author)
+    assert_plan(conn, stmt, {"ix_recipes_user_published_created"})
+
+
+def test_admin_email_prefix_search_uses_pattern_index(conn):
+    # What ScalableModelView.search_query builds for a string column
+    stmt = select(User.id).where(User.email.startswith("user4242", autoescape=True))
+    assert_plan(conn, stmt, {"ix_users_email_pattern"})
@@ -32,6 +32,19 @@ async def test_create_and_get_recipe_without_ingredients(auth_client, client):
     assert data.get("ingredients") == [] or data.get("ingredients") is None
 
 
+async def test_public_list_is_paginated_newest_first(auth_client, client):
+    ids = [(await _create_recipe(auth_client, title=f"R{i}"))["id"] for i in range(3)]
+
+    first = await client.get("/api/recipes/list/", params={"limit": 2})
+    rest = await client.get("/api/recipes/list/", params={"limit": 2, "offset": 2})
+    assert [r["id"] for r in first.json() + rest.json()] == ids[::-1]
+    too_big = await client.get("/api/recipes/list/", params={"limit": 1000})
+    assert too_big.status_code == 422
+    # Without limit the whole feed comes back, as clients expect
+    everything = await client.get("/api/recipes/list/")
+    assert [r["id"] for r in everything.json()] == ids[::-1]
+
+
 async def test_create_with_ingredients_and_filter(auth_client, client):
     # Create ingredients
     r1 = await auth_client.post("/api/recipes/ingredients/", json={"name": "Tomato"})
@@ -202,3 +215,25 @@ async def test_patch_update_ingredients(auth_client):
     assert upd.status_code == 200
     after = upd.json()
     assert [ing["name"] for ing in after.get("ingredients", [])] == ["Banana"]
+
+
+async def test_list_fast_path_matches_response_model(auth_client):
+    from app.models.recipe import RecipeResponse
+
+    a = await auth_client.post("/api/recipes/ingredients/", json={"name": "Salt"})
+    recipe = await auth_client.post(
+        "/api/recipes/create/",
+        json={"title": "Soup", "ingredients": [a.json()["id"]]},
+    )
+    rid = recipe.json()["id"]
+    await auth_client.post(f"/api/recipes/recipe/{rid}/like/")
+    # The single-recipe endpoint still goes through response_model validation
+    expected = (await auth_client.get(f"/api/recipes/recipe/{rid}/")).json()
+
+    feed = await auth_client.get("/api/recipes/list/", params={"include_self": True})
+    assert feed.headers["content-type"] == "application/json"
+    item = next(r for r in feed.json() if r["id"] == rid)
+    assert item == expected
+    assert RecipeResponse.model_validate(item).model_dump(mode="json") == item
+    assert (item["likes"], item["liked"], item["saved"]) == (1, True, False)
+    assert [i["name"] for i in item["ingredients"]] == ["Salt"]
@@ -0,0 +1,56 @@
+from sqlalchemy import create_engine, text
+
+from app.cli import seed
+
+
+def test_seed_appends_consistent_skewed_data(tmp_path):
+    path = tmp_path / "seed.db"
+    args = ["--sqlite", str(path), "--scale", "300", "--users", "60"]
+    first = seed.run(seed.parse_args(args))
+    assert first["rows"]["recipes"] == 300 and first["rows"]["users"] == 60
+    # A second run appends after the existing ids
+    seed.run(seed.parse_args(args + ["--seed", "2"]))
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+
+        def q(sql):
+            return conn.execute(text(sql)).all()
+
+        assert q("SELECT count(*), count(DISTINCT username) FROM users") == [(120, 120)]
+        assert q("SELECT count(*) FROM ingredients") == [(200,)]
+        # No dangling references, no duplicate likes
+        assert q(
+            "SELECT count(*) FROM recipe_likes l "
+            "LEFT JOIN recipes r ON r.id = l.recipe_id WHERE r.id IS NULL"
+        ) == [(0,)]
+        assert q(
+            "SELECT count(*) FROM (SELECT recipe_id, user_id FROM recipe_likes "
+            "GROUP BY 1, 2 HAVING count(*) > 1)"
+        ) == [(0,)]
+        assert q(
+            "SELECT count(*) FROM comments c JOIN comments p ON p.id = c.parent_id "
+            "WHERE p.recipe_id != c.recipe_id"
+        ) == [(0,)]
+        # Profile counters match the source tables
+        assert q(
+            "SELECT count(*) FROM users u WHERE u.recipes_count != (SELECT count(*) "
+            "FROM recipes r WHERE r.user_id = u.id AND r.is_published)"
+        ) == [(0,)]
+        # Skewed: the busiest author wrote far more than an even share
+        (top,) = q(
+            "SELECT max(n) FROM (SELECT count(*) n FROM recipes GROUP BY user_id)"
+        )[0]
+        assert top > 5 * 600 / 120
+    engine.dispose()
+
+
+async def test_seeded_users_can_sign_in(engine, client, tmp_path):
+    # The engine fixture's file: seed appends after the created schema
+    seed.run(seed.parse_args(["--sqlite", str(tmp_path / "test.db"), "--scale", "20"]))
+
+    resp = await client.post(
+        "/api/user/signin/",
+        json={"email": "user1@example.com", "password": "password"},
+    )
+    assert resp.status_code == 200, resp.text
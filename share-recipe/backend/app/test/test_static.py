@@ -0,0 +1,79 @@
+import gzip
+
+import httpx
+import pytest
+from PIL import Image
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core.static import CachedStaticFiles
+from app.utils.images import render_variants
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture()
+async def media_client(tmp_path):
+    blobs = tmp_path / "blobs" / "ab" / "cd"
+    blobs.mkdir(parents=True)
+    Image.new("RGB", (800, 600), (200, 80, 40)).save(blobs / "abcd.jpg", quality=95)
+    # What a local upload ends up with: abcd.webp next to abcd.jpg
+    render_variants(str(blobs / "abcd.jpg"), (320,), ("webp", "jpeg"), 80, True)
+    (tmp_path / "logo.svg").write_bytes(b"<svg>" + b" " * 500 + b"</svg>")
+    (tmp_path / "logo.svg.gz").write_bytes(
+        gzip.compress((tmp_path / "logo.svg").read_bytes())
+    )
+    app = Starlette(
+        routes=[
+            Mount(
+                "/media",
+                CachedStaticFiles(
+                    directory=str(tmp_path), immutable_prefixes=("blobs/",)
+                ),
+            )
+        ]
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_blobs_are_immutable_and_revalidate_with_etag(media_client):
+    url = "/media/blobs/ab/cd/abcd.jpg"
+    resp = await media_client.get(url, headers={"Accept": "image/jpeg"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+    etag = resp.headers["etag"]
+    assert not etag.startswith("W/")
+
+    again = await media_client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+    partial = await media_client.get(url, headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.content == resp.content[:10]
+
+
+async def test_accept_selects_webp_variant(media_client):
+    url = "/media/blobs/ab/cd/abcd.jpg"
+    webp = await media_client.get(url, headers={"Accept": "image/webp,*/*;q=0.8"})
+    assert webp.headers["content-type"] == "image/webp"
+    assert webp.headers["vary"] == "Accept"
+    assert webp.content.startswith(b"RIFF")
+
+    # "*/*" alone is not taken as WebP support
+    jpeg = await media_client.get(url, headers={"Accept": "*/*"})
+    assert jpeg.headers["content-type"] == "image/jpeg"
+    assert jpeg.headers["vary"] == "Accept"
+    assert jpeg.headers["etag"] != webp.headers["etag"]
+
+
+async def test_precompressed_sibling(media_client):
+    resp = await media_client.get(
+        "/media/logo.svg", headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"].startswith("image/svg+xml")
+    assert resp.content.startswith(b"<svg>")  # decoded by httpx
+    assert "immutable" not in resp.headers["cache-control"]
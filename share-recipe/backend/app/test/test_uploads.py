@@ -0,0 +1,61 @@
+import hashlib
+import io
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.utils.uploads import UploadLimitMiddleware, UploadTooLarge, _promote, _spool
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_spool_is_chunked_hashed_and_atomic(tmp_path):
+    tmp, digest, written = _spool(io.BytesIO(b"x" * 1000), str(tmp_path), 1000, 64)
+    assert written == 1000
+    assert digest == hashlib.sha256(b"x" * 1000).hexdigest()
+    assert _promote(tmp, str(tmp_path / "a" / "a.jpg")) is True
+    assert (tmp_path / "a" / "a.jpg").read_bytes() == b"x" * 1000
+
+    with pytest.raises(UploadTooLarge):
+        _spool(io.BytesIO(b"x" * 1001), str(tmp_path), 1000, 64)
+    # No temp file is left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a"]
+
+
+def _limited_app(limit: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, limits=[(r"^/upload/$", limit)])
+
+    @app.post("/upload/")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    return app
+
+
+async def test_upload_rejected_by_content_length(auth_client):
+    body = b"x" * (5 * 1024 * 1024 + 128 * 1024)
+    resp = await auth_client.post(
+        "/api/user/profile/photo/",
+        files={"file": ("big.jpg", body, "image/jpeg")},
+    )
+    assert resp.status_code == 413
+
+
+async def test_streamed_upload_cut_off_at_limit():
+    app = _limited_app(limit=1024)
+
+    async def body():
+        # No Content-Length: only the streamed size can trip the limit
+        for _ in range(200):
+            yield b"x" * 4096
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        resp = await c.post("/upload/", content=body())
+        assert resp.status_code == 413
+
+        small = await c.post("/upload/", content=b"x" * 100)
+        assert small.status_code == 200
+        assert small.json() == {"size": 100}
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.services import user_cache
+from app.utils.security import create_access_token
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def _clear_user_cache():
+    user_cache._cache.clear()
+    yield
+    user_cache._cache.clear()
+
+
+async def test_profile_served_from_cache_and_invalidated_on_update(client, test_user):
+    headers = {"Authorization": f"Bearer {create_access_token(test_user.id)}"}
+
+    resp = await client.get("/api/user/profile/", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["username"] == "testuser"
+    assert user_cache._cache.get(test_user.id) is not None
+
+    # Cached principal can be updated through the route's session
+    upd = await client.patch(
+        "/api/user/profile/", headers=headers, json={"bio": "Loves soup"}
+    )
+    assert upd.status_code == 200
+    assert upd.json()["bio"] == "Loves soup"
+    # Commit of the user row dropped the stale snapshot
+    assert user_cache._cache.get(test_user.id) is None
+
+    again = await client.get("/api/user/profile/", headers=headers)
+    assert again.json()["bio"] == "Loves soup"
+
+
+async def test_unknown_user_is_rejected(client):
+    headers = {"Authorization": f"Bearer {create_access_token(999999)}"}
+    resp = await client.get("/api/user/profile/", headers=headers)
+    assert resp.status_code == 401
+
+
+class _DroppingPubSub:
+    def __init__(self, closed: list):
+        self.closed = closed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed.append(self)
+
+    async def subscribe(self, channel):
+        raise ConnectionError("redis went away")
+
+
+async def test_listener_releases_each_dropped_subscription(monkeypatch):
+    closed, opened = [], []
+
+    class FakeRedis:
+        def pubsub(self):
+            opened.append(_DroppingPubSub(closed))
+            if len(opened) == 3:
+                raise asyncio.CancelledError
+            return opened[-1]
+
+    async def no_wait(delay):
+        pass
+
+    monkeypatch.setattr(user_cache, "_redis", FakeRedis())
+    monkeypatch.setattr(user_cache.asyncio, "sleep", no_wait)
+    with pytest.raises(asyncio.CancelledError):
+        await user_cache._listen()
+    # Every reconnect closed the previous PubSub (and its pooled connection)
+    assert closed == opened[:2]
+
+
+async def test_author_stats_update_invalidates_cached_author(session, test_user):
+    from app.db.dao.recipe import create_recipe
+    from app.models.recipe import RecipeCreate
+
+    user_cache._cache.set(test_user.id, user_cache._snapshot(test_user))
+    await create_recipe(RecipeCreate(title="Stew"), test_user, session)
+    # recipes_count moved with a Core UPDATE; the stale snapshot is gone
+    assert user_cache._cache.get(test_user.id) is None
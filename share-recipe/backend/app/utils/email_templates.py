@@ -0,0 +1,81 @@
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+from app.config.config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates" / "email"
+# Content-ID of the inline logo part; templates reference it as cid:<LOGO_CID>
+LOGO_CID = "logo@share-recipe"
+
+_env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+_templates: dict[str, Template] = {}
+_logo: Optional[tuple[bytes, str, str]] = None
+_loaded = False
+
+
+def _logo_candidates() -> list[str]:
+    # backend/app/utils -> ../../.. -> share-recipe
+    repo_root = Path(__file__).resolve().parents[3]
+    return [
+        p
+        for p in (
+            settings.LOGO_FILE,
+            str(repo_root / "public" / "logo.png"),
+            str(repo_root / "src" / "assets" / "logo.png"),
+            str(repo_root / "public" / "logo.svg"),
+            str(repo_root / "src" / "assets" / "logo.svg"),
+        )
+        if p
+    ]
+
+
+def _read_logo() -> Optional[tuple[bytes, str, str]]:
+    for path in _logo_candidates():
+        if not os.path.exists(path):
+            continue
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        maintype, _, subtype = mime.partition("/")
+        try:
+            with open(path, "rb") as f:
+                return f.read(), maintype, subtype
+        except OSError:
+            break
+    return None
+
+
+def load_email_assets() -> None:
+    """
+    Compile every email template and read the logo once (called at startup):
+    - Rendering afterwards never touches the filesystem
+    - A missing logo only drops the <img>; emails are still sent
+    """
+    global _logo, _loaded
+    for name in _env.list_templates(extensions=["html", "txt"]):
+        _templates[name] = _env.get_template(name)
+    _logo = _read_logo()
+    _loaded = True
+
+
+def get_logo() -> Optional[tuple[bytes, str, str]]:
+    """Return (data, maintype, subtype) of the cached logo, or None."""
+    if not _loaded:
+        load_email_assets()
+    return _logo
+
+
+def render_email(name: str, **context) -> tuple[str, str]:
+    """Render `<name>.txt` and `<name>.html`; returns (text, html)."""
+    if not _loaded:
+        load_email_assets()
+    context.setdefault("logo_src", f"cid:{LOGO_CID}" if _logo else None)
+    text = _templates[f"{name}.txt"].render(**context)
+    html = _templates[f"{name}.html"].render(**context)
+    return text, html
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import ExifTags, Image, ImageOps, features
+
+from app.config.config import settings
+from app.core.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Pillow format, file extension and Pillow feature for each derivative format.
+# AVIF needs a Pillow build with libavif; it is skipped when unavailable.
+FORMATS = {
+    "avif": ("AVIF", ".avif", "avif"),
+    "webp": ("WEBP", ".webp", "webp"),
+    "jpeg": ("JPEG", ".jpg", "jpg"),
+}
+
+# Leading bytes of the formats strip_metadata() rewrites
+_STRIPPABLE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+
+# Formats written as full-size siblings of the original (<stem>.webp), which
+# CachedStaticFiles serves instead of the JPEG/PNG when Accept allows
+ALTERNATE_FORMATS = ("avif", "webp")
+
+# EXIF orientations that swap width and height
+_QUARTER_TURNS = (5, 6, 7, 8)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _save_atomic(img: Image.Image, path: str, fmt: str, **params) -> None:
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".variant-", suffix=".part"
+    )
+    try:
+        with os.fdopen(fd, "wb") as out:
+            img.save(out, fmt, **params)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    # JPEG has no alpha channel: composite onto white instead of going black
+    if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def strip_metadata(src_path: str) -> bool:
+    """
+    Rewrite an uploaded JPEG/PNG without EXIF (GPS, camera serials), applying
+    the EXIF orientation first. Returns False if there was nothing to strip.
+    """
+    with Image.open(src_path) as img:
+        exif = img.getexif()
+        if not exif or img.format not in ("JPEG", "PNG"):
+            return False
+        fmt = img.format
+        params = {}
+        if img.info.get("icc_profile"):
+            params["icc_profile"] = img.info["icc_profile"]
+        if exif.get(ExifTags.Base.Orientation, 1) == 1:
+            # Pixels unchanged: reuse the JPEG quantization tables (no quality loss)
+            if fmt == "JPEG":
+                params["quality"] = "keep"
+            img.load()
+            _save_atomic(img, src_path, fmt, **params)
+        else:
+            _save_atomic(ImageOps.exif_transpose(img), src_path, fmt, **params)
+    return True
+
+
+def _encode_params(name: str, quality: int, icc: Optional[bytes]) -> dict:
+    # Nothing passed as exif=, so derivatives carry no EXIF at all
+    if name == "avif":
+        params: dict = {"quality": quality, "speed": 8}
+    elif name == "webp":
+        params = {"quality": quality, "method": 4}
+    else:
+        params = {"quality": quality, "optimize": True, "progressive": True}
+    if icc:
+        params["icc_profile"] = icc
+    return params
+
+
+def render_variants(
+    src_path: str,
+    widths: tuple[int, ...],
+    formats: tuple[str, ...],
+    quality: int,
+    alternates: bool = False,
+) -> dict:
+    """
+    Build resized copies of `src_path` next to it (runs in a worker process):
+    - The source is only read: it may already be published under its digest
+    - One file per width and format: <stem>-<width>w.<ext>, no metadata
+    - Widths wider than the source collapse to the source width
+    - With `alternates`, full-size <stem>.webp / <stem>.avif too (enabled
+      formats only), kept when smaller than the source
+    Returns {"width", "height", "variants": [{"path", "width", "height", "format"}],
+    "alternates": [path, ...]}.
+    """
+    stem = os.path.splitext(src_path)[0]
+    with Image.open(src_path) as opened:
+        width, height = opened.size
+        # Uploads are normalised before they are stored (normalise_upload);
+        # an older original may still carry an EXIF orientation
+        if opened.getexif().get(ExifTags.Base.Orientation, 1) in _QUARTER_TURNS:
+            width, height = height, width
+        # JPEG only: decode at a reduced scale that is still >= the largest width
+        # (full-size alternates need every pixel)
+        if not alternates:
+            opened.draft("RGB", (max(widths), max(widths)))
+        icc = opened.info.get("icc_profile")
+        rgb = _flatten(ImageOps.exif_transpose(opened))
+    targets = sorted({min(w, width) for w in widths})
+
+    variants = []
+    for target in targets:
+        scaled_height = max(1, round(height * target / width))
+        resized = (
+            rgb
+            if rgb.size == (target, scaled_height)
+            else rgb.resize((target, scaled_height), Image.Resampling.LANCZOS)
+        )
+        for name in formats:
+            fmt, ext, _ = FORMATS[name]
+            path = f"{stem}-{target}w{ext}"
+            _save_atomic(resized, path, fmt, **_encode_params(name, quality, icc))
+            variants.append(
+                {
+                    "path": path,
+                    "width": target,
+                    "height": scaled_height,
+                    "format": name,
+                }
+            )
+
+    written = []
+    if alternates:
+        src_size = os.path.getsize(src_path)
+        for name in formats:
+            if name not in ALTERNATE_FORMATS:
+                continue
+            fmt, ext, _ = FORMATS[name]
+            path = stem + ext
+            _save_atomic(rgb, path, fmt, **_encode_params(name, quality, icc))
+            # A larger "alternate" would never be picked over the source
+            if os.path.getsize(path) < src_size:
+                written.append(path)
+            else:
+                os.remove(path)
+    return {
+        "width": width,
+        "height": height,
+        "variants": variants,
+        "alternates": written,
+    }
+
+
+def enabled_formats() -> tuple[str, ...]:
+    return tuple(
+        name
+        for name in settings.IMAGE_VARIANT_FORMATS
+        if name in FORMATS and features.check(FORMATS[name][2])
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs an event loop and thread pools
+        # is unsafe; workers only import this module and Pillow
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _is_strippable(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(8).startswith(_STRIPPABLE_SIGNATURES)
+
+
+async def normalise_upload(path: str) -> bool:
+    """
+    Strip EXIF from a spooled JPEG/PNG upload (see strip_metadata) in the
+    process pool, before it is hashed, stored and served. Returns False when
+    the file was left as is, including files Pillow cannot decode.
+    """
+    if not await asyncio.to_thread(_is_strippable, path):
+        return False
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), strip_metadata, path)
+    except Exception:
+        logger.exception("Could not strip metadata from %s", path)
+        return False
+
+
+def srcset(variants: list[dict]) -> dict[str, str]:
+    """Group variants by format into `srcset` strings ("url 320w, url 640w")."""
+    out: dict[str, list[str]] = {}
+    for v in sorted(variants, key=lambda v: v["width"]):
+        out.setdefault(v["format"], []).append(f"{v['url']} {v['width']}w")
+    return {fmt: ", ".join(items) for fmt, items in out.items()}
+
+
+async def build_variants(src_path: str, src_url: str) -> Optional[dict]:
+    """
+    Generate the configured derivatives of an uploaded image in the process pool.
+    Returns the JSON stored on the row (see ImageVariants), or None if the
+    file is not an image Pillow can decode.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            _get_pool(),
+            render_variants,
+            src_path,
+            tuple(settings.IMAGE_VARIANT_WIDTHS),
+            enabled_formats(),
+            settings.IMAGE_VARIANT_QUALITY,
+            # Only local files are negotiated (CachedStaticFiles); remote
+            # objects are served as they are
+            get_storage().is_local,
+        )
+    except Exception:
+        # Undecodable upload, decompression bomb or a crashed worker: the
+        # original image is still served, just without derivatives
+        logger.exception("Could not build image variants for %s", src_path)
+        return None
+    url_dir = src_url.rsplit("/", 1)[0]
+    variants = [
+        {
+            "url": f"{url_dir}/{os.path.basename(v['path'])}",
+            "width": v["width"],
+            "height": v["height"],
+            "format": v["format"],
+        }
+        for v in result["variants"]
+    ]
+    return {
+        "width": result["width"],
+        "height": result["height"],
+        "srcset": srcset(variants),
+        "variants": variants,
+    }
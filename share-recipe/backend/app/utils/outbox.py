@@ -0,0 +1,385 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+from app.config.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+from app.utils.smtp import SMTPSender, build_message
+
+logger = logging.getLogger(__name__)
+
+STATUS_TTL_SECONDS = 24 * 3600
+DEAD_LETTER_LIMIT = 1000
+# A worker that has not polled for this long is presumed dead; its taken
+# messages are delivered again. Far above a batch's worst-case SMTP time.
+LEASE_SECONDS = 300
+RECOVERY_INTERVAL_SECONDS = 60
+
+
+class RedisOutboxStore:
+    """
+    Outbox kept in Redis so any worker can deliver what another enqueued:
+    - outbox:pending  list of JSON messages (LPUSH, then LMOVE from the right)
+    - outbox:processing:<owner>  messages a worker took and has not acked yet
+    - outbox:owner:<owner>  lease of that worker; when it lapses (crash, kill)
+      another worker moves the processing list back to pending
+    - outbox:retry    sorted set scored by next attempt time
+    - outbox:dead     capped list of messages that exhausted their retries
+    - outbox:status:<id> hash with delivery status (expires after a day)
+    Delivery is at least once: a message is only dropped from processing by
+    ack(), after it was sent, rescheduled or dead-lettered.
+    """
+
+    PENDING = "outbox:pending"
+    PROCESSING = "outbox:processing"
+    OWNER = "outbox:owner"
+    RETRY = "outbox:retry"
+    DEAD = "outbox:dead"
+
+    # Due retries go back to pending and a batch moves to processing in one
+    # atomic step, so a message is never only in this worker's memory
+    POP_BATCH = """
+    local due = redis.call(
+        'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]
+    )
+    for _, item in ipairs(due) do
+        redis.call('ZREM', KEYS[1], item)
+        redis.call('LPUSH', KEYS[2], item)
+    end
+    redis.call('SET', KEYS[4], '1', 'EX', ARGV[3])
+    local batch = {}
+    for i = 1, tonumber(ARGV[2]) do
+        local item = redis.call('LMOVE', KEYS[2], KEYS[3], 'RIGHT', 'LEFT')
+        if not item then
+            break
+        end
+        batch[i] = item
+    end
+    return batch
+    """
+
+    def __init__(self, client) -> None:
+        self.r = client
+        self.owner = uuid.uuid4().hex
+        self.processing = f"{self.PROCESSING}:{self.owner}"
+        self._lease = f"{self.OWNER}:{self.owner}"
+        self._pop_batch = client.register_script(self.POP_BATCH)
+        # Raw JSON of the messages taken, by id: what ack/requeue remove
+        self._taken: dict[str, str] = {}
+        self._next_recovery = 0.0
+
+    async def push(self, message: dict) -> None:
+        await self.r.lpush(self.PENDING, json.dumps(message))
+
+    async def pop_batch(self, size: int) -> list[dict]:
+        if time.monotonic() >= self._next_recovery:
+            self._next_recovery = time.monotonic() + RECOVERY_INTERVAL_SECONDS
+            await self.recover()
+        raw = await self._pop_batch(
+            keys=[self.RETRY, self.PENDING, self.processing, self._lease],
+            args=[time.time(), size, LEASE_SECONDS],
+        )
+        batch = []
+        for item in raw:
+            message = json.loads(item)
+            self._taken[message["id"]] = item
+            batch.append(message)
+        return batch
+
+    async def ack(self, message: dict) -> None:
+        raw = self._taken.pop(message["id"], None)
+        if raw is not None:
+            await self.r.lrem(self.processing, 1, raw)
+
+    async def requeue(self, messages: list[dict]) -> None:
+        """Put taken messages back at the head of pending, in their order."""
+        pipe = self.r.pipeline(transaction=True)
+        for message in reversed(messages):
+            raw = self._taken.pop(message["id"], None)
+            if raw is not None:
+                pipe.lrem(self.processing, 1, raw)
+                pipe.rpush(self.PENDING, raw)
+        await pipe.execute()
+
+    async def recover(self) -> int:
+        """Move the processing lists of workers whose lease lapsed to pending."""
+        moved = 0
+        async for key in self.r.scan_iter(match=f"{self.PROCESSING}:*"):
+            owner = key.rsplit(":", 1)[1]
+            if owner == self.owner or await self.r.exists(f"{self.OWNER}:{owner}"):
+                continue
+            while await self.r.lmove(key, self.PENDING, "RIGHT", "RIGHT"):
+                moved += 1
+        if moved:
+            logger.warning("Recovered %d unacknowledged outbox messages", moved)
+        return moved
+
+    async def schedule_retry(self, message: dict, at: float) -> None:
+        await self.r.zadd(self.RETRY, {json.dumps(message): at})
+
+    async def bury(self, message: dict) -> None:
+        pipe = self.r.pipeline()
+        pipe.lpush(self.DEAD, json.dumps(message))
+        pipe.ltrim(self.DEAD, 0, DEAD_LETTER_LIMIT - 1)
+        await pipe.execute()
+
+    async def set_status(self, message_id: str, status: dict) -> None:
+        key = f"outbox:status:{message_id}"
+        pipe = self.r.pipeline()
+        pipe.hset(key, mapping={k: str(v) for k, v in status.items()})
+        pipe.expire(key, STATUS_TTL_SECONDS)
+        await pipe.execute()
+
+    async def get_status(self, message_id: str) -> Optional[dict]:
+        data = await self.r.hgetall(f"outbox:status:{message_id}")
+        return data or None
+
+    async def depth(self) -> dict:
+        pipe = self.r.pipeline()
+        pipe.llen(self.PENDING)
+        pipe.zcard(self.RETRY)
+        pipe.llen(self.DEAD)
+        pending, retry, dead = await pipe.execute()
+        return {"pending": pending, "retry": retry, "dead": dead}
+
+
+class MemoryOutboxStore:
+    """Process-local outbox for development and tests (EMAIL_OUTBOX_BACKEND=memory)."""
+
+    def __init__(self) -> None:
+        self.pending: deque = deque()
+        self.retry: list[tuple[float, dict]] = []
+        self.dead: deque = deque(maxlen=DEAD_LETTER_LIMIT)
+        self.statuses: dict[str, dict] = {}
+
+    async def push(self, message: dict) -> None:
+        self.pending.appendleft(message)
+
+    async def pop_batch(self, size: int) -> list[dict]:
+        now = time.time()
+        for item in [item for item in self.retry if item[0] <= now][:size]:
+            self.retry.remove(item)
+            self.pending.appendleft(item[1])
+        batch = []
+        while self.pending and len(batch) < size:
+            batch.append(self.pending.pop())
+        return batch
+
+    async def ack(self, message: dict) -> None:
+        pass
+
+    async def requeue(self, messages: list[dict]) -> None:
+        self.pending.extend(reversed(messages))
+
+    async def schedule_retry(self, message: dict, at: float) -> None:
+        self.retry.append((at, message))
+
+    async def bury(self, message: dict) -> None:
+        self.dead.appendleft(message)
+
+    async def set_status(self, message_id: str, status: dict) -> None:
+        self.statuses.setdefault(message_id, {}).update(
+            {k: str(v) for k, v in status.items()}
+        )
+
+    async def get_status(self, message_id: str) -> Optional[dict]:
+        return self.statuses.get(message_id)
+
+    async def depth(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "retry": len(self.retry),
+            "dead": len(self.dead),
+        }
+
+
+class OutboxWorker:
+    """
+    Background sender:
+    - Pops up to `batch_size` messages and sends them over one SMTP session
+    - Failed messages are retried with exponential backoff, then dead-lettered
+    """
+
+    def __init__(
+        self,
+        store,
+        sender: SMTPSender,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.store = store
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.wakeup = asyncio.Event()
+
+    def _send_batch(self, batch: list[dict]) -> list[Optional[str]]:
+        errors: list[Optional[str]] = []
+        for message in batch:
+            try:
+                self.sender.send(build_message(message))
+                errors.append(None)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+        return errors
+
+    async def run_once(self) -> int:
+        batch = await self.store.pop_batch(self.batch_size)
+        if not batch:
+            return 0
+        settled = 0
+        try:
+            started = time.perf_counter()
+            errors = await asyncio.to_thread(self._send_batch, batch)
+            metrics.observe(
+                "email_outbox.batch", (time.perf_counter() - started) * 1000
+            )
+            for message, error in zip(batch, errors):
+                await self._settle(message, error)
+                settled += 1
+        except asyncio.CancelledError:
+            # Shutdown mid-batch: whatever was not settled is delivered again
+            # (possibly twice) rather than lost
+            await self.store.requeue(batch[settled:])
+            raise
+        return len(batch)
+
+    async def _settle(self, message: dict, error: Optional[str]) -> None:
+        attempts = message.get("attempts", 0) + 1
+        if error is None:
+            metrics.incr("email_outbox.sent")
+            await self.store.set_status(
+                message["id"],
+                {"status": "sent", "attempts": attempts, "at": time.time()},
+            )
+            await self.store.ack(message)
+            return
+        logger.warning("Email %s attempt %d failed: %s", message["id"], attempts, error)
+        retry = dict(message, attempts=attempts)
+        if attempts >= self.max_attempts:
+            metrics.incr("email_outbox.failed")
+            await self.store.bury(retry)
+            status = "failed"
+        else:
+            metrics.incr("email_outbox.retried")
+            delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+            await self.store.schedule_retry(retry, time.time() + delay)
+            status = "retrying"
+        await self.store.ack(message)
+        await self.store.set_status(
+            message["id"], {"status": status, "attempts": attempts, "error": error}
+        )
+
+    async def run(self) -> None:
+        while True:
+            try:
+                sent = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email outbox iteration failed")
+                sent = 0
+            if sent:
+                continue
+            # Idle: wait for a local enqueue or poll for other workers' messages
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+
+_store = None
+_worker: Optional[OutboxWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def get_outbox_store():
+    global _store
+    if _store is None:
+        if settings.EMAIL_OUTBOX_BACKEND == "memory":
+            _store = MemoryOutboxStore()
+        else:
+            _store = RedisOutboxStore(get_redis_client())
+    return _store
+
+
+async def enqueue_email(
+    to: str, subject: str, text: str, html: Optional[str] = None, **extra
+) -> str:
+    """Queue a message for background delivery and return its id."""
+    message = {
+        "id": uuid.uuid4().hex,
+        "to": to,
+        "subject": subject,
+        "text": text,
+        "html": html,
+        "attempts": 0,
+        "queued_at": time.time(),
+        **extra,
+    }
+    store = get_outbox_store()
+    await store.push(message)
+    await store.set_status(message["id"], {"status": "queued", "attempts": 0})
+    metrics.incr("email_outbox.enqueued")
+    if _worker is not None:
+        _worker.wakeup.set()
+    return message["id"]
+
+
+async def get_delivery_status(message_id: str) -> Optional[dict]:
+    return await get_outbox_store().get_status(message_id)
+
+
+async def outbox_stats() -> dict:
+    try:
+        depth = await get_outbox_store().depth()
+    except Exception:
+        depth = None
+    counters = metrics.snapshot()["counters"]
+    return {
+        "depth": depth,
+        **{
+            name.split(".", 1)[1]: int(value)
+            for name, value in counters.items()
+            if name.startswith("email_outbox.")
+        },
+    }
+
+
+async def start_outbox_worker() -> None:
+    global _worker, _worker_task
+    if _worker_task is not None or not settings.EMAIL_OUTBOX_WORKER:
+        return
+    _worker = OutboxWorker(
+        get_outbox_store(),
+        SMTPSender.from_settings(),
+        batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_base=settings.EMAIL_OUTBOX_BACKOFF_SECONDS,
+    )
+    _worker_task = asyncio.get_running_loop().create_task(_worker.run())
+
+
+async def stop_outbox_worker() -> None:
+    global _worker, _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except (asyncio.CancelledError, Exception):
+            pass
+    if _worker is not None:
+        await asyncio.to_thread(_worker.sender.close)
+    _worker = _worker_task = None
@@ -1,17 +1,37 @@
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-from dotenv import load_dotenv
 from jose import jwt
 from passlib.context import CryptContext
 
-load_dotenv()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-SECRET_KEY: str = os.getenv("SECRET_KEY") or ""
+from app.config.config import settings
+from app.core.metrics import metrics
+
+# Hashes below BCRYPT_ROUNDS are upgraded on the next successful login
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+SECRET_KEY: str = settings.SECRET_KEY
 if not SECRET_KEY:
     raise RuntimeError("SECRET_KEY environment variable is not set!")
 ALGORITHM = "HS256"
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop.
+# The pool size is also the concurrency cap; extra callers queue on the semaphore.
+PASSWORD_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1)
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+_hash_waiting = 0
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -21,6 +41,46 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_hashing(fn, *args):
+    global _hash_slots, _hash_waiting
+    loop = asyncio.get_running_loop()
+    if _hash_slots is None or _hash_slots[0] is not loop:
+        _hash_slots = (loop, asyncio.Semaphore(PASSWORD_HASH_WORKERS))
+    queued_at = time.perf_counter()
+    waiting = True
+    _hash_waiting += 1
+    metrics.gauge("password_hash.queued", _hash_waiting)
+    try:
+        async with _hash_slots[1]:
+            waiting = False
+            _hash_waiting -= 1
+            metrics.gauge("password_hash.queued", _hash_waiting)
+            started = time.perf_counter()
+            metrics.observe("password_hash.wait", (started - queued_at) * 1000)
+            result = await loop.run_in_executor(_hash_executor, fn, *args)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics.observe("password_hash.run", elapsed_ms)
+            return result
+    finally:
+        if waiting:
+            # Cancelled while queued
+            _hash_waiting -= 1
+            metrics.gauge("password_hash.queued", _hash_waiting)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(pwd_context.hash, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify off the event loop; returns (ok, upgraded_hash_or_None)."""
+    return await _run_hashing(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(user_id: int, expires_delta: timedelta = timedelta(minutes=30)):
     to_encode = {"sub": str(user_id), "exp": datetime.now(timezone.utc) + expires_delta}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
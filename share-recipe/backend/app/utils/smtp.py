@@ -0,0 +1,119 @@
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+from typing import Optional
+
+from app.config.config import settings
+from app.utils.email_templates import LOGO_CID, get_logo
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(payload: dict) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = payload["subject"]
+    msg["From"] = payload.get("from") or settings.EMAIL_FROM
+    msg["To"] = payload["to"]
+    msg.set_content(payload["text"])
+    if payload.get("html"):
+        msg.add_alternative(payload["html"], subtype="html")
+        logo = get_logo() if payload.get("inline_logo") else None
+        if logo is not None:
+            data, maintype, subtype = logo
+            # multipart/related part referenced from the HTML as cid:LOGO_CID
+            msg.get_payload()[1].add_related(
+                data,
+                maintype=maintype,
+                subtype=subtype,
+                cid=f"<{LOGO_CID}>",
+                disposition="inline",
+            )
+    return msg
+
+
+class SMTPSender:
+    """
+    Blocking SMTP client that keeps one authenticated connection open:
+    - Connects (STARTTLS + login) lazily and reuses the session across sends
+    - Reconnects when the server dropped us or the session sat idle too long
+    Meant to be driven from a worker thread, never from the event loop.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 30.0,
+        idle_timeout: float = 60.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._conn: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPSender":
+        return cls(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            username=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD or None,
+            starttls=settings.SMTP_STARTTLS,
+        )
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password or "")
+        return conn
+
+    def _connection(self) -> smtplib.SMTP:
+        idle = time.monotonic() - self._last_used
+        if self._conn is not None and idle > self.idle_timeout:
+            self.close()
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def send(self, msg: EmailMessage) -> None:
+        try:
+            self._connection().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed the idle session; retry once on a fresh connection
+            self.close()
+            self._connection().send_message(msg)
+        except (smtplib.SMTPException, OSError):
+            # Recipient-level errors leave the session usable, anything else may not
+            if not self._session_still_usable():
+                self.close()
+            raise
+        finally:
+            self._last_used = time.monotonic()
+
+    def _session_still_usable(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            return self._conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._conn = None
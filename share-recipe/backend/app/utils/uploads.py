@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.config import settings
+
+# Disk writes for uploads run here, so a burst of uploads cannot starve the
+# default executor (or the event loop) used by everything else
+_io_executor = ThreadPoolExecutor(
+    max_workers=settings.UPLOAD_IO_WORKERS, thread_name_prefix="upload-io"
+)
+
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+TOO_LARGE_DETAIL = "Upload is too large."
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def _spool(
+    src: BinaryIO, directory: str, max_bytes: int, chunk_size: int
+) -> tuple[str, str, int]:
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            src.seek(0)
+            while chunk := src.read(chunk_size):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        discard_upload(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), written
+
+
+def _hash(path: str, chunk_size: int) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            size += len(chunk)
+            digest.update(chunk)
+    return digest.hexdigest(), size
+
+
+def _promote(tmp_path: str, final_path: str) -> bool:
+    if os.path.exists(final_path):
+        # Same content is already stored: keep that file
+        discard_upload(tmp_path)
+        return False
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    # Readers (StaticFiles) never see a partially written file
+    os.replace(tmp_path, final_path)
+    return True
+
+
+def discard_upload(tmp_path: str) -> None:
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+async def spool_upload(
+    file: UploadFile, directory: str, max_bytes: int
+) -> tuple[str, str, int]:
+    """
+    Stream an uploaded file into a temp file under `directory`:
+    - Copied in UPLOAD_CHUNK_BYTES chunks on the upload thread pool
+    - Hashed (sha256) on the way, so content addressing needs no second read
+    - Raises UploadTooLarge as soon as more than `max_bytes` were read
+    Returns (tmp_path, sha256_hex, size).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _io_executor,
+        _spool,
+        file.file,
+        directory,
+        max_bytes,
+        settings.UPLOAD_CHUNK_BYTES,
+    )
+
+
+async def rehash_upload(tmp_path: str) -> tuple[str, int]:
+    """(sha256_hex, size) of a spooled upload that was rewritten after spooling."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _io_executor, _hash, tmp_path, settings.UPLOAD_CHUNK_BYTES
+    )
+
+
+async def promote_upload(tmp_path: str, final_path: str) -> bool:
+    """Atomically move a spooled upload into place; False if it already existed."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, _promote, tmp_path, final_path)
+
+
+class UploadLimitMiddleware:
+    """
+    Rejects oversized upload bodies before they are parsed or spooled to disk:
+    - A Content-Length above the route's limit gets 413 without reading the body
+    - Chunked / lying clients are cut off once the streamed size passes the limit
+    `limits` pairs a path regex with the maximum file size for that route.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Iterable[tuple[str, int]]) -> None:
+        self.app = app
+        self.limits = [(re.compile(pattern), size) for pattern, size in limits]
+
+    def _limit_for(self, scope: Scope) -> int | None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            return None
+        for pattern, size in self.limits:
+            if pattern.match(scope["path"]):
+                return size + MULTIPART_OVERHEAD
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self._limit_for(scope)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > limit
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces as a 413 through the app's exception handling
+                    raise HTTPException(status_code=413, detail=TOO_LARGE_DETAIL)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            if e.status_code != 413 or started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": TOO_LARGE_DETAIL},
+            status_code=413,
+            headers={"Connection": "close"},
+        )
+        await response({"type": "http"}, _no_receive, send)
+
+
+async def _no_receive() -> Message:
+    return {"type": "http.disconnect"}